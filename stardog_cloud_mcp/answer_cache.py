@@ -0,0 +1,162 @@
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from stardog_cloud_mcp.bindings import token_fingerprint
+from stardog_cloud_mcp.constants import (
+    ANSWER_CACHE_MAX_BYTES,
+    ANSWER_CACHE_MAX_CONVERSATIONS,
+    ANSWER_CACHE_MAX_ENTRIES_PER_CONVERSATION,
+)
+
+# (token hash, client ID, conversation ID, auth token override hash)
+ConversationKey = tuple[str, Optional[str], str, Optional[str]]
+
+
+class AnswerCache:
+    """
+    Short-lived cache of Voicebox answers, scoped to one conversation of one
+    Voicebox app.
+
+    Agents often re-ask the exact same question in a conversation after a
+    tool error or a context trim; within ``ttl`` seconds of the original
+    answer, the repeat is answered from the cache instead of another
+    Voicebox stream. Answers count against ``max_bytes`` together with their
+    questions; least recently used conversations are dropped first.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_conversations: int = ANSWER_CACHE_MAX_CONVERSATIONS,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES_PER_CONVERSATION,
+        max_bytes: int = ANSWER_CACHE_MAX_BYTES,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an answer is served after it was received
+            max_conversations: Maximum number of conversations cached at once
+            max_entries: Maximum number of answers cached per conversation
+            max_bytes: Upper bound for the memory held by cached questions
+                and answers
+        """
+        self.ttl = ttl
+        self.max_conversations = max_conversations
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        # conversation -> question -> (monotonic expiry, answer, entry size)
+        self._conversations: OrderedDict[
+            ConversationKey, OrderedDict[str, tuple[float, str, int]]
+        ] = OrderedDict()
+
+    @staticmethod
+    def _key(
+        api_token: str,
+        client_id: Optional[str],
+        conversation_id: str,
+        auth_token_override: Optional[str],
+    ) -> ConversationKey:
+        return (
+            token_fingerprint(api_token),
+            client_id,
+            conversation_id,
+            token_fingerprint(auth_token_override) if auth_token_override else None,
+        )
+
+    def get(
+        self,
+        api_token: str,
+        client_id: Optional[str],
+        conversation_id: str,
+        question: str,
+        auth_token_override: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Return the cached answer to ``question`` in the conversation, if any.
+        """
+        question = question.strip()
+        key = self._key(api_token, client_id, conversation_id, auth_token_override)
+        entries = self._conversations.get(key)
+        entry = entries.get(question) if entries is not None else None
+        if entries is None or entry is None:
+            self.misses += 1
+            return None
+        expires_at, answer, entry_size = entry
+        if time.monotonic() >= expires_at:
+            del entries[question]
+            self.size -= entry_size
+            if not entries:
+                del self._conversations[key]
+            self.misses += 1
+            return None
+        self._conversations.move_to_end(key)
+        self.hits += 1
+        return answer
+
+    def put(
+        self,
+        api_token: str,
+        client_id: Optional[str],
+        conversation_id: str,
+        question: str,
+        answer: str,
+        auth_token_override: Optional[str] = None,
+    ) -> None:
+        """
+        Cache the answer to ``question`` in the conversation.
+
+        Answers that alone would take up more than a tenth of ``max_bytes``
+        are not cached.
+        """
+        question = question.strip()
+        entry_size = sys.getsizeof(question) + sys.getsizeof(answer)
+        if entry_size > self.max_bytes // 10:
+            return
+        now = time.monotonic()
+        key = self._key(api_token, client_id, conversation_id, auth_token_override)
+        entries = self._conversations.setdefault(key, OrderedDict())
+        previous = entries.pop(question, None)
+        if previous is not None:
+            self.size -= previous[2]
+        entries[question] = (now + self.ttl, answer, entry_size)
+        self.size += entry_size
+        self._conversations.move_to_end(key)
+        while len(entries) > self.max_entries:
+            self.size -= entries.popitem(last=False)[1][2]
+        self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """
+        Drop expired conversations, then least recently used ones, until
+        the cache is within its bounds.
+        """
+        while self._conversations:
+            entries = next(iter(self._conversations.values()))
+            # The most recent answer of a conversation expires last.
+            expired = next(reversed(entries.values()))[0] <= now
+            if not (
+                expired
+                or len(self._conversations) > self.max_conversations
+                or self.size > self.max_bytes
+            ):
+                break
+            _, entries = self._conversations.popitem(last=False)
+            self.size -= sum(entry[2] for entry in entries.values())
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Describe the cache's current state.
+        """
+        return {
+            "conversations": len(self._conversations),
+            "answers": sum(len(entries) for entries in self._conversations.values()),
+            "bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
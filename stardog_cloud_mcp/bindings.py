@@ -0,0 +1,169 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from stardog.cloud.client import BaseClient
+from stardog.cloud.exceptions import UnauthorizedException
+from stardog.cloud.voicebox import VoiceboxApp, VoiceboxAppSettings
+
+from stardog_cloud_mcp.constants import (
+    APP_BINDING_CACHE_SIZE,
+    REJECTED_TOKEN_CACHE_SIZE,
+    REJECTED_TOKEN_TTL_SECONDS,
+    SETTINGS_CACHE_TTL_SECONDS,
+)
+
+
+def token_fingerprint(api_token: str) -> str:
+    """
+    Stable identifier for an API token that does not reveal the secret.
+    """
+    return hashlib.sha256(api_token.encode("utf-8")).hexdigest()
+
+
+class AppBindingCache:
+    """
+    Bounded LRU cache of Voicebox app bindings and their settings keyed by
+    API token hash and client ID, with a negative cache of tokens Stardog
+    Cloud recently rejected.
+
+    Rejected tokens fail fast before any cached entry is served, and
+    rejecting a token drops its bindings and settings.
+    """
+
+    def __init__(
+        self,
+        cloud_client: BaseClient,
+        max_size: int = APP_BINDING_CACHE_SIZE,
+        rejected_ttl: float = REJECTED_TOKEN_TTL_SECONDS,
+        max_rejected: int = REJECTED_TOKEN_CACHE_SIZE,
+        settings_ttl: float = SETTINGS_CACHE_TTL_SECONDS,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cloud_client: The Stardog Cloud client the bindings are created from
+            max_size: Maximum number of cached bindings
+            rejected_ttl: Seconds a rejected token keeps failing fast
+            max_rejected: Maximum number of rejected tokens remembered
+            settings_ttl: Seconds app settings are served from the cache
+        """
+        self.cloud_client = cloud_client
+        self.max_size = max_size
+        self.rejected_ttl = rejected_ttl
+        self.max_rejected = max_rejected
+        self.settings_ttl = settings_ttl
+        self._bindings: OrderedDict[tuple[str, Optional[str]], VoiceboxApp] = (
+            OrderedDict()
+        )
+        # (token hash, client_id) -> (monotonic fetch time, settings)
+        self._settings: OrderedDict[
+            tuple[str, Optional[str]], tuple[float, VoiceboxAppSettings]
+        ] = OrderedDict()
+        # token hash -> monotonic expiry
+        self._rejected: OrderedDict[str, float] = OrderedDict()
+
+    def get(self, api_token: str, client_id: Optional[str]) -> VoiceboxApp:
+        """
+        Return the Voicebox app binding for the credentials.
+
+        Raises:
+            PermissionError: If Stardog Cloud rejected the token within the
+                last ``rejected_ttl`` seconds
+        """
+        key = (self._check_rejected(api_token), client_id)
+        binding = self._bindings.get(key)
+        if binding is None:
+            binding = self.cloud_client.voicebox_app(
+                app_api_token=api_token, client_id=client_id
+            )
+            self._bindings[key] = binding
+            if len(self._bindings) > self.max_size:
+                self._bindings.popitem(last=False)
+        else:
+            self._bindings.move_to_end(key)
+        return binding
+
+    def get_settings(
+        self, api_token: str, client_id: Optional[str]
+    ) -> Optional[VoiceboxAppSettings]:
+        """
+        Return the app settings cached within the last ``settings_ttl``
+        seconds, or None.
+
+        Raises:
+            PermissionError: If Stardog Cloud rejected the token within the
+                last ``rejected_ttl`` seconds
+        """
+        key = (self._check_rejected(api_token), client_id)
+        cached = self._settings.get(key)
+        if cached is None:
+            return None
+        fetched_at, settings = cached
+        if time.monotonic() - fetched_at >= self.settings_ttl:
+            del self._settings[key]
+            return None
+        self._settings.move_to_end(key)
+        return settings
+
+    def put_settings(
+        self,
+        api_token: str,
+        client_id: Optional[str],
+        settings: VoiceboxAppSettings,
+    ) -> None:
+        """
+        Cache app settings fetched from Stardog Cloud.
+        """
+        key = (token_fingerprint(api_token), client_id)
+        self._settings[key] = (time.monotonic(), settings)
+        self._settings.move_to_end(key)
+        if len(self._settings) > self.max_size:
+            self._settings.popitem(last=False)
+
+    def _check_rejected(self, api_token: str) -> str:
+        """
+        Return the token's fingerprint unless the token was recently rejected.
+
+        Raises:
+            PermissionError: If Stardog Cloud rejected the token within the
+                last ``rejected_ttl`` seconds
+        """
+        fingerprint = token_fingerprint(api_token)
+        expires_at = self._rejected.get(fingerprint)
+        if expires_at is not None:
+            if time.monotonic() < expires_at:
+                raise PermissionError(
+                    "API token was recently rejected by Stardog Cloud"
+                )
+            del self._rejected[fingerprint]
+        return fingerprint
+
+    def note_error(
+        self,
+        api_token: str,
+        error: Exception,
+        auth_token_override: Optional[str] = None,
+    ) -> None:
+        """
+        Remember the token as rejected if ``error`` is an upstream 401.
+
+        A 401 for a request with an auth token override may be about the
+        caller's override rather than the API token shared by every caller,
+        so the API token is not marked as rejected then.
+        """
+        if not isinstance(error, UnauthorizedException) or auth_token_override:
+            return
+        fingerprint = token_fingerprint(api_token)
+        self._rejected[fingerprint] = time.monotonic() + self.rejected_ttl
+        self._rejected.move_to_end(fingerprint)
+        if len(self._rejected) > self.max_rejected:
+            self._rejected.popitem(last=False)
+        # Drop bindings and settings of the rejected token, so nothing is
+        # served for it from the cache and a fixed token starts clean.
+        for key in [key for key in self._bindings if key[0] == fingerprint]:
+            del self._bindings[key]
+        for key in [key for key in self._settings if key[0] == fingerprint]:
+            del self._settings[key]
@@ -0,0 +1,113 @@
+import ssl
+from functools import cached_property, lru_cache
+from typing import Any, Optional
+
+import httpx
+from stardog.cloud.client import AsyncClient as StardogAsyncClient
+from stardog.cloud.client import StardogCloudAPIEndpoints
+
+
+@lru_cache(maxsize=1)
+def shared_ssl_context() -> ssl.SSLContext:
+    """
+    SSL context shared by all upstream clients.
+
+    Loading the CA bundle takes tens of milliseconds, which httpx would
+    otherwise pay again for every client and transport.
+    """
+    return httpx.create_ssl_context()
+
+
+def http_transport(**kwargs: Any) -> httpx.AsyncHTTPTransport:
+    """
+    Create an upstream HTTP transport (connection pool) using the shared SSL context.
+    """
+    return httpx.AsyncHTTPTransport(verify=shared_ssl_context(), **kwargs)
+
+
+class AsyncClient(StardogAsyncClient):
+    """
+    Stardog Cloud async client that accepts extra ``httpx.AsyncClient`` options
+    such as a custom ``transport`` or connection ``limits``.
+
+    The underlying ``httpx.AsyncClient`` is only built on first use: loading
+    the CA bundle and httpx's connection pool modules takes over 100 ms,
+    which would otherwise delay a stdio server's reply to ``initialize``.
+    """
+
+    def __init__(
+        self,
+        base_url: str = StardogCloudAPIEndpoints.US.value,
+        timeout: Optional[float] = None,
+        **httpx_options: Any,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            base_url: The base URL of the Stardog Cloud API
+            timeout: Request timeout in seconds (optional)
+            httpx_options: Extra keyword arguments for ``httpx.AsyncClient``
+        """
+        # pystardog's constructor builds its own httpx client, without
+        # transport options and with a fresh SSL context; build ours instead.
+        self._base_url = base_url
+        self._timeout = timeout
+        self._httpx_options = httpx_options
+
+    @cached_property
+    def _client(self) -> httpx.AsyncClient:
+        options = dict(self._httpx_options)
+        options.setdefault("verify", shared_ssl_context())
+        return httpx.AsyncClient(
+            base_url=self._base_url,
+            timeout=(
+                self._timeout if self._timeout is not None else self._DEFAULT_TIMEOUT
+            ),
+            **options,
+        )
+
+    async def aclose(self) -> None:
+        """
+        Close the underlying HTTP client, if it was ever used.
+        """
+        if "_client" in self.__dict__:
+            await self._client.aclose()
+
+    async def probe(self, timeout: float) -> int:
+        """
+        Send an unauthenticated request to Stardog Cloud to check reachability.
+
+        Any HTTP response, including ``401``, means the API is reachable.
+
+        Returns:
+            The HTTP status code of the response
+
+        Raises:
+            httpx.HTTPError: If Stardog Cloud could not be reached in time
+        """
+        response = await self._client.get("/v1/app", timeout=timeout)
+        return response.status_code
+
+    def pool_stats(self) -> Optional[dict[str, Optional[int]]]:
+        """
+        Describe the upstream connection pool.
+
+        Returns:
+            Connection and queue counts, or None when requests do not go
+            through an HTTP connection pool (e.g. during replay)
+        """
+        transport: Any = self._client._transport
+        # Unwrap rate limiting / recording transports.
+        while not isinstance(transport, httpx.AsyncHTTPTransport):
+            transport = getattr(transport, "transport", None)
+            if transport is None:
+                return None
+        pool = transport._pool
+        connections = pool.connections
+        return {
+            "connections": len(connections),
+            "active": sum(1 for connection in connections if not connection.is_idle()),
+            "max_connections": pool._max_connections,
+            "queued": sum(1 for request in pool._requests if request.is_queued()),
+        }
@@ -0,0 +1,440 @@
+import time
+import zlib
+from typing import Any, AsyncIterator, Optional, cast
+
+import httpx
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from stardog_cloud_mcp.constants import (
+    BROTLI_QUALITY,
+    DEFAULT_COMPRESSION_MIN_SIZE,
+    GZIP_COMPRESSION_LEVEL,
+    ZSTD_COMPRESSION_LEVEL,
+)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+# Upstream encodings decoded by UpstreamCompressionTransport, and the errors
+# their decoders raise on corrupt data.
+_DECODABLE_ENCODINGS = ("gzip", "deflate") + (
+    (("br",) if brotli is not None else ())
+    + (("zstd",) if zstandard is not None else ())
+)
+_DECODING_ERRORS: tuple[type[Exception], ...] = (zlib.error,) + (
+    ((brotli.error,) if brotli is not None else ())
+    + ((zstandard.ZstdError,) if zstandard is not None else ())
+)
+
+# Content types that are already compressed.
+_INCOMPRESSIBLE_TYPES = (
+    "image/",
+    "audio/",
+    "video/",
+    "application/zip",
+    "application/gzip",
+)
+
+
+class CompressionStats:
+    """
+    Byte counts and CPU time of compression (or decompression) per encoding.
+    """
+
+    def __init__(self) -> None:
+        self.encodings: dict[str, dict[str, float]] = {}
+        self.skipped = 0
+
+    def _entry(self, encoding: str) -> dict[str, float]:
+        return self.encodings.setdefault(
+            encoding,
+            {
+                "responses": 0,
+                "original_bytes": 0,
+                "compressed_bytes": 0,
+                "cpu_seconds": 0.0,
+            },
+        )
+
+    def count_response(self, encoding: str) -> None:
+        self._entry(encoding)["responses"] += 1
+
+    def record(
+        self, encoding: str, original: int, compressed: int, cpu_seconds: float
+    ) -> None:
+        stats = self._entry(encoding)
+        stats["original_bytes"] += original
+        stats["compressed_bytes"] += compressed
+        stats["cpu_seconds"] += cpu_seconds
+
+    def report(self) -> dict[str, Any]:
+        """
+        Summarize the counters, with the compression ratio (original bytes
+        per compressed byte) and CPU cost per original megabyte.
+        """
+        encodings = {}
+        for encoding, stats in self.encodings.items():
+            original, compressed = stats["original_bytes"], stats["compressed_bytes"]
+            encodings[encoding] = {
+                "responses": int(stats["responses"]),
+                "original_bytes": int(original),
+                "compressed_bytes": int(compressed),
+                "ratio": round(original / compressed, 2) if compressed else None,
+                "cpu_seconds": round(stats["cpu_seconds"], 6),
+                "cpu_ms_per_mb": (
+                    round(stats["cpu_seconds"] * 1000 / (original / 1_000_000), 3)
+                    if original
+                    else None
+                ),
+            }
+        return {"encodings": encodings, "uncompressed_responses": self.skipped}
+
+
+# Responses sent to MCP clients, and responses received from Stardog Cloud.
+response_stats = CompressionStats()
+upstream_stats = CompressionStats()
+
+
+def compression_report() -> dict[str, Any]:
+    """
+    Compression counters for client responses and Stardog Cloud responses.
+    """
+    return {"responses": response_stats.report(), "upstream": upstream_stats.report()}
+
+
+def available_encodings() -> list[str]:
+    """
+    Response encodings this process can produce, in order of preference.
+    """
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate_encoding(
+    accept_encoding: str, encodings: Optional[list[str]] = None
+) -> Optional[str]:
+    """
+    Pick the response encoding for an ``Accept-Encoding`` header.
+
+    Among the encodings the client accepts with the highest quality, the
+    first in ``encodings`` (server preference) wins.
+
+    Returns:
+        The chosen encoding, or None to send the response uncompressed
+    """
+    encodings = encodings if encodings is not None else available_encodings()
+    qualities: dict[str, float] = {}
+    for entry in accept_encoding.split(","):
+        name, *params = (part.strip() for part in entry.split(";"))
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.lower()] = quality
+    wildcard = qualities.get("*", 0.0)
+    best: Optional[str] = None
+    best_quality = 0.0
+    for encoding in encodings:
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class _Compressor:
+    """
+    Streaming compressor that flushes after every chunk, so streamed events
+    reach the client without waiting for more data.
+    """
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._gzip = zlib.compressobj(GZIP_COMPRESSION_LEVEL, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._zstd = zstandard.ZstdCompressor(
+                level=ZSTD_COMPRESSION_LEVEL
+            ).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "gzip":
+            return self._gzip.compress(data) + self._gzip.flush(
+                zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+            )
+        if self.encoding == "br":
+            output = self._brotli.process(data)
+            return output + (self._brotli.finish() if final else self._brotli.flush())
+        return self._zstd.compress(data) + self._zstd.flush(
+            zstandard.COMPRESSOBJ_FLUSH_FINISH
+            if final
+            else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+
+class _Decompressor:
+    """
+    Streaming decoder for compressed upstream responses.
+    """
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._zlib = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        elif encoding == "deflate":
+            # Servers send deflate with or without the zlib wrapper.
+            self._zlib = zlib.decompressobj()
+            self._raw_deflate = False
+        elif encoding == "br":
+            self._brotli = brotli.Decompressor()
+        else:
+            self._zstd = zstandard.ZstdDecompressor().decompressobj()
+
+    def decode(self, data: bytes) -> bytes:
+        try:
+            if self.encoding == "gzip":
+                return self._zlib.decompress(data)
+            if self.encoding == "deflate":
+                return self._inflate(data)
+            if self.encoding == "br":
+                return self._brotli.process(data)
+            return self._decode_zstd(data)
+        except _DECODING_ERRORS as e:
+            raise httpx.DecodingError(str(e)) from e
+
+    def flush(self) -> bytes:
+        if self.encoding in ("gzip", "deflate"):
+            return self._zlib.flush()
+        return b""
+
+    def _inflate(self, data: bytes) -> bytes:
+        if self._raw_deflate:
+            return self._zlib.decompress(data)
+        try:
+            return self._zlib.decompress(data)
+        except zlib.error:
+            self._raw_deflate = True
+            self._zlib = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self._zlib.decompress(data)
+
+    def _decode_zstd(self, data: bytes) -> bytes:
+        # A body may hold several zstd frames, each needing a new decoder.
+        output = [self._zstd.decompress(data)]
+        while self._zstd.eof and self._zstd.unused_data:
+            unused = self._zstd.unused_data
+            self._zstd = zstandard.ZstdDecompressor().decompressobj()
+            output.append(self._zstd.decompress(unused))
+        return b"".join(output)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing HTTP responses with the best encoding the
+    client accepts (zstd, br or gzip).
+
+    Event streams are always compressed: the first event of an MCP tool
+    call stream is a short log message, which says nothing about the size of
+    the result that follows. Other responses are compressed when their first
+    body chunk has at least ``minimum_size`` bytes. Streamed responses are
+    flushed after every chunk.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = DEFAULT_COMPRESSION_MIN_SIZE,
+        stats: CompressionStats = response_stats,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.stats = stats
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "").lower()
+                passthrough = (
+                    "content-encoding" in headers
+                    or message["status"] in (204, 206, 304)
+                    or content_type.startswith(_INCOMPRESSIBLE_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                elif content_type.startswith("text/event-stream"):
+                    compressor = self._start_compression(message, encoding)
+                    await send(message)
+                else:
+                    # Held back until the first body chunk decides the encoding.
+                    start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                response_start, start = start, None
+                if len(body) < self.minimum_size:
+                    passthrough = True
+                    self.stats.skipped += 1
+                    await send(response_start)
+                    await send(message)
+                    return
+                compressor = self._start_compression(response_start, encoding)
+                if not more_body:
+                    compressed = self._compress(compressor, body, final=True)
+                    headers = MutableHeaders(raw=response_start["headers"])
+                    headers["content-length"] = str(len(compressed))
+                    await send(response_start)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                await send(response_start)
+
+            assert compressor is not None
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": self._compress(compressor, body, final=not more_body),
+                    "more_body": more_body,
+                }
+            )
+
+        await self.app(scope, receive, send_compressed)
+
+    def _start_compression(self, response_start: Message, encoding: str) -> _Compressor:
+        """
+        Mark the response as compressed with ``encoding``.
+        """
+        self.stats.count_response(encoding)
+        headers = MutableHeaders(raw=response_start["headers"])
+        headers["content-encoding"] = encoding
+        headers.add_vary_header("accept-encoding")
+        del headers["content-length"]
+        return _Compressor(encoding)
+
+    def _compress(self, compressor: _Compressor, body: bytes, final: bool) -> bytes:
+        started = time.thread_time()
+        compressed = compressor.compress(body, final)
+        self.stats.record(
+            compressor.encoding,
+            len(body),
+            len(compressed),
+            time.thread_time() - started,
+        )
+        return compressed
+
+
+class _DecodingStream(httpx.AsyncByteStream):
+    """
+    Decodes a compressed response body, counting bytes and decoding time.
+    """
+
+    def __init__(
+        self, stream: httpx.AsyncByteStream, encoding: str, stats: CompressionStats
+    ):
+        self.stream = stream
+        self.encoding = encoding
+        self.stats = stats
+        self.decoder = _Decompressor(encoding)
+
+    def _decode(self, data: bytes, final: bool) -> bytes:
+        started = time.thread_time()
+        decoded = self.decoder.decode(data) if data else b""
+        if final:
+            decoded += self.decoder.flush()
+        self.stats.record(
+            self.encoding, len(decoded), len(data), time.thread_time() - started
+        )
+        return decoded
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            decoded = self._decode(chunk, final=False)
+            if decoded:
+                yield decoded
+        decoded = self._decode(b"", final=True)
+        if decoded:
+            yield decoded
+
+    async def aclose(self) -> None:
+        await self.stream.aclose()
+
+
+class UpstreamCompressionTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that decodes compressed Stardog Cloud responses itself,
+    so compression ratios and decoding time can be reported.
+
+    httpx advertises every encoding it can decode (gzip and deflate, plus br
+    and zstd when brotli and zstandard are installed); responses reach the
+    client already decoded. Encodings without a decoder here are left for
+    httpx to decode.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        stats: CompressionStats = upstream_stats,
+    ):
+        self.transport = transport
+        self.stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        encoding = response.headers.get("content-encoding", "").strip().lower()
+        if encoding not in _DECODABLE_ENCODINGS:
+            self.stats.skipped += 1
+            return response
+        self.stats.count_response(encoding)
+        headers = httpx.Headers(response.headers)
+        del headers["content-encoding"]
+        headers.pop("content-length", None)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=headers,
+            stream=_DecodingStream(
+                cast(httpx.AsyncByteStream, response.stream), encoding, self.stats
+            ),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
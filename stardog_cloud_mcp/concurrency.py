@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Optional, cast
+
+import httpx
+
+from stardog_cloud_mcp.constants import (
+    ADAPTIVE_CONCURRENCY_BACKOFF,
+    ADAPTIVE_CONCURRENCY_BASELINE_WEIGHT,
+    ADAPTIVE_CONCURRENCY_INITIAL_LIMIT,
+    ADAPTIVE_CONCURRENCY_MAX_WAIT_SECONDS,
+    ADAPTIVE_CONCURRENCY_SMOOTHING,
+    ADAPTIVE_CONCURRENCY_TOLERANCE,
+)
+from stardog_cloud_mcp.exceptions import StardogMCPOverloadException
+
+logger = logging.getLogger("stardog_cloud_mcp")
+
+# Responses meaning Stardog Cloud is already overloaded.
+_OVERLOAD_STATUSES = (429, 503, 504)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limit for upstream requests that follows Stardog Cloud's
+    latency (gradient algorithm).
+
+    A slow moving average of the round-trip time is the baseline, kept per
+    kind of request, since a streamed answer takes far longer than a
+    settings lookup. While requests come back close to their baseline, the
+    limit grows by about its square root per adjustment; when they slow
+    down, the limit shrinks in proportion (at most by half), before queues
+    build up upstream.
+    Timeouts and overload responses cut the limit multiplicatively.
+
+    Requests over the limit wait up to ``max_wait`` seconds for a slot, then
+    fail fast instead of piling onto a struggling upstream.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: int = ADAPTIVE_CONCURRENCY_INITIAL_LIMIT,
+        max_wait: float = ADAPTIVE_CONCURRENCY_MAX_WAIT_SECONDS,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_limit: Upper bound for the limit
+            min_limit: Lower bound for the limit
+            initial_limit: Limit before any latency has been measured
+            max_wait: Longest a request waits for a slot, in seconds
+        """
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.shed = 0
+        self.baseline_rtts: dict[str, float] = {}
+        self.last_rtt: Optional[float] = None
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def current_limit(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    async def acquire(self) -> None:
+        """
+        Take a slot, waiting at most ``max_wait`` seconds.
+
+        Raises:
+            StardogMCPOverloadException: If no slot frees up in time
+        """
+        if self.in_flight < self.current_limit and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            raise StardogMCPOverloadException(self.current_limit) from None
+        except BaseException:
+            # Cancelled right after a slot was handed over: give it back.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        """
+        Give a slot back, handing it to the next waiter if the limit allows.
+        """
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.current_limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def on_sample(self, rtt: float, overloaded: bool = False, kind: str = "") -> None:
+        """
+        Adjust the limit after a request.
+
+        Args:
+            rtt: Round-trip time of the request in seconds
+            overloaded: Whether the request timed out or was refused because
+                Stardog Cloud is overloaded
+            kind: Kind of request, e.g. its path; each kind has its own
+                latency baseline
+        """
+        previous = self.current_limit
+        if overloaded:
+            self.limit = max(
+                float(self.min_limit), self.limit * ADAPTIVE_CONCURRENCY_BACKOFF
+            )
+        else:
+            self.last_rtt = rtt
+            baseline = self.baseline_rtts.get(kind, rtt)
+            baseline += ADAPTIVE_CONCURRENCY_BASELINE_WEIGHT * (rtt - baseline)
+            self.baseline_rtts[kind] = baseline
+            gradient = (
+                max(0.5, min(1.0, ADAPTIVE_CONCURRENCY_TOLERANCE * baseline / rtt))
+                if rtt > 0
+                else 1.0
+            )
+            # Only grow while the limit is actually being used.
+            headroom = (
+                math.sqrt(self.limit) if self.in_flight >= self.limit / 2 else 0.0
+            )
+            target = self.limit * gradient + headroom
+            self.limit += ADAPTIVE_CONCURRENCY_SMOOTHING * (target - self.limit)
+            self.limit = max(
+                float(self.min_limit), min(float(self.max_limit), self.limit)
+            )
+        if self.current_limit != previous:
+            logger.debug(
+                f"Upstream concurrency limit {previous} -> {self.current_limit}"
+            )
+        self._wake()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Describe the limiter's current state.
+        """
+        return {
+            "limit": self.current_limit,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "shed": self.shed,
+            "baseline_rtt_ms": {
+                kind: round(rtt * 1000, 1) for kind, rtt in self.baseline_rtts.items()
+            },
+            "last_rtt_ms": (
+                round(self.last_rtt * 1000, 1) if self.last_rtt is not None else None
+            ),
+        }
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """
+    Holds a limiter slot until the response body is closed.
+
+    ``on_sample`` is called with the overload signal once the body has been
+    read to the end (``False``) or timed out (``True``); bodies abandoned
+    half-way or failing otherwise are not sampled.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, release, on_sample=None):
+        self.stream = stream
+        self.release = release
+        self.on_sample = on_sample
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self.stream:
+                yield chunk
+        except httpx.TimeoutException:
+            self._sample(overloaded=True)
+            raise
+        self._sample(overloaded=False)
+
+    def _sample(self, overloaded: bool) -> None:
+        on_sample, self.on_sample = self.on_sample, None
+        if on_sample is not None:
+            on_sample(overloaded)
+
+    async def aclose(self) -> None:
+        try:
+            await self.stream.aclose()
+        finally:
+            self.release()
+
+
+class AdaptiveConcurrencyTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that runs upstream requests under an adaptive
+    concurrency limit.
+
+    Latency is measured until the response body has been read, since
+    Stardog Cloud streams answers as it generates them; a timeout while
+    reading the body counts as overload. Other error responses, such as the
+    fast ``401`` readiness probes get, are not sampled, as they would pull
+    the baseline down.
+    """
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, limiter: AdaptiveConcurrencyLimiter
+    ):
+        self.transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.acquire()
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.limiter.release()
+
+        def on_sample(overloaded: bool) -> None:
+            self.limiter.on_sample(
+                time.monotonic() - started, overloaded=overloaded, kind=request.url.path
+            )
+
+        started = time.monotonic()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except httpx.TimeoutException:
+            on_sample(overloaded=True)
+            release()
+            raise
+        except BaseException:
+            release()
+            raise
+        if response.status_code in _OVERLOAD_STATUSES:
+            on_sample(overloaded=True)
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(
+                cast(httpx.AsyncByteStream, response.stream),
+                release,
+                on_sample if response.is_success else None,
+            ),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -7,3 +7,100 @@ class Headers:
     STARDOG_CLOUD_API_KEY = "x-sdc-api-key"
     STARDOG_CLOUD_CLIENT_ID = "x-sdc-client-id"
     STARDOG_AUTH_TOKEN_OVERRIDE = "x-sd-auth-token"
+    STARDOG_MCP_ADMIN_TOKEN = "x-sdc-admin-token"
+
+
+# Upper bound on the startup warm-up phase, so an unreachable upstream
+# delays startup instead of blocking it.
+WARMUP_TIMEOUT_SECONDS = 30.0
+
+# How long Voicebox app settings (prefetched during warm-up or fetched by a
+# tool call) are served without a new round trip to Stardog Cloud.
+SETTINGS_CACHE_TTL_SECONDS = 300.0
+
+# Bounds of the per-conversation Voicebox answer cache, which serves
+# identical repeats of a question within a conversation.
+ANSWER_CACHE_MAX_CONVERSATIONS = 1000
+ANSWER_CACHE_MAX_ENTRIES_PER_CONVERSATION = 8
+ANSWER_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Every tool the server can register; sparql_execute and
+# voicebox_generate_and_execute need a Stardog endpoint.
+TOOL_NAMES = (
+    "voicebox_settings",
+    "voicebox_ask",
+    "voicebox_generate_query",
+    "sparql_execute",
+    "voicebox_generate_and_execute",
+)
+
+# Voicebox streaming endpoint, called directly when answers are passed
+# through raw instead of being parsed by pystardog.
+VOICEBOX_STREAM_ASK_PATH = "/v1/voicebox/stream/ask"
+
+# Bounds for SPARQL execution against the Voicebox app's Stardog database.
+DEFAULT_SPARQL_PAGE_SIZE = 100
+MAX_SPARQL_PAGE_SIZE = 1000
+DEFAULT_SPARQL_MAX_ROWS = 10000
+DEFAULT_SPARQL_TIMEOUT_SECONDS = 60.0
+
+# Upstream rate limiting. The retry delay is used when a 429 response carries
+# no usable Retry-After header.
+DEFAULT_RATE_LIMIT_MAX_WAIT_SECONDS = 5.0
+DEFAULT_RATE_LIMIT_RETRY_AFTER_SECONDS = 1.0
+MAX_RATE_LIMIT_BUCKETS = 10000
+
+# Per-request credential resolution: cached Voicebox app bindings, and API
+# tokens Stardog Cloud rejected, which fail fast until the entry expires.
+APP_BINDING_CACHE_SIZE = 1024
+REJECTED_TOKEN_CACHE_SIZE = 1024
+REJECTED_TOKEN_TTL_SECONDS = 60.0
+
+# On-demand profiling: captures stop by themselves after at most this long,
+# and the sampling profiler records the event loop's stack at this interval.
+MAX_PROFILE_SECONDS = 300.0
+PROFILE_SAMPLE_INTERVAL_SECONDS = 0.005
+
+# Readiness checks in HTTP mode. The upstream probe result is reused for the
+# TTL so frequent /readyz polling never turns into upstream load.
+READINESS_PROBE_TTL_SECONDS = 10.0
+READINESS_PROBE_TIMEOUT_SECONDS = 2.0
+EVENT_LOOP_LAG_INTERVAL_SECONDS = 0.5
+EVENT_LOOP_LAG_WINDOW = 10
+MAX_EVENT_LOOP_LAG_SECONDS = 1.0
+
+# Execution lanes: how long a tool call waits for a free slot in its lane
+# before failing, when the lane does not set its own queue timeout.
+DEFAULT_LANE_QUEUE_TIMEOUT_SECONDS = 10.0
+
+# Structured logging: records below ERROR waiting for the background writer
+# beyond this many are dropped instead of blocking the event loop.
+LOG_QUEUE_MAX_PENDING = 10000
+
+# Response compression in HTTP mode. Responses other than event streams whose
+# first body chunk is smaller than the minimum size are sent uncompressed;
+# the levels favour speed, since compression runs on the event loop.
+DEFAULT_COMPRESSION_MIN_SIZE = 1024
+GZIP_COMPRESSION_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_COMPRESSION_LEVEL = 3
+
+# Multi-endpoint failover. Latency and error scores are exponentially
+# weighted averages; an endpoint that refuses connections is skipped for the
+# cooldown, and an endpoint unused for the probe interval is retried.
+FAILOVER_EWMA_WEIGHT = 0.2
+FAILOVER_ERROR_PENALTY = 10.0
+FAILOVER_COOLDOWN_SECONDS = 30.0
+FAILOVER_PROBE_INTERVAL_SECONDS = 60.0
+MAX_CONVERSATION_AFFINITY = 10000
+
+# Adaptive upstream concurrency limit. The baseline round-trip time is a
+# slow moving average; requests up to TOLERANCE times slower than it do not
+# shrink the limit. Timeouts and overload responses multiply the limit by
+# BACKOFF. Requests over the limit wait at most MAX_WAIT before failing.
+ADAPTIVE_CONCURRENCY_INITIAL_LIMIT = 20
+ADAPTIVE_CONCURRENCY_BASELINE_WEIGHT = 0.05
+ADAPTIVE_CONCURRENCY_SMOOTHING = 0.2
+ADAPTIVE_CONCURRENCY_TOLERANCE = 1.5
+ADAPTIVE_CONCURRENCY_BACKOFF = 0.9
+ADAPTIVE_CONCURRENCY_MAX_WAIT_SECONDS = 1.0
@@ -7,3 +7,45 @@ class StardogMCPToolException(Exception):
         self.name = tool_name
         error_message = f"Error executing tool: {tool_name} - {message}"
         super().__init__(error_message)
+
+
+class StardogMCPRateLimitException(Exception):
+    """
+    Exception for upstream calls refused because the API key is being throttled.
+    """
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        error_message = (
+            f"Stardog Cloud rate limit reached, retry after {retry_after:.1f}s"
+        )
+        super().__init__(error_message)
+
+
+class StardogMCPQueueTimeoutException(Exception):
+    """
+    Exception for tool calls that waited too long for a slot in their lane.
+    """
+
+    def __init__(self, lane: str, queue_timeout: float):
+        self.lane = lane
+        self.queue_timeout = queue_timeout
+        error_message = (
+            f"Execution lane '{lane}' is busy; no slot freed up within "
+            f"{queue_timeout:.1f}s, retry later"
+        )
+        super().__init__(error_message)
+
+
+class StardogMCPOverloadException(Exception):
+    """
+    Exception for upstream calls shed because Stardog Cloud is slowing down.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        error_message = (
+            f"Stardog Cloud is responding slowly; {limit} calls are already "
+            "in flight, retry later"
+        )
+        super().__init__(error_message)
@@ -0,0 +1,289 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import httpx
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+from stardog_cloud_mcp.constants import (
+    FAILOVER_COOLDOWN_SECONDS,
+    FAILOVER_ERROR_PENALTY,
+    FAILOVER_EWMA_WEIGHT,
+    FAILOVER_PROBE_INTERVAL_SECONDS,
+    MAX_CONVERSATION_AFFINITY,
+)
+
+logger = logging.getLogger("stardog_cloud_mcp")
+
+# Voicebox conversations live on the endpoint that created them; other
+# requests (e.g. app settings) may go to any endpoint.
+_CONVERSATION_PATH = "/v1/voicebox/"
+
+# Errors raised before the request reached the endpoint, so retrying it on
+# another endpoint can never run it twice.
+_CONNECTION_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+
+def parse_endpoints(value: str) -> list[str]:
+    """
+    Parse a comma-separated list of Stardog Cloud endpoints.
+
+    Args:
+        value: Raw value from the command line or environment
+
+    Returns:
+        The endpoints, in order of preference
+
+    Raises:
+        ValueError: If no endpoint is given
+    """
+    endpoints = [entry.strip().rstrip("/") for entry in value.split(",")]
+    endpoints = [entry for entry in endpoints if entry]
+    if not endpoints:
+        raise ValueError("At least one Stardog Cloud endpoint is required")
+    return endpoints
+
+
+@dataclass
+class EndpointState:
+    """
+    Rolling latency and error scores of one Stardog Cloud endpoint.
+    """
+
+    url: str
+    latency: Optional[float] = None
+    error_rate: float = 0.0
+    down_until: float = 0.0
+    last_used: float = 0.0
+
+    @property
+    def score(self) -> float:
+        # Untried endpoints score 0, so each one is tried early on.
+        return (self.latency or 0.0) * (1 + FAILOVER_ERROR_PENALTY * self.error_rate)
+
+
+class EndpointSelector:
+    """
+    Picks the healthiest Stardog Cloud endpoint for each request and keeps
+    each Voicebox conversation on the endpoint that created it.
+
+    Endpoints are ranked by an exponentially weighted average of their
+    response latency, penalized by their recent error rate. An endpoint that
+    refuses connections is skipped for ``cooldown`` seconds, and an endpoint
+    unused for ``probe_interval`` seconds gets the next request, so its score
+    reflects how it behaves now.
+    """
+
+    def __init__(
+        self,
+        endpoints: list[str],
+        cooldown: float = FAILOVER_COOLDOWN_SECONDS,
+        probe_interval: float = FAILOVER_PROBE_INTERVAL_SECONDS,
+        max_conversations: int = MAX_CONVERSATION_AFFINITY,
+    ):
+        """
+        Initialize the selector.
+
+        Args:
+            endpoints: Endpoint base URLs, in order of preference
+            cooldown: Seconds an unreachable endpoint is skipped
+            probe_interval: Seconds after which an unused endpoint is retried
+            max_conversations: Maximum number of conversations pinned at once
+        """
+        self.endpoints = [EndpointState(url) for url in endpoints]
+        self.cooldown = cooldown
+        self.probe_interval = probe_interval
+        self.max_conversations = max_conversations
+        # conversation id -> endpoint it was created on
+        self._conversations: OrderedDict[str, EndpointState] = OrderedDict()
+
+    def candidates(self, now: Optional[float] = None) -> list[EndpointState]:
+        """
+        Endpoints in the order they should be tried.
+
+        Reachable endpoints come first, a stale one ahead of the rest, then
+        best score first; endpoints in cooldown come last, as a last resort.
+        """
+        now = time.monotonic() if now is None else now
+        up = [state for state in self.endpoints if state.down_until <= now]
+        down = [state for state in self.endpoints if state.down_until > now]
+        up.sort(key=lambda state: state.score)
+        stale = [
+            state
+            for state in up
+            if state.latency is not None
+            and now - state.last_used >= self.probe_interval
+        ]
+        if stale:
+            up.remove(stale[0])
+            up.insert(0, stale[0])
+        down.sort(key=lambda state: state.down_until)
+        return up + down
+
+    def record(self, state: EndpointState, latency: float, error: bool) -> None:
+        """
+        Fold the outcome of a request into the endpoint's scores.
+        """
+        state.last_used = time.monotonic()
+        state.latency = (
+            latency
+            if state.latency is None
+            else state.latency + FAILOVER_EWMA_WEIGHT * (latency - state.latency)
+        )
+        state.error_rate += FAILOVER_EWMA_WEIGHT * (float(error) - state.error_rate)
+
+    def unreachable(self, state: EndpointState) -> None:
+        """
+        Take an endpoint that refused a connection out of rotation for a while.
+        """
+        now = time.monotonic()
+        state.last_used = now
+        state.down_until = now + self.cooldown
+        state.error_rate += FAILOVER_EWMA_WEIGHT * (1.0 - state.error_rate)
+
+    def pinned(self, conversation_id: str) -> Optional[EndpointState]:
+        """
+        The endpoint a conversation was created on, if known.
+        """
+        state = self._conversations.get(conversation_id)
+        if state is not None:
+            self._conversations.move_to_end(conversation_id)
+        return state
+
+    def pin(self, conversation_id: str, state: EndpointState) -> None:
+        """
+        Keep a conversation's later calls on ``state``.
+        """
+        self._conversations[conversation_id] = state
+        self._conversations.move_to_end(conversation_id)
+        if len(self._conversations) > self.max_conversations:
+            self._conversations.popitem(last=False)
+
+
+@dataclass
+class ConversationRoute:
+    """
+    The conversation a tool call belongs to, and the endpoint that served
+    its conversation requests.
+    """
+
+    conversation_id: Optional[str] = None
+    endpoint: Optional[EndpointState] = None
+
+
+_current_route: ContextVar[Optional[ConversationRoute]] = ContextVar(
+    "stardog_mcp_conversation_route", default=None
+)
+
+
+class FailoverTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that sends each request to the healthiest endpoint and
+    retries it on the next one when a connection cannot be established.
+
+    Requests of a conversation already pinned to an endpoint always go to
+    that endpoint, since the conversation's history only exists there.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, selector: EndpointSelector):
+        self.transport = transport
+        self.selector = selector
+        # Requests are built against the first endpoint (the client's base URL).
+        self._base_path = httpx.URL(selector.endpoints[0].url).raw_path.rstrip(b"/")
+
+    def _routed(self, request: httpx.Request, state: EndpointState) -> httpx.Request:
+        endpoint = httpx.URL(state.url)
+        path = request.url.raw_path.removeprefix(self._base_path)
+        url = endpoint.copy_with(raw_path=endpoint.raw_path.rstrip(b"/") + path)
+        headers = request.headers.copy()
+        headers["host"] = url.netloc.decode("ascii")
+        return httpx.Request(
+            request.method,
+            url,
+            headers=headers,
+            content=request.content,
+            extensions=request.extensions,
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        route = _current_route.get()
+        conversational = route is not None and _CONVERSATION_PATH in request.url.path
+        pinned = (
+            self.selector.pinned(route.conversation_id)
+            if conversational and route is not None and route.conversation_id
+            else None
+        )
+        candidates = [pinned] if pinned is not None else self.selector.candidates()
+        for attempt, state in enumerate(candidates, start=1):
+            started = time.monotonic()
+            try:
+                response = await self.transport.handle_async_request(
+                    self._routed(request, state)
+                )
+            except _CONNECTION_ERRORS as e:
+                self.selector.unreachable(state)
+                if attempt == len(candidates):
+                    raise
+                logger.warning(
+                    f"Stardog Cloud endpoint {state.url} is unreachable ({e!r}); "
+                    f"failing over to {candidates[attempt].url}"
+                )
+                continue
+            except httpx.TransportError:
+                self.selector.record(state, time.monotonic() - started, error=True)
+                raise
+            self.selector.record(
+                state, time.monotonic() - started, error=response.status_code >= 500
+            )
+            if conversational and route is not None:
+                route.endpoint = state
+            return response
+        raise RuntimeError("No Stardog Cloud endpoint configured")
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def _result_conversation_id(result: Any) -> Optional[str]:
+    """
+    The conversation id a tool returned in its JSON result, if any.
+    """
+    for content in getattr(result, "content", None) or []:
+        try:
+            payload = json.loads(getattr(content, "text", "") or "")
+        except ValueError:
+            continue
+        if isinstance(payload, dict) and payload.get("conversation_id"):
+            return str(payload["conversation_id"])
+    return None
+
+
+class ConversationAffinityMiddleware(Middleware):
+    """
+    Ties each tool call to its conversation, and pins new conversations to
+    the endpoint that created them.
+    """
+
+    def __init__(self, selector: EndpointSelector):
+        self.selector = selector
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext):
+        arguments = context.message.arguments or {}
+        route = ConversationRoute(
+            (arguments.get("conversation_id") or "").strip() or None
+        )
+        token = _current_route.set(route)
+        try:
+            result = await call_next(context)
+        finally:
+            _current_route.reset(token)
+        if route.endpoint is not None:
+            conversation_id = route.conversation_id or _result_conversation_id(result)
+            if conversation_id:
+                self.selector.pin(conversation_id, route.endpoint)
+        return result
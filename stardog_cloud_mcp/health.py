@@ -0,0 +1,212 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from stardog_cloud_mcp import __version__
+from stardog_cloud_mcp.concurrency import AdaptiveConcurrencyLimiter
+from stardog_cloud_mcp.constants import (
+    EVENT_LOOP_LAG_INTERVAL_SECONDS,
+    EVENT_LOOP_LAG_WINDOW,
+    MAX_EVENT_LOOP_LAG_SECONDS,
+    READINESS_PROBE_TIMEOUT_SECONDS,
+    READINESS_PROBE_TTL_SECONDS,
+)
+
+logger = logging.getLogger("stardog_cloud_mcp")
+
+# Gateway errors mean Stardog Cloud is reachable in name only.
+_UNAVAILABLE_STATUSES = (502, 503, 504)
+
+
+class HealthMonitor:
+    """
+    Tracks what an HTTP-mode replica needs to report readiness: the Stardog
+    Cloud clients of the running lifespan, tool calls in flight, event loop
+    lag, and a cached upstream reachability probe.
+    """
+
+    def __init__(
+        self,
+        probe_ttl: float = READINESS_PROBE_TTL_SECONDS,
+        probe_timeout: float = READINESS_PROBE_TIMEOUT_SECONDS,
+        lag_interval: float = EVENT_LOOP_LAG_INTERVAL_SECONDS,
+        max_loop_lag: float = MAX_EVENT_LOOP_LAG_SECONDS,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            probe_ttl: Seconds an upstream probe result is reused
+            probe_timeout: Time limit for one upstream probe in seconds
+            lag_interval: How often event loop lag is measured, in seconds
+            max_loop_lag: Event loop lag above which the replica is not ready
+            concurrency_limiter: Adaptive upstream concurrency limiter whose
+                state is reported (optional)
+        """
+        self.probe_ttl = probe_ttl
+        self.probe_timeout = probe_timeout
+        self.lag_interval = lag_interval
+        self.max_loop_lag = max_loop_lag
+        self.concurrency_limiter = concurrency_limiter
+        self.started_at = time.monotonic()
+        self.cloud_client: Any = None
+        self.lane_clients: dict[str, Any] = {}
+        self.in_flight = 0
+        self._lag_samples: deque[float] = deque(maxlen=EVENT_LOOP_LAG_WINDOW)
+        self._lag_task: Optional[asyncio.Task] = None
+        self._probe: Optional[dict[str, Any]] = None
+        self._probe_at = 0.0
+        self._probe_lock: Optional[asyncio.Lock] = None
+
+    @asynccontextmanager
+    async def running(
+        self, cloud_client: Any, lane_clients: Optional[dict[str, Any]] = None
+    ) -> AsyncIterator[None]:
+        """
+        Report on ``cloud_client`` and measure event loop lag while open.
+
+        Args:
+            cloud_client: The default Stardog Cloud client
+            lane_clients: Clients of execution lanes with their own connection
+                pool, by lane name (optional)
+        """
+        self.cloud_client = cloud_client
+        self.lane_clients = dict(lane_clients or {})
+        self._probe = None
+        self._probe_lock = asyncio.Lock()
+        self._lag_task = asyncio.create_task(self._measure_loop_lag())
+        try:
+            yield
+        finally:
+            self._lag_task.cancel()
+            self._lag_task = None
+            if self.cloud_client is cloud_client:
+                self.cloud_client = None
+                self.lane_clients = {}
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """
+        Count a tool call as in flight.
+        """
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    async def _measure_loop_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            self._lag_samples.append(
+                max(0.0, loop.time() - started - self.lag_interval)
+            )
+
+    @property
+    def loop_lag(self) -> float:
+        """
+        Worst event loop lag over the recent measurement window, in seconds.
+        """
+        return max(self._lag_samples, default=0.0)
+
+    async def probe_upstream(self) -> dict[str, Any]:
+        """
+        Return the cached upstream probe result, probing at most once per TTL.
+        """
+        assert self._probe_lock is not None
+        async with self._probe_lock:
+            if (
+                self._probe is not None
+                and time.monotonic() - self._probe_at < self.probe_ttl
+            ):
+                return self._probe
+            started = time.perf_counter()
+            try:
+                status = await self.cloud_client.probe(self.probe_timeout)
+                probe = {
+                    "reachable": status not in _UNAVAILABLE_STATUSES,
+                    "status": status,
+                }
+            except Exception as e:
+                logger.warning(f"Stardog Cloud readiness probe failed: {e!r}")
+                probe = {"reachable": False, "error": type(e).__name__}
+            probe["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            self._probe, self._probe_at = probe, time.monotonic()
+            return probe
+
+    async def readiness(self) -> tuple[bool, dict[str, Any]]:
+        """
+        Evaluate readiness.
+
+        Returns:
+            Whether the replica should receive traffic, and the check details
+        """
+        if self.cloud_client is None:
+            return False, {"status": "starting"}
+        upstream = await self.probe_upstream()
+        pool = self.cloud_client.pool_stats()
+        lane_pools = {
+            name: client.pool_stats() for name, client in self.lane_clients.items()
+        }
+        checks = {
+            "upstream": upstream,
+            "event_loop_lag_ms": round(self.loop_lag * 1000, 1),
+            "in_flight": self.in_flight,
+            "pool": pool,
+        }
+        if lane_pools:
+            checks["lane_pools"] = lane_pools
+        if self.concurrency_limiter is not None:
+            checks["concurrency"] = self.concurrency_limiter.stats()
+        # A full lane pool delays that lane's tools just as a full default
+        # pool delays every other tool.
+        ready = (
+            upstream["reachable"]
+            and self.loop_lag <= self.max_loop_lag
+            and not any(p and p["queued"] for p in [pool, *lane_pools.values()])
+        )
+        return bool(ready), {"status": "ready" if ready else "degraded", **checks}
+
+
+class InFlightMiddleware(Middleware):
+    """
+    Counts tool calls in flight for readiness reporting.
+    """
+
+    def __init__(self, monitor: HealthMonitor):
+        self.monitor = monitor
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext):
+        with self.monitor.track():
+            return await call_next(context)
+
+
+def register_health_routes(server, monitor: HealthMonitor) -> None:
+    """
+    Register the ``/healthz`` (liveness) and ``/readyz`` (readiness) routes.
+    """
+
+    @server.custom_route("/healthz", methods=["GET"])
+    async def healthz(request: Request) -> Response:
+        return JSONResponse(
+            {
+                "status": "ok",
+                "version": __version__,
+                "uptime_seconds": round(time.monotonic() - monitor.started_at, 1),
+            }
+        )
+
+    @server.custom_route("/readyz", methods=["GET"])
+    async def readyz(request: Request) -> Response:
+        ready, details = await monitor.readiness()
+        return JSONResponse(details, status_code=200 if ready else 503)
@@ -0,0 +1,147 @@
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+from stardog_cloud_mcp.constants import DEFAULT_LANE_QUEUE_TIMEOUT_SECONDS, TOOL_NAMES
+from stardog_cloud_mcp.exceptions import StardogMCPQueueTimeoutException
+
+
+@dataclass(frozen=True)
+class LaneConfig:
+    """
+    A group of tools sharing a concurrency limit, a queue timeout and,
+    optionally, a dedicated upstream connection pool.
+    """
+
+    name: str
+    tools: tuple[str, ...]
+    max_concurrency: Optional[int] = None
+    max_connections: Optional[int] = None
+    queue_timeout: float = DEFAULT_LANE_QUEUE_TIMEOUT_SECONDS
+
+
+def parse_lanes(value: Optional[str]) -> list[LaneConfig]:
+    """
+    Parse execution lanes from a semicolon-separated list of
+    ``name=tool[,tool...][:concurrency[:connections[:queue_timeout]]]`` entries.
+
+    An omitted or zero concurrency means no limit; omitted or zero connections
+    means the lane shares the default upstream connection pool.
+
+    Args:
+        value: Raw value from the command line or environment
+
+    Returns:
+        The configured lanes
+
+    Raises:
+        ValueError: If an entry is malformed, a lane name repeats, a tool is
+            unknown or a tool is assigned to two lanes
+    """
+    lanes: list[LaneConfig] = []
+    names: set[str] = set()
+    assigned: set[str] = set()
+    for entry in (value or "").split(";"):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, spec = entry.partition("=")
+        tools_spec, *limits = spec.split(":")
+        tools = tuple(tool.strip() for tool in tools_spec.split(",") if tool.strip())
+        name = name.strip()
+        if not name or not tools or len(limits) > 3:
+            raise ValueError(f"Invalid execution lane: {entry}")
+        if name in names:
+            raise ValueError(f"Duplicate execution lane: {name}")
+        names.add(name)
+        unknown = set(tools).difference(TOOL_NAMES)
+        if unknown:
+            raise ValueError(
+                f"Unknown tools in execution lane {name}: {sorted(unknown)}"
+            )
+        duplicates = assigned.intersection(tools)
+        if duplicates:
+            raise ValueError(
+                f"Tools assigned to more than one lane: {sorted(duplicates)}"
+            )
+        assigned.update(tools)
+        concurrency, connections, queue_timeout = (limits + ["", "", ""])[:3]
+        lanes.append(
+            LaneConfig(
+                name=name,
+                tools=tools,
+                max_concurrency=(int(concurrency) or None) if concurrency else None,
+                max_connections=(int(connections) or None) if connections else None,
+                queue_timeout=(
+                    float(queue_timeout)
+                    if queue_timeout
+                    else DEFAULT_LANE_QUEUE_TIMEOUT_SECONDS
+                ),
+            )
+        )
+    return lanes
+
+
+class ExecutionLane:
+    """
+    Admission control for the tools of one lane.
+    """
+
+    def __init__(self, config: LaneConfig):
+        self.config = config
+        self.in_flight = 0
+        self.waiting = 0
+        self._slots = (
+            asyncio.Semaphore(config.max_concurrency)
+            if config.max_concurrency
+            else None
+        )
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold one of the lane's slots, waiting at most the queue timeout.
+
+        Raises:
+            StardogMCPQueueTimeoutException: If no slot frees up in time
+        """
+        if self._slots is not None:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(
+                    self._slots.acquire(), timeout=self.config.queue_timeout
+                )
+            except asyncio.TimeoutError:
+                raise StardogMCPQueueTimeoutException(
+                    self.config.name, self.config.queue_timeout
+                ) from None
+            finally:
+                self.waiting -= 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            if self._slots is not None:
+                self._slots.release()
+
+
+class LaneMiddleware(Middleware):
+    """
+    Runs each tool call inside its lane's concurrency limit.
+    """
+
+    def __init__(self, lanes: list[ExecutionLane]):
+        self.lanes_by_tool = {
+            tool: lane for lane in lanes for tool in lane.config.tools
+        }
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext):
+        lane = self.lanes_by_tool.get(context.message.name)
+        if lane is None:
+            return await call_next(context)
+        async with lane.slot():
+            return await call_next(context)
@@ -0,0 +1,296 @@
+import asyncio
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+
+from stardog_cloud_mcp.constants import (
+    MAX_PROFILE_SECONDS,
+    PROFILE_SAMPLE_INTERVAL_SECONDS,
+    Headers,
+)
+
+PROFILE_MODES = ("cprofile", "sample")
+
+
+class Profiler:
+    """
+    On-demand CPU profiler for the server's event loop.
+
+    One capture runs at a time, either with ``cProfile`` or with a sampling
+    thread that records the event loop's stack at a fixed interval. Work done
+    inside tools is attributed to the tool name via ``attribute()``, which
+    the ``tool_logging`` wrapper enters around every tool call.
+    """
+
+    def __init__(self) -> None:
+        self.mode: Optional[str] = None
+        self.started_at = 0.0
+        self.last_report: Optional[str] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_handle: Optional[asyncio.TimerHandle] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._sampling = threading.Event()
+        self._samples: Counter[str] = Counter()
+        self._task_tools: dict[asyncio.Task, str] = {}
+        self._tool_calls: Counter[str] = Counter()
+        self._tool_seconds: defaultdict[str, float] = defaultdict(float)
+
+    @property
+    def active(self) -> bool:
+        return self.mode is not None
+
+    @contextmanager
+    def attribute(self, tool_name: str) -> Iterator[None]:
+        """
+        Attribute the work of the current task to ``tool_name`` while a
+        capture is running; a no-op otherwise.
+        """
+        if not self.active:
+            yield
+            return
+        task = asyncio.current_task()
+        if task is not None:
+            self._task_tools[task] = tool_name
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._tool_calls[tool_name] += 1
+            self._tool_seconds[tool_name] += time.perf_counter() - started
+            if task is not None:
+                self._task_tools.pop(task, None)
+
+    def start(self, mode: str, seconds: float) -> None:
+        """
+        Start a capture that stops by itself after ``seconds``.
+
+        Raises:
+            ValueError: If the mode is unknown
+            RuntimeError: If a capture is already running
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        if self.active:
+            raise RuntimeError(f"A {self.mode} capture is already running")
+        seconds = max(0.1, min(seconds, MAX_PROFILE_SECONDS))
+
+        self._loop = asyncio.get_running_loop()
+        self._samples.clear()
+        self._tool_calls.clear()
+        self._tool_seconds.clear()
+        self.mode = mode
+        self.started_at = time.monotonic()
+        if mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampling.set()
+            self._sampler = threading.Thread(
+                target=self._sample,
+                args=(self._loop, threading.get_ident()),
+                name="stardog-cloud-mcp-sampler",
+                daemon=True,
+            )
+            self._sampler.start()
+        self._stop_handle = self._loop.call_later(seconds, self.stop)
+
+    def stop(self) -> str:
+        """
+        Stop the running capture, if any, and return the latest report.
+        """
+        if not self.active:
+            return self.last_report or "No profile has been captured yet."
+        if self._stop_handle is not None:
+            self._stop_handle.cancel()
+            self._stop_handle = None
+
+        elapsed = time.monotonic() - self.started_at
+        if self._profile is not None:
+            self._profile.disable()
+            stats_output = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stats_output)
+            stats.sort_stats("cumulative").print_stats(50)
+            body = stats_output.getvalue()
+            self._profile = None
+        else:
+            self._sampling.clear()
+            if self._sampler is not None:
+                self._sampler.join()
+                self._sampler = None
+            # Collapsed stacks, ready for flamegraph.pl or speedscope.
+            body = "\n".join(
+                f"{stack} {count}" for stack, count in self._samples.most_common()
+            )
+
+        lines = [f"# {self.mode} profile, {elapsed:.1f}s", "# tool calls wall_seconds"]
+        for tool_name, calls in self._tool_calls.most_common():
+            lines.append(f"# {tool_name} {calls} {self._tool_seconds[tool_name]:.3f}")
+        self.last_report = "\n".join(lines) + "\n" + body
+        self.mode = None
+        self._task_tools.clear()
+        return self.last_report
+
+    def _sample(self, loop: asyncio.AbstractEventLoop, thread_id: int) -> None:
+        while self._sampling.is_set():
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                task = asyncio.current_task(loop)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+                    )
+                    frame = frame.f_back
+                tool_name = self._task_tools.get(task, "-") if task else "-"
+                stack.append(tool_name)
+                self._samples[";".join(reversed(stack))] += 1
+            time.sleep(PROFILE_SAMPLE_INTERVAL_SECONDS)
+
+
+profiler = Profiler()
+
+
+def tracemalloc_report(top: int) -> str:
+    """
+    Return the top allocation sites, starting tracemalloc on first use.
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(25)
+        return "tracemalloc started; request again for a snapshot\n"
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    lines = [f"# traced current={current} peak={peak} bytes"]
+    lines += [str(stat) for stat in snapshot.statistics("lineno")[:top]]
+    return "\n".join(lines) + "\n"
+
+
+def stop_tracemalloc() -> bool:
+    """
+    Stop tracemalloc, freeing its traces.
+
+    Returns:
+        Whether tracemalloc was tracing
+    """
+    tracing = tracemalloc.is_tracing()
+    tracemalloc.stop()
+    return tracing
+
+
+def asyncio_tasks_report() -> list[dict]:
+    """
+    Describe every pending asyncio task with its innermost frame.
+    """
+    tasks = []
+    for task in asyncio.all_tasks():
+        stack = task.get_stack(limit=1)
+        tasks.append(
+            {
+                "name": task.get_name(),
+                "coroutine": getattr(
+                    task.get_coro(), "__qualname__", repr(task.get_coro())
+                ),
+                "tool": profiler._task_tools.get(task),
+                "frame": (
+                    f"{stack[0].f_code.co_filename}:{stack[0].f_lineno}"
+                    if stack
+                    else None
+                ),
+            }
+        )
+    return sorted(tasks, key=lambda task: task["coroutine"])
+
+
+def register_profiling_routes(
+    server, admin_token: str, output_dir: Optional[str] = None
+) -> None:
+    """
+    Register the admin-protected ``/debug/*`` profiling routes on ``server``.
+
+    Requests must carry the admin token in the ``x-sdc-admin-token`` header.
+    """
+    # Only HTTP servers register these routes; the profiler itself is also
+    # used in stdio mode, which should not load the compression codecs.
+    from stardog_cloud_mcp.compression import compression_report
+
+    def authorized(request: Request) -> bool:
+        supplied = request.headers.get(Headers.STARDOG_MCP_ADMIN_TOKEN, "")
+        return hmac.compare_digest(supplied.encode(), admin_token.encode())
+
+    def forbidden() -> Response:
+        return JSONResponse({"error": "forbidden"}, status_code=403)
+
+    @server.custom_route("/debug/profile/start", methods=["POST"])
+    async def profile_start(request: Request) -> Response:
+        if not authorized(request):
+            return forbidden()
+        mode = request.query_params.get("mode", "sample")
+        try:
+            seconds = float(request.query_params.get("seconds", "30"))
+            profiler.start(mode, seconds)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        except RuntimeError as e:
+            return JSONResponse({"error": str(e)}, status_code=409)
+        return JSONResponse({"mode": mode, "seconds": seconds})
+
+    @server.custom_route("/debug/profile/stop", methods=["POST"])
+    async def profile_stop(request: Request) -> Response:
+        if not authorized(request):
+            return forbidden()
+        report = profiler.stop()
+        if request.query_params.get("output") == "file":
+            directory = output_dir or tempfile.gettempdir()
+            path = os.path.join(
+                directory, f"stardog-cloud-mcp-profile-{int(time.time())}.txt"
+            )
+            with open(path, "w", encoding="utf-8") as report_file:
+                report_file.write(report)
+            return JSONResponse({"path": path})
+        return PlainTextResponse(report)
+
+    @server.custom_route("/debug/tracemalloc", methods=["GET"])
+    async def tracemalloc_snapshot(request: Request) -> Response:
+        if not authorized(request):
+            return forbidden()
+        try:
+            top = int(request.query_params.get("top", "25"))
+            if top < 0:
+                raise ValueError
+        except ValueError:
+            return JSONResponse(
+                {"error": "top must be a non-negative integer"}, status_code=400
+            )
+        return PlainTextResponse(tracemalloc_report(top))
+
+    @server.custom_route("/debug/tracemalloc", methods=["DELETE"])
+    async def tracemalloc_stop(request: Request) -> Response:
+        if not authorized(request):
+            return forbidden()
+        return JSONResponse({"stopped": stop_tracemalloc()})
+
+    @server.custom_route("/debug/tasks", methods=["GET"])
+    async def tasks(request: Request) -> Response:
+        if not authorized(request):
+            return forbidden()
+        return JSONResponse(asyncio_tasks_report())
+
+    @server.custom_route("/debug/compression", methods=["GET"])
+    async def compression(request: Request) -> Response:
+        if not authorized(request):
+            return forbidden()
+        return JSONResponse(compression_report())
@@ -0,0 +1,179 @@
+import asyncio
+import email.utils
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import httpx
+
+from stardog_cloud_mcp.constants import (
+    DEFAULT_RATE_LIMIT_RETRY_AFTER_SECONDS,
+    MAX_RATE_LIMIT_BUCKETS,
+)
+from stardog_cloud_mcp.exceptions import StardogMCPRateLimitException
+
+logger = logging.getLogger("stardog_cloud_mcp")
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> float:
+    """
+    Parse a ``Retry-After`` header (delay in seconds or an HTTP date).
+
+    Returns:
+        The delay in seconds; a default delay when the header is missing or invalid
+    """
+    if not value:
+        return DEFAULT_RATE_LIMIT_RETRY_AFTER_SECONDS
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return DEFAULT_RATE_LIMIT_RETRY_AFTER_SECONDS
+    return max(0.0, retry_at - (now if now is not None else time.time()))
+
+
+class TokenBucket:
+    """
+    Token bucket that refills at ``rate`` tokens per second up to ``burst``.
+
+    Tokens may be reserved ahead of time (the balance goes negative), so
+    concurrent callers are spaced out instead of all waking at once.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        # Refill resumes from here; set into the future while throttled.
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+
+    def reserve(self, max_wait: float, now: Optional[float] = None) -> float:
+        """
+        Reserve one token.
+
+        Returns:
+            Seconds the caller must wait before using the reserved token
+
+        Raises:
+            StardogMCPRateLimitException: If the wait would exceed ``max_wait``;
+                no token is reserved in that case
+        """
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        wait = max(0.0, self.updated - now) + max(0.0, 1 - self.tokens) / self.rate
+        if wait > max_wait:
+            raise StardogMCPRateLimitException(retry_after=wait)
+        self.tokens -= 1
+        return wait
+
+    def block(self, retry_after: float, now: Optional[float] = None) -> None:
+        """
+        Stop handing out tokens for ``retry_after`` seconds.
+        """
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.updated = max(self.updated, now + retry_after)
+
+
+class RateLimiter:
+    """
+    Per-API-key token buckets pacing requests to Stardog Cloud.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        max_wait: float = 0.0,
+        max_keys: int = MAX_RATE_LIMIT_BUCKETS,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Sustained requests per second allowed for each API key
+            burst: Requests allowed back to back (defaults to ``rate``, minimum 1)
+            max_wait: Longest a caller is paced before failing fast, in seconds
+            max_keys: Maximum number of API keys tracked at once
+        """
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else rate)
+        self.max_wait = max_wait
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    def _bucket(self, key: str) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    async def acquire(self, key: str) -> None:
+        """
+        Wait for a request slot for ``key``.
+
+        Raises:
+            StardogMCPRateLimitException: If no slot frees up within ``max_wait``
+        """
+        wait = self._bucket(key).reserve(self.max_wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def throttled(self, key: str, retry_after: float) -> None:
+        """
+        Record an upstream throttling response for ``key``.
+        """
+        logger.warning(
+            f"Stardog Cloud throttled API key {key}; pausing {retry_after:.1f}s"
+        )
+        self._bucket(key).block(retry_after)
+
+
+def api_key_id(request: httpx.Request) -> str:
+    """
+    Identify the API key of an upstream request without keeping the secret.
+    """
+    authorization = request.headers.get("Authorization", "")
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()[:16]
+
+
+class RateLimitTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that paces requests per API key and honours upstream 429s.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: RateLimiter):
+        self.transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = api_key_id(request)
+        await self.limiter.acquire(key)
+        response = await self.transport.handle_async_request(request)
+        if response.status_code == 429:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            self.limiter.throttled(key, retry_after)
+            await response.aclose()
+            raise StardogMCPRateLimitException(retry_after=retry_after)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -0,0 +1,192 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict
+from typing import IO, Any, AsyncIterator, Optional, cast
+
+import httpx
+
+logger = logging.getLogger("stardog_cloud_mcp")
+
+# Response headers worth keeping; everything else (cookies, request IDs,
+# dates) only makes recordings larger and less stable.
+_RECORDED_HEADERS = ("content-type", "content-encoding", "retry-after")
+
+
+def _request_key(method: str, path: str, body: bytes) -> str:
+    digest = hashlib.sha256(body).hexdigest()[:16]
+    return f"{method} {path} {digest}"
+
+
+def _path_key(method: str, path: str) -> str:
+    return f"{method} {path}"
+
+
+def _encode_chunk(chunk: bytes) -> str:
+    return base64.b64encode(chunk).decode("ascii")
+
+
+def _decode_chunk(chunk: str) -> bytes:
+    return base64.b64decode(chunk)
+
+
+class _RecordingStream(httpx.AsyncByteStream):
+    """
+    Passes response bytes through while noting when each chunk arrived.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self.stream = stream
+        self.on_close = on_close
+        self.chunks: list[tuple[float, bytes]] = []
+        self.last = time.monotonic()
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            now = time.monotonic()
+            self.chunks.append((now - self.last, chunk))
+            self.last = now
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self.stream.aclose()
+        finally:
+            self.on_close(self.chunks)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that records upstream exchanges to a JSON Lines file.
+
+    Each line holds the request method, path and body, the response status
+    and headers, the time to response headers, and every response chunk with
+    the delay since the previous one. Credentials are never recorded.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, path: str):
+        self.transport = transport
+        self.path = path
+        self._file: Optional[IO[str]] = None
+
+    def _write(self, exchange: dict[str, Any]) -> None:
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(exchange, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        started = time.monotonic()
+        response = await self.transport.handle_async_request(request)
+        latency = time.monotonic() - started
+
+        def on_close(chunks: list[tuple[float, bytes]]) -> None:
+            self._write(
+                {
+                    "method": request.method,
+                    "path": request.url.raw_path.decode("ascii"),
+                    "body": _encode_chunk(body),
+                    "status": response.status_code,
+                    "headers": {
+                        name: response.headers[name]
+                        for name in _RECORDED_HEADERS
+                        if name in response.headers
+                    },
+                    "latency": round(latency, 6),
+                    "chunks": [
+                        [round(delay, 6), _encode_chunk(chunk)]
+                        for delay, chunk in chunks
+                    ],
+                }
+            )
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_RecordingStream(
+                cast(httpx.AsyncByteStream, response.stream), on_close
+            ),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        try:
+            await self.transport.aclose()
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class _ReplayStream(httpx.AsyncByteStream):
+    def __init__(self, chunks: list[tuple[float, bytes]], timing_scale: float):
+        self.chunks = chunks
+        self.timing_scale = timing_scale
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for delay, chunk in self.chunks:
+            if delay and self.timing_scale:
+                await asyncio.sleep(delay * self.timing_scale)
+            yield chunk
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that serves exchanges captured by ``RecordingTransport``.
+
+    Requests are matched on method, path and body, falling back to method and
+    path alone; repeated requests cycle through the matching recordings.
+    Recorded delays are multiplied by ``timing_scale``: 1.0 replays the
+    original timing, 0 replays as fast as possible.
+    """
+
+    def __init__(self, path: str, timing_scale: float = 1.0):
+        self.timing_scale = timing_scale
+        self._exchanges: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self._next: dict[str, int] = defaultdict(int)
+        with open(path, encoding="utf-8") as recording:
+            for line in recording:
+                if not line.strip():
+                    continue
+                exchange = json.loads(line)
+                body = _decode_chunk(exchange["body"])
+                method, path_ = exchange["method"], exchange["path"]
+                self._exchanges[_request_key(method, path_, body)].append(exchange)
+                self._exchanges[_path_key(method, path_)].append(exchange)
+        logger.info(f"Replaying upstream traffic from {path}")
+
+    def _match(self, request: httpx.Request, body: bytes) -> Optional[dict[str, Any]]:
+        path = request.url.raw_path.decode("ascii")
+        for key in (
+            _request_key(request.method, path, body),
+            _path_key(request.method, path),
+        ):
+            exchanges = self._exchanges.get(key)
+            if exchanges:
+                index = self._next[key]
+                self._next[key] = index + 1
+                return exchanges[index % len(exchanges)]
+        return None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        exchange = self._match(request, body)
+        if exchange is None:
+            return httpx.Response(
+                status_code=501,
+                json={
+                    "message": f"No recorded exchange for {request.method} {request.url.path}"
+                },
+            )
+        if exchange["latency"] and self.timing_scale:
+            await asyncio.sleep(exchange["latency"] * self.timing_scale)
+        chunks = [(delay, _decode_chunk(chunk)) for delay, chunk in exchange["chunks"]]
+        return httpx.Response(
+            status_code=exchange["status"],
+            headers=exchange["headers"],
+            stream=_ReplayStream(chunks, self.timing_scale),
+        )
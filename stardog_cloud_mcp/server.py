@@ -1,17 +1,57 @@
 import argparse
+import asyncio
 import logging
 import os
 import sys
-from contextlib import asynccontextmanager
-from functools import wraps
-from typing import Annotated, Any, AsyncIterator, Optional, cast
-
+import time
+from contextlib import asynccontextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import partial, wraps
+from typing import Annotated, Any, AsyncIterator, Optional
+
+import anyio
+import httpx
 from fastmcp import FastMCP
 from fastmcp.server.dependencies import get_context, get_http_headers
-from stardog.cloud.client import AsyncClient as StardogAsyncClient
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
 
 from stardog_cloud_mcp import __version__
-from stardog_cloud_mcp.constants import Headers
+from stardog_cloud_mcp.answer_cache import AnswerCache
+from stardog_cloud_mcp.client import AsyncClient as StardogAsyncClient
+from stardog_cloud_mcp.client import http_transport
+from stardog_cloud_mcp.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    AdaptiveConcurrencyTransport,
+)
+from stardog_cloud_mcp.constants import (
+    DEFAULT_COMPRESSION_MIN_SIZE,
+    DEFAULT_RATE_LIMIT_MAX_WAIT_SECONDS,
+    DEFAULT_SPARQL_MAX_ROWS,
+    DEFAULT_SPARQL_TIMEOUT_SECONDS,
+    Headers,
+)
+from stardog_cloud_mcp.failover import (
+    ConversationAffinityMiddleware,
+    EndpointSelector,
+    FailoverTransport,
+    parse_endpoints,
+)
+from stardog_cloud_mcp.lanes import (
+    ExecutionLane,
+    LaneConfig,
+    LaneMiddleware,
+    parse_lanes,
+)
+from stardog_cloud_mcp.profiling import profiler, register_profiling_routes
+from stardog_cloud_mcp.ratelimit import RateLimiter, RateLimitTransport
+from stardog_cloud_mcp.replay import RecordingTransport, ReplayTransport
+from stardog_cloud_mcp.sparql import SparqlExecutor
+from stardog_cloud_mcp.structured_logging import (
+    configure_structured_logging,
+    log_tool_call,
+    shutdown_structured_logging,
+)
 from stardog_cloud_mcp.tools import ToolHandler
 
 logger = logging.getLogger("stardog_cloud_mcp")
@@ -24,14 +64,18 @@ def tool_logging(tool_name: str):
             ctx = get_context()
             if ctx is not None:
                 await ctx.info(f"Entering tool: {tool_name}")
+            started = time.perf_counter()
             try:
-                result = await func(*args, **kwargs)
+                with profiler.attribute(tool_name):
+                    result = await func(*args, **kwargs)
                 if ctx is not None:
                     await ctx.info(f"Exiting tool: {tool_name}")
+                log_tool_call(tool_name, time.perf_counter() - started, _api_token())
                 return result
-            except Exception:
+            except Exception as e:
                 if ctx is not None:
                     await ctx.info(f"Exiting tool: {tool_name} (error)")
+                log_tool_call(tool_name, time.perf_counter() - started, _api_token(), e)
                 raise
 
         return wrapper
@@ -39,21 +83,31 @@ def tool_logging(tool_name: str):
     return decorator
 
 
-def get_header_case_insensitive(
-    headers: Optional[dict], header_name: str
+def lowercase_headers(headers: Optional[dict]) -> dict[str, str]:
+    """
+    Return a copy of ``headers`` with lower-cased names, for direct lookups.
+    """
+    return {key.lower(): value for key, value in (headers or {}).items()}
+
+
+def resolve_header(
+    headers: dict[str, str], header_name: str, arg_value: Optional[str]
 ) -> Optional[str]:
     """
-    Get header value regardless of case.
+    Resolve a parameter from lower-cased headers, falling back to an argument.
+    Headers take precedence over arguments when both are present.
+
+    For API tokens, also checks Authorization header for Bearer tokens.
     """
-    if not headers:
-        return None
-    target = header_name.lower()
+    header_value = headers.get(header_name)
 
-    # Check all headers with case-insensitive comparison
-    for key, value in headers.items():
-        if key.lower() == target:
-            return value
-    return None
+    # Special handling for API token - also check Authorization header
+    if header_name == Headers.STARDOG_CLOUD_API_KEY and not header_value:
+        auth_header = headers.get("authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            header_value = auth_header[7:]  # Remove "Bearer " prefix
+
+    return header_value or arg_value
 
 
 async def resolve_params(
@@ -80,19 +134,8 @@ async def resolve_params(
     Raises:
         ValueError: If parameter is required but not found
     """
-    headers = get_http_headers()
-    header_value = get_header_case_insensitive(headers, header_name)
-
-    # Special handling for API token - also check Authorization header
-    if header_name == Headers.STARDOG_CLOUD_API_KEY and not header_value:
-        auth_header = get_header_case_insensitive(headers, "Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            header_value = auth_header[7:]  # Remove "Bearer " prefix
-
-    if header_value and arg_value:
-        return header_value
-
-    resolved_value = header_value or arg_value
+    headers = lowercase_headers(get_http_headers())
+    resolved_value = resolve_header(headers, header_name, arg_value)
 
     if required and not resolved_value:
         raise ValueError(error_message)
@@ -100,6 +143,95 @@ async def resolve_params(
     return resolved_value
 
 
+@dataclass(frozen=True)
+class Credentials:
+    """
+    Credentials for one tool call, resolved from headers and server arguments.
+    """
+
+    api_token: str
+    client_id: Optional[str]
+    auth_token_override: Optional[str]
+
+
+_current_credentials: ContextVar[Optional[Credentials]] = ContextVar(
+    "stardog_cloud_mcp_credentials", default=None
+)
+
+
+def _api_token() -> Optional[str]:
+    credentials = _current_credentials.get()
+    return credentials.api_token if credentials is not None else None
+
+
+def resolve_credentials(
+    api_token: Optional[str],
+    client_id: Optional[str],
+    auth_token_override: Optional[str],
+) -> Credentials:
+    """
+    Resolve all credentials for the current request with a single header scan.
+
+    Raises:
+        ValueError: If no API token is available
+    """
+    headers = lowercase_headers(get_http_headers())
+    resolved_token = resolve_header(headers, Headers.STARDOG_CLOUD_API_KEY, api_token)
+    if not resolved_token:
+        raise ValueError("API token is required")
+    return Credentials(
+        api_token=resolved_token,
+        client_id=resolve_header(headers, Headers.STARDOG_CLOUD_CLIENT_ID, client_id),
+        auth_token_override=resolve_header(
+            headers, Headers.STARDOG_AUTH_TOKEN_OVERRIDE, auth_token_override
+        ),
+    )
+
+
+class CredentialsMiddleware(Middleware):
+    """
+    Resolves credentials once per tool call and exposes them to the tool.
+    """
+
+    def __init__(
+        self,
+        api_token: Optional[str],
+        client_id: Optional[str],
+        auth_token_override: Optional[str],
+    ):
+        self.api_token = api_token
+        self.client_id = client_id
+        self.auth_token_override = auth_token_override
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext):
+        credentials = resolve_credentials(
+            self.api_token, self.client_id, self.auth_token_override
+        )
+        token = _current_credentials.set(credentials)
+        try:
+            return await call_next(context)
+        finally:
+            _current_credentials.reset(token)
+
+
+def parse_warmup_apps(value: Optional[str]) -> list[tuple[str, Optional[str]]]:
+    """
+    Parse a comma-separated list of ``token[:client_id]`` warm-up entries.
+
+    Args:
+        value: Raw value from the command line or environment
+
+    Returns:
+        (api_token, client_id) pairs; client_id is None when omitted
+    """
+    apps: list[tuple[str, Optional[str]]] = []
+    for entry in (value or "").split(","):
+        token, _, entry_client_id = entry.strip().partition(":")
+        if token:
+            apps.append((token, entry_client_id or None))
+    return apps
+
+
 def initialize_server(
     endpoint: str,
     api_token: str,
@@ -108,12 +240,175 @@ def initialize_server(
     mode: str,
     port: int,
     timeout: Optional[float] = None,
+    warmup_apps: Optional[list[tuple[str, Optional[str]]]] = None,
+    stardog_endpoint: Optional[str] = None,
+    stardog_username: Optional[str] = None,
+    stardog_password: Optional[str] = None,
+    sparql_max_rows: int = DEFAULT_SPARQL_MAX_ROWS,
+    sparql_timeout: float = DEFAULT_SPARQL_TIMEOUT_SECONDS,
+    rate_limit: Optional[float] = None,
+    rate_limit_burst: Optional[float] = None,
+    rate_limit_max_wait: float = DEFAULT_RATE_LIMIT_MAX_WAIT_SECONDS,
+    record_upstream: Optional[str] = None,
+    replay_upstream: Optional[str] = None,
+    replay_timing_scale: float = 1.0,
+    admin_token: Optional[str] = None,
+    profile_dir: Optional[str] = None,
+    lanes: Optional[list[LaneConfig]] = None,
+    log_format: str = "text",
+    log_sample_rate: float = 1.0,
+    compression: bool = False,
+    compression_min_size: int = DEFAULT_COMPRESSION_MIN_SIZE,
+    adaptive_concurrency_limit: Optional[int] = None,
+    answer_cache_ttl: Optional[float] = None,
+    raw_answers: bool = False,
+    http_speedups: bool = False,
 ):
     """
     Start the Stardog Cloud MCP server using FastMCP.
+
+    ``warmup_apps`` lists (api_token, client_id) pairs whose settings are
+    prefetched, and whose upstream connections are opened, before the server
+    starts accepting requests.
+
+    The ``sparql_execute`` and ``voicebox_generate_and_execute`` tools are
+    only registered when ``stardog_endpoint`` points at the Stardog server
+    hosting the Voicebox apps' databases.
+
+    ``lanes`` groups tools into execution lanes with their own concurrency
+    limit and queue timeout; lanes that set ``max_connections`` also get their
+    own Stardog Cloud client and connection pool.
+
+    ``log_format="json"`` switches this package's logging to structured JSON
+    lines written by a background thread, keeping ``log_sample_rate`` of the
+    successful tool call records.
+
+    ``endpoint`` may list several comma-separated Stardog Cloud endpoints:
+    each request then goes to the endpoint with the best latency and error
+    score, fails over when an endpoint cannot be reached, and calls of an
+    existing conversation stay on the endpoint that created it.
+
+    ``compression`` (HTTP mode only) compresses event streams, and other
+    responses of at least ``compression_min_size`` bytes, with zstd, brotli
+    or gzip, as negotiated with each client, and tracks the compression of
+    Stardog Cloud responses.
+
+    ``adaptive_concurrency_limit`` enables a concurrency limit for Stardog
+    Cloud requests that adapts to upstream latency, up to this many requests.
+
+    ``answer_cache_ttl`` enables a per-conversation cache that answers an
+    identical repeat of a ``voicebox_ask`` question from memory for this
+    many seconds after the original answer.
+
+    ``raw_answers`` makes ``voicebox_ask`` return the final Voicebox event
+    exactly as Stardog Cloud sent it, skipping the model parsing and
+    re-serialization of every answer.
+
+    ``http_speedups`` (HTTP mode only) serves requests on uvloop's event loop
+    with uvicorn's httptools parser, falling back to the defaults for any of
+    the two that is not installed.
+
+    In HTTP mode, ``/healthz`` and ``/readyz`` report liveness and readiness,
+    and setting ``admin_token`` enables the ``/debug/*`` profiling
+    routes; reports written to a file go to ``profile_dir``.
     """
+    if log_format == "json":
+        configure_structured_logging(log_sample_rate)
     logger.info("Starting Stardog Cloud MCP server ⭐🐕☁️")
 
+    sparql_executor = (
+        SparqlExecutor(
+            endpoint=stardog_endpoint,
+            username=stardog_username,
+            password=stardog_password,
+            max_rows=sparql_max_rows,
+            timeout=sparql_timeout,
+        )
+        if stardog_endpoint
+        else None
+    )
+    if sparql_executor is not None and not (stardog_username and stardog_password):
+        logger.warning(
+            "No Stardog username and password configured: SPARQL tools only work "
+            "for requests with a Stardog auth token override"
+        )
+    # Shared across lifespan cycles so pacing state outlives a single session.
+    rate_limiter = (
+        RateLimiter(rate_limit, rate_limit_burst, rate_limit_max_wait)
+        if rate_limit
+        else None
+    )
+    # Shared across lifespan cycles and lanes: the limit protects the one
+    # upstream they all call.
+    concurrency_limiter = (
+        AdaptiveConcurrencyLimiter(adaptive_concurrency_limit)
+        if adaptive_concurrency_limit
+        else None
+    )
+    # Shared across lifespan cycles and lanes, like the conversations it keys.
+    answer_cache = AnswerCache(answer_cache_ttl) if answer_cache_ttl else None
+    health_monitor = None
+    if mode == "http":
+        # HTTP-only modules are imported here rather than at module level, so
+        # stdio servers (spawned for every desktop client session) start faster.
+        from stardog_cloud_mcp.health import (
+            HealthMonitor,
+            InFlightMiddleware,
+            register_health_routes,
+        )
+
+        health_monitor = HealthMonitor(concurrency_limiter=concurrency_limiter)
+    endpoints = parse_endpoints(endpoint)
+    # Shared across lifespan cycles so endpoint scores and conversation
+    # affinity outlive a single session.
+    endpoint_selector = EndpointSelector(endpoints) if len(endpoints) > 1 else None
+    execution_lanes = [ExecutionLane(config) for config in lanes or []]
+    compress = compression and mode == "http"
+
+    def upstream_client(max_connections: Optional[int] = None) -> StardogAsyncClient:
+        client_options: dict[str, Any] = {}
+        if timeout is not None:
+            client_options["timeout"] = timeout
+        if (
+            rate_limiter
+            or record_upstream
+            or replay_upstream
+            or max_connections
+            or compress
+            or endpoint_selector
+            or concurrency_limiter
+        ):
+            pool_options = (
+                {
+                    "limits": httpx.Limits(
+                        max_connections=max_connections,
+                        max_keepalive_connections=max_connections,
+                    )
+                }
+                if max_connections
+                else {}
+            )
+            transport: httpx.AsyncBaseTransport = (
+                ReplayTransport(replay_upstream, replay_timing_scale)
+                if replay_upstream
+                else http_transport(**pool_options)
+            )
+            if record_upstream:
+                transport = RecordingTransport(transport, record_upstream)
+            if compress:
+                from stardog_cloud_mcp.compression import UpstreamCompressionTransport
+
+                # Above the recorder, so recordings keep the encoded bytes.
+                transport = UpstreamCompressionTransport(transport)
+            if endpoint_selector is not None:
+                transport = FailoverTransport(transport, endpoint_selector)
+            if concurrency_limiter is not None:
+                transport = AdaptiveConcurrencyTransport(transport, concurrency_limiter)
+            if rate_limiter is not None:
+                transport = RateLimitTransport(transport, rate_limiter)
+            client_options["transport"] = transport
+        return StardogAsyncClient(base_url=endpoints[0], **client_options)
+
     # The Stardog Cloud client is created once per lifespan cycle (session),
     # not once for the whole process, and is exposed via `lifespan_context`.
     # The MCP SDK enters the lifespan once per session.
@@ -124,24 +419,76 @@ def initialize_server(
     # each request reads its own session handler from its own context.
     @asynccontextmanager
     async def server_lifespan(app: FastMCP) -> AsyncIterator[dict[str, Any]]:
-        if timeout is not None:
-            cloud_client = StardogAsyncClient(base_url=endpoint, timeout=timeout)
-        else:
-            cloud_client = StardogAsyncClient(base_url=endpoint)
+        cloud_client = upstream_client()
+        # Lanes with their own connection pool get their own client, so their
+        # upstream calls never queue behind another lane's connections.
+        lane_clients = {
+            lane.config.name: upstream_client(lane.config.max_connections)
+            for lane in execution_lanes
+            if lane.config.max_connections
+        }
         try:
-            yield {"handler": ToolHandler(cloud_client)}
+            handler = ToolHandler(
+                cloud_client, sparql_executor, answer_cache, raw_answers
+            )
+            lane_handlers = {
+                name: ToolHandler(
+                    lane_client, sparql_executor, answer_cache, raw_answers
+                )
+                for name, lane_client in lane_clients.items()
+            }
+            if warmup_apps:
+                # Runs before the HTTP port is bound / stdio is read, so the
+                # first real requests find warm connections and settings.
+                apps: list[tuple[str, Optional[str]]] = [
+                    (token, cid or client_id) for token, cid in warmup_apps
+                ]
+                await asyncio.gather(
+                    *(h.warm_up(apps) for h in [handler, *lane_handlers.values()])
+                )
+            # Readiness is only reported once warm-up has finished.
+            async with (
+                health_monitor.running(cloud_client, lane_clients)
+                if health_monitor is not None
+                else nullcontext()
+            ):
+                yield {
+                    "handler": handler,
+                    "tool_handlers": {
+                        tool: lane_handlers[lane.config.name]
+                        for lane in execution_lanes
+                        if lane.config.name in lane_handlers
+                        for tool in lane.config.tools
+                    },
+                }
         finally:
-            await cloud_client.aclose()
-
-    server = FastMCP("stardog-cloud-mcp", lifespan=server_lifespan)
+            for upstream in [cloud_client, *lane_clients.values()]:
+                await upstream.aclose()
+
+    middleware: list[Middleware] = [
+        CredentialsMiddleware(api_token, client_id, auth_token_override)
+    ]
+    if health_monitor is not None:
+        middleware.append(InFlightMiddleware(health_monitor))
+    if execution_lanes:
+        middleware.append(LaneMiddleware(execution_lanes))
+    if endpoint_selector is not None:
+        logger.info(f"Routing between Stardog Cloud endpoints: {', '.join(endpoints)}")
+        middleware.append(ConversationAffinityMiddleware(endpoint_selector))
+    server = FastMCP(
+        "stardog-cloud-mcp", lifespan=server_lifespan, middleware=middleware
+    )
 
-    def _handler() -> ToolHandler:
+    def _handler(tool_name: str) -> ToolHandler:
         ctx = get_context()
         if ctx is None or ctx.request_context is None:
             raise RuntimeError(
                 "No FastMCP request context; tool dispatch must run inside a request."
             )
-        handler = ctx.request_context.lifespan_context.get("handler")
+        lifespan_context = ctx.request_context.lifespan_context
+        handler = lifespan_context.get("tool_handlers", {}).get(
+            tool_name
+        ) or lifespan_context.get("handler")
         if handler is None:
             raise RuntimeError(
                 "ToolHandler missing from lifespan_context; server lifespan likely failed to enter."
@@ -153,29 +500,20 @@ def initialize_server(
     ) -> tuple[str, Optional[str], Optional[str], Optional[str]]:
         """Resolve common tool parameters from headers/args.
 
+        Credentials come from CredentialsMiddleware, which resolves them once
+        per tool call; they are only resolved here when it did not run.
+
         Returns:
             (resolved_token, resolved_client_id, resolved_auth_token_override, normalized_conversation_id)
         """
-        resolved_token = cast(
-            str,
-            await resolve_params(
-                Headers.STARDOG_CLOUD_API_KEY,
-                api_token,
-                required=True,
-                error_message="API token is required",
-            ),
-        )
-        resolved_client_id = await resolve_params(
-            Headers.STARDOG_CLOUD_CLIENT_ID, client_id
-        )
-        resolved_auth_token_override = await resolve_params(
-            Headers.STARDOG_AUTH_TOKEN_OVERRIDE, auth_token_override
+        credentials = _current_credentials.get() or resolve_credentials(
+            api_token, client_id, auth_token_override
         )
         normalized_conversation_id = (conversation_id or "").strip() or None
         return (
-            resolved_token,
-            resolved_client_id,
-            resolved_auth_token_override,
+            credentials.api_token,
+            credentials.client_id,
+            credentials.auth_token_override,
             normalized_conversation_id,
         )
 
@@ -189,7 +527,7 @@ def initialize_server(
         Get the settings for a Voicebox application in Stardog Cloud
         """
         resolved_token, resolved_client_id, _, _ = await resolve_tool_params()
-        return await _handler().handle_voicebox_settings(
+        return await _handler("voicebox_settings").handle_voicebox_settings(
             resolved_token, resolved_client_id
         )
 
@@ -212,7 +550,7 @@ def initialize_server(
         resolved_token, resolved_client_id, resolved_auth, conv_id = (
             await resolve_tool_params(conversation_id)
         )
-        return await _handler().handle_voicebox_ask(
+        return await _handler("voicebox_ask").handle_voicebox_ask(
             api_token=resolved_token,
             client_id=resolved_client_id,
             question=question,
@@ -241,7 +579,7 @@ def initialize_server(
         resolved_token, resolved_client_id, resolved_auth, conv_id = (
             await resolve_tool_params(conversation_id)
         )
-        return await _handler().handle_voicebox_generate_query(
+        return await _handler("voicebox_generate_query").handle_voicebox_generate_query(
             api_token=resolved_token,
             client_id=resolved_client_id,
             question=question,
@@ -249,14 +587,143 @@ def initialize_server(
             stardog_auth_token_override=resolved_auth,
         )
 
-    if mode == "http":
-        logger.info(
-            f"\U0001f310 Starting MCP server in HTTP mode at http://localhost:{port}"
+    if sparql_executor is not None:
+
+        @server.tool(
+            name="sparql_execute",
+            annotations={"title": "Stardog: Execute SPARQL", "readOnlyHint": True},
         )
-        server.run(transport="streamable-http", host="0.0.0.0", port=port)
-    else:
-        logger.info("\U0001f9ea Starting MCP server in STDIO (local) mode")
-        server.run(transport="stdio")
+        @tool_logging("sparql_execute")
+        async def sparql_execute(
+            query: Annotated[
+                str, "SPARQL SELECT or ASK query to run against the app's database"
+            ],
+            cursor: Annotated[
+                Optional[str],
+                "next_cursor from a previous page of the same query; leave blank for the first page",
+            ] = "",
+            page_size: Annotated[
+                Optional[int], "Maximum number of rows to return in this page"
+            ] = None,
+        ) -> str:
+            """
+            Execute a SPARQL query against the Voicebox app's Stardog database and return one page of results
+            """
+            resolved_token, resolved_client_id, resolved_auth, _ = (
+                await resolve_tool_params()
+            )
+            return await _handler("sparql_execute").handle_sparql_execute(
+                api_token=resolved_token,
+                client_id=resolved_client_id,
+                query=query,
+                cursor=(cursor or "").strip() or None,
+                page_size=page_size,
+                stardog_auth_token_override=resolved_auth,
+            )
+
+        @server.tool(
+            name="voicebox_generate_and_execute",
+            annotations={
+                "title": "Voicebox: Generate and Execute SPARQL",
+                "readOnlyHint": True,
+            },
+        )
+        @tool_logging("voicebox_generate_and_execute")
+        async def voicebox_generate_and_execute(
+            question: Annotated[
+                str, "Natural language question to generate and run a SPARQL query for"
+            ],
+            conversation_id: Annotated[
+                Optional[str],
+                "conversation_id is to be left blank for new conversation (system creates one automatically), "
+                "but needs to be supplied for multi-turn conversations to maintain the same conversation history/thread",
+            ] = "",
+            page_size: Annotated[
+                Optional[int], "Maximum number of result rows to return"
+            ] = None,
+        ) -> str:
+            """
+            Generate a SPARQL query from a natural language question with Voicebox, execute it,
+            and return the query together with the first page of results
+            """
+            resolved_token, resolved_client_id, resolved_auth, conv_id = (
+                await resolve_tool_params(conversation_id)
+            )
+            return await _handler(
+                "voicebox_generate_and_execute"
+            ).handle_voicebox_generate_and_execute(
+                api_token=resolved_token,
+                client_id=resolved_client_id,
+                question=question,
+                conversation_id=conv_id,
+                stardog_auth_token_override=resolved_auth,
+                page_size=page_size,
+            )
+
+    if health_monitor is not None:
+        register_health_routes(server, health_monitor)
+
+    try:
+        if mode == "http":
+            if admin_token:
+                register_profiling_routes(server, admin_token, profile_dir)
+                logger.info("Profiling routes enabled under /debug/")
+            logger.info(
+                f"\U0001f310 Starting MCP server in HTTP mode at http://localhost:{port}"
+            )
+            http_options: dict[str, Any] = {}
+            if compress:
+                from starlette.middleware import Middleware as ASGIMiddleware
+
+                from stardog_cloud_mcp.compression import CompressionMiddleware
+
+                http_options["middleware"] = [
+                    ASGIMiddleware(
+                        CompressionMiddleware, minimum_size=compression_min_size
+                    )
+                ]
+                logger.info(
+                    f"Compressing event streams and responses of {compression_min_size} bytes or more"
+                )
+            backend_options: dict[str, Any] = {}
+            if http_speedups:
+                from stardog_cloud_mcp.speedups import http_speedup_options
+
+                uvicorn_config, backend_options = http_speedup_options()
+                if uvicorn_config:
+                    http_options["uvicorn_config"] = uvicorn_config
+                logger.info(
+                    f"Serving with the {'uvloop' if backend_options else 'asyncio'} event loop "
+                    f"and the {uvicorn_config.get('http', 'h11')} HTTP parser"
+                )
+            if backend_options:
+                # FastMCP.run() always starts anyio's default asyncio loop.
+                anyio.run(
+                    partial(
+                        server.run_async,
+                        transport="streamable-http",
+                        host="0.0.0.0",
+                        port=port,
+                        **http_options,
+                    ),
+                    backend_options=backend_options,
+                )
+            else:
+                server.run(
+                    transport="streamable-http",
+                    host="0.0.0.0",
+                    port=port,
+                    **http_options,
+                )
+        else:
+            logger.info("\U0001f9ea Starting MCP server in STDIO (local) mode")
+            # The banner renders with rich and may check PyPI for a newer
+            # fastmcp before serving; stdio clients never see it anyway.
+            server.run(transport="stdio", show_banner=False)
+    finally:
+        if log_format == "json":
+            # Flush records still queued for the background writer.
+            shutdown_structured_logging()
     return server
 
 
@@ -264,7 +731,12 @@ def main():
     """Main entry point for the Stardog Cloud MCP Server."""
     parser = argparse.ArgumentParser(
         description="Stardog Cloud MCP Server - Model Context Protocol server for Stardog Voicebox",
-        epilog="Environment variables: SDC_ENDPOINT, SDC_API_TOKEN, SDC_TIMEOUT, SDC_MCP_SERVER_MODE, SD_AUTH_TOKEN_OVERRIDE",
+        epilog="Environment variables: SDC_ENDPOINT, SDC_API_TOKEN, SDC_TIMEOUT, SDC_MCP_SERVER_MODE, SD_AUTH_TOKEN_OVERRIDE, "
+        "SDC_WARMUP_APPS, SD_ENDPOINT, SD_USERNAME, SD_PASSWORD, SD_SPARQL_MAX_ROWS, SD_SPARQL_TIMEOUT, "
+        "SDC_RATE_LIMIT, SDC_RATE_LIMIT_BURST, SDC_RATE_LIMIT_MAX_WAIT, SDC_RECORD_UPSTREAM, SDC_REPLAY_UPSTREAM, "
+        "SDC_REPLAY_TIMING_SCALE, SDC_ADMIN_TOKEN, SDC_PROFILE_DIR, SDC_LANES, "
+        "SDC_LOG_FORMAT, SDC_LOG_SAMPLE_RATE, SDC_COMPRESSION, SDC_COMPRESSION_MIN_SIZE, "
+        "SDC_ADAPTIVE_CONCURRENCY_LIMIT, SDC_ANSWER_CACHE_TTL, SDC_RAW_ANSWERS, SDC_HTTP_SPEEDUPS",
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
@@ -276,7 +748,7 @@ def main():
         "--endpoint",
         type=str,
         default=os.getenv("SDC_ENDPOINT", "https://cloud.stardog.com/api"),
-        help="Stardog Cloud API endpoint (default: %(default)s)",
+        help="Stardog Cloud API endpoint, or comma-separated endpoints to fail over between (default: %(default)s)",
     )
 
     parser.add_argument(
@@ -321,6 +793,186 @@ def main():
         help="Request timeout in seconds for Stardog Cloud API calls",
     )
 
+    parser.add_argument(
+        "--warmup_apps",
+        type=parse_warmup_apps,
+        default=os.getenv("SDC_WARMUP_APPS", ""),
+        help="Comma-separated token[:client_id] entries whose settings are prefetched at startup (optional)",
+    )
+
+    parser.add_argument(
+        "--stardog_endpoint",
+        type=str,
+        default=os.getenv("SD_ENDPOINT"),
+        help="Stardog server endpoint hosting the Voicebox app databases; enables the sparql_execute tool (optional)",
+    )
+
+    parser.add_argument(
+        "--stardog_username",
+        type=str,
+        default=os.getenv("SD_USERNAME"),
+        help="Stardog username for sparql_execute when no auth token override is supplied (optional)",
+    )
+
+    parser.add_argument(
+        "--stardog_password",
+        type=str,
+        default=os.getenv("SD_PASSWORD"),
+        help="Stardog password for sparql_execute when no auth token override is supplied (optional)",
+    )
+
+    parser.add_argument(
+        "--sparql_max_rows",
+        type=int,
+        default=int(os.getenv("SD_SPARQL_MAX_ROWS", DEFAULT_SPARQL_MAX_ROWS)),
+        help="Maximum number of rows served across all pages of a query (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--sparql_timeout",
+        type=float,
+        default=float(os.getenv("SD_SPARQL_TIMEOUT", DEFAULT_SPARQL_TIMEOUT_SECONDS)),
+        help="Time limit in seconds for each page of a SPARQL query (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--rate_limit",
+        type=float,
+        default=(
+            float(os.getenv("SDC_RATE_LIMIT")) if os.getenv("SDC_RATE_LIMIT") else None
+        ),
+        help="Maximum Stardog Cloud requests per second per API key; enables 429/Retry-After handling (optional)",
+    )
+
+    parser.add_argument(
+        "--rate_limit_burst",
+        type=float,
+        default=(
+            float(os.getenv("SDC_RATE_LIMIT_BURST"))
+            if os.getenv("SDC_RATE_LIMIT_BURST")
+            else None
+        ),
+        help="Requests per API key allowed back to back before pacing starts (default: the rate limit)",
+    )
+
+    parser.add_argument(
+        "--rate_limit_max_wait",
+        type=float,
+        default=float(
+            os.getenv("SDC_RATE_LIMIT_MAX_WAIT", DEFAULT_RATE_LIMIT_MAX_WAIT_SECONDS)
+        ),
+        help="Seconds a throttled call waits for a slot before failing with a retryable error (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--record_upstream",
+        type=str,
+        default=os.getenv("SDC_RECORD_UPSTREAM"),
+        help="Append every Stardog Cloud exchange, with chunk timings, to this JSON Lines file (optional)",
+    )
+
+    parser.add_argument(
+        "--replay_upstream",
+        type=str,
+        default=os.getenv("SDC_REPLAY_UPSTREAM"),
+        help="Serve Stardog Cloud responses from a recording instead of the network (optional)",
+    )
+
+    parser.add_argument(
+        "--replay_timing_scale",
+        type=float,
+        default=float(os.getenv("SDC_REPLAY_TIMING_SCALE", "1.0")),
+        help="Multiplier for recorded delays during replay; 0 replays without delays (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--admin_token",
+        type=str,
+        default=os.getenv("SDC_ADMIN_TOKEN"),
+        help="Token for the /debug/ profiling routes in HTTP mode; the routes are disabled without it (optional)",
+    )
+
+    parser.add_argument(
+        "--profile_dir",
+        type=str,
+        default=os.getenv("SDC_PROFILE_DIR"),
+        help="Directory for profiling reports written to a file (default: the system temp directory)",
+    )
+
+    parser.add_argument(
+        "--lanes",
+        type=parse_lanes,
+        default=os.getenv("SDC_LANES", ""),
+        help="Execution lanes as semicolon-separated name=tool[,tool...][:concurrency[:connections[:queue_timeout]]] "
+        "entries (optional)",
+    )
+
+    parser.add_argument(
+        "--log_format",
+        choices=["text", "json"],
+        default=os.getenv("SDC_LOG_FORMAT", "text"),
+        help="json writes structured log lines from a background thread, never blocking tool calls (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--log_sample_rate",
+        type=float,
+        default=float(os.getenv("SDC_LOG_SAMPLE_RATE", "1.0")),
+        help="Fraction of successful tool call records kept in json log format; errors are always kept (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--compression",
+        action="store_true",
+        default=os.getenv("SDC_COMPRESSION", "").lower() in ("1", "true", "yes"),
+        help="Compress HTTP mode responses with zstd, brotli or gzip, as accepted by the client",
+    )
+
+    parser.add_argument(
+        "--compression_min_size",
+        type=int,
+        default=int(
+            os.getenv("SDC_COMPRESSION_MIN_SIZE", DEFAULT_COMPRESSION_MIN_SIZE)
+        ),
+        help="Responses other than event streams smaller than this many bytes are sent uncompressed (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--adaptive_concurrency_limit",
+        type=int,
+        default=(
+            int(os.getenv("SDC_ADAPTIVE_CONCURRENCY_LIMIT"))
+            if os.getenv("SDC_ADAPTIVE_CONCURRENCY_LIMIT")
+            else None
+        ),
+        help="Upper bound for a Stardog Cloud concurrency limit that adapts to upstream latency; enables it (optional)",
+    )
+
+    parser.add_argument(
+        "--answer_cache_ttl",
+        type=float,
+        default=(
+            float(os.getenv("SDC_ANSWER_CACHE_TTL"))
+            if os.getenv("SDC_ANSWER_CACHE_TTL")
+            else None
+        ),
+        help="Seconds an identical repeat of a question in the same conversation is answered from cache (optional, disabled by default)",
+    )
+
+    parser.add_argument(
+        "--raw_answers",
+        action="store_true",
+        default=os.getenv("SDC_RAW_ANSWERS", "").lower() in ("1", "true", "yes"),
+        help="Return voicebox_ask answers exactly as sent by Stardog Cloud, without parsing and re-serializing them",
+    )
+
+    parser.add_argument(
+        "--http_speedups",
+        action="store_true",
+        default=os.getenv("SDC_HTTP_SPEEDUPS", "").lower() in ("1", "true", "yes"),
+        help="Serve HTTP mode with uvloop and httptools when they are installed (the speedups extra)",
+    )
+
     args = parser.parse_args()
 
     try:
@@ -332,6 +984,29 @@ def main():
             args.mode,
             args.port,
             args.timeout,
+            args.warmup_apps,
+            args.stardog_endpoint,
+            args.stardog_username,
+            args.stardog_password,
+            args.sparql_max_rows,
+            args.sparql_timeout,
+            args.rate_limit,
+            args.rate_limit_burst,
+            args.rate_limit_max_wait,
+            args.record_upstream,
+            args.replay_upstream,
+            args.replay_timing_scale,
+            args.admin_token,
+            args.profile_dir,
+            args.lanes,
+            args.log_format,
+            args.log_sample_rate,
+            args.compression,
+            args.compression_min_size,
+            args.adaptive_concurrency_limit,
+            args.answer_cache_ttl,
+            args.raw_answers,
+            args.http_speedups,
         )
     except KeyboardInterrupt:  # pragma: no cover
         logger.info("Caught manual interrupt, server shutting down...")
@@ -0,0 +1,256 @@
+import asyncio
+import base64
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import requests
+import requests.adapters
+import requests.auth
+import stardog
+from stardog import content_types
+
+from stardog_cloud_mcp.constants import (
+    DEFAULT_SPARQL_MAX_ROWS,
+    DEFAULT_SPARQL_PAGE_SIZE,
+    DEFAULT_SPARQL_TIMEOUT_SECONDS,
+    MAX_SPARQL_PAGE_SIZE,
+)
+
+
+class BearerAuth(requests.auth.AuthBase):
+    """
+    Bearer token authentication for pystardog connections.
+    """
+
+    def __init__(self, token: str):
+        self.token = token
+
+    def __call__(self, request):
+        request.headers["Authorization"] = f"Bearer {self.token}"
+        return request
+
+
+@dataclass
+class SparqlPage:
+    """
+    One bounded page of SPARQL results.
+    """
+
+    columns: list[str]
+    rows: list[list[Optional[str]]]
+    offset: int
+    next_cursor: Optional[str] = None
+    truncated: bool = False
+    boolean: Optional[bool] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        if self.boolean is not None:
+            return {"boolean": self.boolean}
+        return {
+            "columns": self.columns,
+            "rows": self.rows,
+            "offset": self.offset,
+            "row_count": len(self.rows),
+            "truncated": self.truncated,
+            "next_cursor": self.next_cursor,
+        }
+
+
+def _query_fingerprint(query: str) -> str:
+    return hashlib.sha256(query.strip().encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(query: str, offset: int) -> str:
+    """
+    Encode an opaque continuation cursor bound to ``query``.
+    """
+    payload = json.dumps({"q": _query_fingerprint(query), "o": offset})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(query: str, cursor: Optional[str]) -> int:
+    """
+    Decode a continuation cursor into a result offset.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another query
+    """
+    if not cursor:
+        return 0
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        fingerprint, offset = payload["q"], int(payload["o"])
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if fingerprint != _query_fingerprint(query) or offset < 0:
+        raise ValueError("Cursor does not belong to this query")
+    return offset
+
+
+class SparqlExecutor:
+    """
+    Executes read-only SPARQL queries against a Stardog server with pystardog.
+
+    Results are fetched one page at a time using Stardog's ``limit`` and
+    ``offset`` query parameters, so neither server memory nor a single tool
+    response ever holds more than one page of rows.
+
+    All pages share one HTTP connection pool, so only the first query pays
+    for TCP and TLS setup.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        max_rows: int = DEFAULT_SPARQL_MAX_ROWS,
+        timeout: float = DEFAULT_SPARQL_TIMEOUT_SECONDS,
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            endpoint: The Stardog server endpoint
+            username: Username for HTTP Basic auth (optional)
+            password: Password for HTTP Basic auth (optional)
+            max_rows: Maximum number of rows served across all pages of a query
+            timeout: Per-page query time limit in seconds
+        """
+        self.endpoint = endpoint
+        self.username = username
+        self.password = password
+        self.max_rows = max_rows
+        self.timeout = timeout
+        self._adapter = requests.adapters.HTTPAdapter()
+
+    def _connection(
+        self, database: str, auth_token: Optional[str]
+    ) -> stardog.Connection:
+        """
+        Open a connection on the shared connection pool.
+
+        pystardog sets the auth on the session it is given, so every
+        connection gets its own session, mounted on the shared adapter.
+
+        Raises:
+            PermissionError: If there is neither an auth token nor a
+                username and password; pystardog would log in as admin
+        """
+        if auth_token:
+            auth: requests.auth.AuthBase = BearerAuth(auth_token)
+        elif self.username and self.password:
+            auth = requests.auth.HTTPBasicAuth(self.username, self.password)
+        else:
+            raise PermissionError(
+                "No Stardog credentials: configure a Stardog username and "
+                "password, or send a Stardog auth token override"
+            )
+        session = requests.Session()
+        session.mount("http://", self._adapter)
+        session.mount("https://", self._adapter)
+        return stardog.Connection(
+            database, endpoint=self.endpoint, auth=auth, session=session
+        )
+
+    def _select(
+        self,
+        database: str,
+        query: str,
+        auth_token: Optional[str],
+        limit: int,
+        offset: int,
+        reasoning: Optional[bool],
+        named_graphs: Optional[list[str]],
+    ) -> dict:
+        # Not closed: closing the connection would close the shared pool.
+        conn = self._connection(database, auth_token)
+        return conn.select(
+            query,
+            limit=limit,
+            offset=offset,
+            timeout=int(self.timeout * 1000),
+            reasoning=reasoning,
+            default_graph_uri=named_graphs or None,
+            content_type=content_types.SPARQL_JSON,
+        )
+
+    async def execute(
+        self,
+        database: str,
+        query: str,
+        cursor: Optional[str] = None,
+        page_size: Optional[int] = None,
+        auth_token: Optional[str] = None,
+        reasoning: Optional[bool] = None,
+        named_graphs: Optional[list[str]] = None,
+    ) -> SparqlPage:
+        """
+        Execute ``query`` and return the page starting at ``cursor``.
+
+        Args:
+            database: The Stardog database to query
+            query: The SPARQL query (SELECT or ASK)
+            cursor: Continuation cursor from a previous page (optional)
+            page_size: Requested number of rows, clamped to the server maximum
+            auth_token: Bearer token for the Stardog server (optional)
+            reasoning: Whether to enable reasoning (optional)
+            named_graphs: Graphs to query as the default graph, as in the
+                Voicebox app's settings; all graphs if omitted
+        Returns:
+            The requested page of results
+        """
+        offset = decode_cursor(query, cursor)
+        page_size = max(
+            1, min(page_size or DEFAULT_SPARQL_PAGE_SIZE, MAX_SPARQL_PAGE_SIZE)
+        )
+        remaining = self.max_rows - offset
+        if remaining <= 0:
+            return SparqlPage(columns=[], rows=[], offset=offset, truncated=True)
+        limit = min(page_size, remaining)
+
+        # One extra row tells us whether another page exists without a
+        # separate COUNT query.
+        result = await asyncio.wait_for(
+            asyncio.to_thread(
+                self._select,
+                database,
+                query,
+                auth_token,
+                limit + 1,
+                offset,
+                reasoning,
+                named_graphs,
+            ),
+            timeout=self.timeout + 5,
+        )
+
+        if "boolean" in result:
+            return SparqlPage(
+                columns=[], rows=[], offset=0, boolean=bool(result["boolean"])
+            )
+
+        columns: list[str] = result.get("head", {}).get("vars", [])
+        bindings = result.get("results", {}).get("bindings", [])
+        has_more = len(bindings) > limit
+        rows = [
+            [
+                binding[column]["value"] if column in binding else None
+                for column in columns
+            ]
+            for binding in bindings[:limit]
+        ]
+        next_offset = offset + len(rows)
+        truncated = has_more and next_offset >= self.max_rows
+        next_cursor = (
+            encode_cursor(query, next_offset) if has_more and not truncated else None
+        )
+        return SparqlPage(
+            columns=columns,
+            rows=rows,
+            offset=offset,
+            next_cursor=next_cursor,
+            truncated=truncated,
+        )
@@ -0,0 +1,30 @@
+import importlib.util
+import logging
+from typing import Any
+
+logger = logging.getLogger("stardog_cloud_mcp")
+
+
+def http_speedup_options() -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Options to serve HTTP mode on uvloop's event loop and uvicorn's
+    httptools request parser, as far as they are installed.
+
+    Each missing package is logged and replaced by its default: the asyncio
+    event loop, or uvicorn's pure Python h11 parser.
+
+    Returns:
+        (uvicorn config, anyio asyncio backend options); either is empty when
+        its package is not installed
+    """
+    uvicorn_config: dict[str, Any] = {}
+    backend_options: dict[str, Any] = {}
+    if importlib.util.find_spec("uvloop") is not None:
+        backend_options["use_uvloop"] = True
+    else:
+        logger.warning("uvloop is not installed, using the asyncio event loop")
+    if importlib.util.find_spec("httptools") is not None:
+        uvicorn_config["http"] = "httptools"
+    else:
+        logger.warning("httptools is not installed, using the h11 HTTP parser")
+    return uvicorn_config, backend_options
@@ -0,0 +1,191 @@
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, Optional
+
+from stardog_cloud_mcp.bindings import token_fingerprint
+from stardog_cloud_mcp.constants import LOG_QUEUE_MAX_PENDING
+
+logger = logging.getLogger("stardog_cloud_mcp")
+
+# Structured fields copied from a record's ``extra`` into the JSON output.
+_STRUCTURED_FIELDS = ("tool", "latency_ms", "tenant", "outcome")
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as single-line JSON objects.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, tz=timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in _STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SuccessSamplingFilter(logging.Filter):
+    """
+    Keeps a ``sample_rate`` fraction of successful tool call records; every
+    other record, and anything at WARNING or above, always passes.
+    """
+
+    def __init__(self, sample_rate: float):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        if getattr(record, "outcome", None) != "success":
+            return True
+        return random.random() < self.sample_rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to a background thread without ever blocking the caller.
+
+    Below ERROR, records are dropped once ``max_pending`` records are waiting
+    (the drop count is reported when the backlog clears); ERROR and above are
+    always queued.
+    """
+
+    def __init__(
+        self, log_queue: queue.Queue, max_pending: int = LOG_QUEUE_MAX_PENDING
+    ):
+        super().__init__(log_queue)
+        self.log_queue = log_queue
+        self.max_pending = max_pending
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback on the calling thread, but keep
+        # the traceback separate so the formatter can emit it as a field.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno < logging.ERROR:
+            if self.log_queue.qsize() >= self.max_pending:
+                self.dropped += 1
+                return
+            if self.dropped:
+                dropped, self.dropped = self.dropped, 0
+                self.queue.put_nowait(
+                    self.prepare(
+                        logger.makeRecord(
+                            logger.name,
+                            logging.WARNING,
+                            __file__,
+                            0,
+                            f"Dropped {dropped} log record(s) under back-pressure",
+                            (),
+                            None,
+                        )
+                    )
+                )
+        self.queue.put_nowait(record)
+
+
+def configure_structured_logging(
+    sample_rate: float = 1.0,
+    level: int = logging.INFO,
+    stream: Optional[IO[str]] = None,
+) -> None:
+    """
+    Route the ``stardog_cloud_mcp`` logger through a queue to a background
+    thread that writes JSON lines to ``stream`` (stderr by default, so stdio
+    mode never mixes logs into the protocol stream).
+
+    Args:
+        sample_rate: Fraction of successful tool call records to keep
+        level: Minimum level logged
+        stream: Output stream (optional)
+    """
+    global _listener
+    shutdown_structured_logging()
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter())
+    log_queue: queue.Queue = queue.Queue()
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(SuccessSamplingFilter(sample_rate))
+
+    logger.addHandler(queue_handler)
+    logger.setLevel(level)
+    # The pipeline owns this logger's output; do not also print via root.
+    logger.propagate = False
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_structured_logging() -> None:
+    """
+    Flush pending records and restore the logger, if the pipeline is active.
+    """
+    global _listener
+    if _listener is None:
+        return
+    for handler in [
+        h for h in logger.handlers if isinstance(h, NonBlockingQueueHandler)
+    ]:
+        logger.removeHandler(handler)
+    logger.propagate = True
+    logger.setLevel(logging.NOTSET)
+    _listener.stop()
+    _listener = None
+
+
+def log_tool_call(
+    tool_name: str,
+    latency: float,
+    api_token: Optional[str],
+    error: Optional[BaseException] = None,
+) -> None:
+    """
+    Emit a structured record for one tool call while the pipeline is active.
+
+    Args:
+        tool_name: The tool that was called
+        latency: Wall time of the call in seconds
+        api_token: The caller's API token, logged only as a short hash
+        error: The exception the call failed with (optional)
+    """
+    if _listener is None:
+        return
+    extra = {
+        "tool": tool_name,
+        "latency_ms": round(latency * 1000, 2),
+        "tenant": token_fingerprint(api_token)[:16] if api_token else None,
+        "outcome": "success" if error is None else "error",
+    }
+    if error is None:
+        logger.info(f"Tool {tool_name} succeeded", extra=extra)
+    else:
+        logger.error(f"Tool {tool_name} failed: {error}", extra=extra)
@@ -1,10 +1,20 @@
+import asyncio
+import json
 import logging
+import time
 from typing import Optional
 
 from stardog.cloud.client import BaseClient
-from stardog.cloud.voicebox import VoiceboxAnswer, VoiceboxAppSettings
+from stardog.cloud.voicebox import VoiceboxAnswer, VoiceboxApp, VoiceboxAppSettings
 
+from stardog_cloud_mcp.answer_cache import AnswerCache
+from stardog_cloud_mcp.bindings import AppBindingCache
+from stardog_cloud_mcp.constants import (
+    VOICEBOX_STREAM_ASK_PATH,
+    WARMUP_TIMEOUT_SECONDS,
+)
 from stardog_cloud_mcp.exceptions import StardogMCPToolException
+from stardog_cloud_mcp.sparql import SparqlExecutor
 
 logger = logging.getLogger("stardog_cloud_mcp")
 
@@ -14,14 +24,80 @@ class ToolHandler:
     Handler for MCP tools that interact with Stardog Cloud.
     """
 
-    def __init__(self, cloud_client: BaseClient):
+    def __init__(
+        self,
+        cloud_client: BaseClient,
+        sparql_executor: Optional[SparqlExecutor] = None,
+        answer_cache: Optional[AnswerCache] = None,
+        raw_answers: bool = False,
+    ):
         """
         Initialize the tool handler.
 
         Args:
             cloud_client: The Stardog Cloud client
+            sparql_executor: Executor for SPARQL queries against the app's
+                Stardog database (optional)
+            answer_cache: Cache answering repeated questions within a
+                conversation (optional)
+            raw_answers: Return ``voicebox_ask`` answers as sent by Stardog
+                Cloud instead of re-serializing them
         """
         self.cloud_client = cloud_client
+        self.sparql_executor = sparql_executor
+        self.answer_cache = answer_cache
+        self.raw_answers = raw_answers
+        self.app_bindings = AppBindingCache(cloud_client)
+
+    async def warm_up(
+        self,
+        apps: list[tuple[str, Optional[str]]],
+        timeout: float = WARMUP_TIMEOUT_SECONDS,
+    ) -> None:
+        """
+        Open upstream connections and prefetch settings for the given apps.
+
+        Failures are logged and otherwise ignored: warm-up only moves
+        cold-start latency off the first tool calls, it never blocks startup.
+
+        Args:
+            apps: (api_token, client_id) pairs to prefetch settings for
+            timeout: Upper bound in seconds for the whole warm-up phase
+        """
+        if not apps:
+            return
+        started = time.monotonic()
+        try:
+            results = await asyncio.wait_for(
+                asyncio.gather(
+                    *(self._get_settings(token, cid) for token, cid in apps),
+                    return_exceptions=True,
+                ),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Warm-up did not complete within {timeout}s")
+            return
+        failed = [r for r in results if isinstance(r, Exception)]
+        for error in failed:
+            logger.warning(f"Warm-up prefetch failed: {error}")
+        logger.info(
+            f"Warm-up prefetched settings for {len(apps) - len(failed)}/{len(apps)} "
+            f"app(s) in {time.monotonic() - started:.2f}s"
+        )
+
+    async def _get_settings(
+        self, api_token: str, client_id: Optional[str]
+    ) -> VoiceboxAppSettings:
+        """
+        Return the app settings, from the cache while they are fresh.
+        """
+        settings = self.app_bindings.get_settings(api_token, client_id)
+        if settings is None:
+            voicebox_app = self.app_bindings.get(api_token, client_id)
+            settings = await voicebox_app.async_settings()
+            self.app_bindings.put_settings(api_token, client_id, settings)
+        return settings
 
     async def handle_voicebox_settings(
         self, api_token: str, client_id: str | None
@@ -35,11 +111,9 @@ class ToolHandler:
             A string representation of the Voicebox settings
         """
         try:
-            voicebox_app = self.cloud_client.voicebox_app(
-                app_api_token=api_token, client_id=client_id
-            )
-            voicebox_settings: VoiceboxAppSettings = await voicebox_app.async_settings()
+            voicebox_settings = await self._get_settings(api_token, client_id)
         except Exception as e:
+            self.app_bindings.note_error(api_token, e)
             logger.error(f"Error occurred while fetching Voicebox settings: {e}")
             raise StardogMCPToolException(
                 tool_name="voicebox_settings", message=str(e)
@@ -59,7 +133,9 @@ class ToolHandler:
         Handle the voicebox_ask tool.
 
         Uses the streaming API internally, collecting the stream server-side
-        and returning the final answer as a string.
+        and returning the final answer as a string. With an answer cache, an
+        identical repeat of a recent question in the same conversation is
+        answered from the cache.
 
         Args:
             api_token: The Voicebox app API token
@@ -74,29 +150,119 @@ class ToolHandler:
             if not question:
                 raise ValueError("A valid question is required to execute the tool")
 
-            voicebox_app = self.cloud_client.voicebox_app(
-                app_api_token=api_token, client_id=client_id
-            )
+            if self.answer_cache is not None and conversation_id:
+                cached = self.answer_cache.get(
+                    api_token,
+                    client_id,
+                    conversation_id,
+                    question,
+                    stardog_auth_token_override,
+                )
+                if cached is not None:
+                    logger.debug(
+                        f"Answering repeated question in conversation {conversation_id} from cache"
+                    )
+                    return cached
 
-            final_answer = None
-            async with voicebox_app.async_stream_ask(
-                question=question,
-                conversation_id=conversation_id,
-                client_id=client_id,
-                stardog_auth_token_override=stardog_auth_token_override,
-            ) as stream:
-                async for answer in stream:
-                    if not answer.pending:
-                        final_answer = answer
-            if final_answer is None:
-                raise RuntimeError("Stream ended without a final answer")
+            voicebox_app = self.app_bindings.get(api_token, client_id)
+
+            if self.raw_answers:
+                answer, answer_conversation_id = await self._stream_ask_raw(
+                    voicebox_app,
+                    question,
+                    conversation_id,
+                    client_id,
+                    stardog_auth_token_override,
+                )
+            else:
+                final_answer = None
+                async with voicebox_app.async_stream_ask(
+                    question=question,
+                    conversation_id=conversation_id,
+                    client_id=client_id,
+                    stardog_auth_token_override=stardog_auth_token_override,
+                ) as stream:
+                    async for event in stream:
+                        if not event.pending:
+                            final_answer = event
+                if final_answer is None:
+                    raise RuntimeError("Stream ended without a final answer")
+                answer = final_answer.model_dump_json()
+                answer_conversation_id = final_answer.conversation_id
         except Exception as e:
+            self.app_bindings.note_error(api_token, e, stardog_auth_token_override)
             logger.error(f"Error occurred while asking question: {e}")
             raise StardogMCPToolException(
                 tool_name="voicebox_ask", message=str(e)
             ) from e
 
-        return final_answer.model_dump_json()
+        if self.answer_cache is not None and answer_conversation_id:
+            # Keyed by the answer's conversation, so a repeat is also served
+            # when the question started a new conversation.
+            self.answer_cache.put(
+                api_token,
+                client_id,
+                answer_conversation_id,
+                question,
+                answer,
+                stardog_auth_token_override,
+            )
+        return answer
+
+    async def _stream_ask_raw(
+        self,
+        voicebox_app: VoiceboxApp,
+        question: str,
+        conversation_id: Optional[str],
+        client_id: Optional[str],
+        stardog_auth_token_override: Optional[str],
+    ) -> tuple[str, str]:
+        """
+        Ask a question over the streaming API and return the final event as
+        Stardog Cloud sent it.
+
+        Intermediate events are skipped without being decoded, and the final
+        event is only checked to be a complete answer: no ``VoiceboxAnswer``
+        is built or serialized again.
+
+        Returns:
+            (the final event's JSON, its conversation ID)
+
+        Raises:
+            RuntimeError: If the stream did not end with a complete answer
+        """
+        # Same request as VoiceboxApp.async_stream_ask, without parsing every
+        # event into a model. These are pystardog private methods, so the
+        # dependency is pinned exactly and a test compares both requests.
+        voicebox_app._check_client_id(client_id)
+        voicebox_app._validate_conversation_id(conversation_id)
+        headers = voicebox_app._create_headers(
+            voicebox_app.app_api_token,
+            client_id or voicebox_app.client_id,
+            stardog_auth_token_override,
+        )
+        last_event = ""
+        async with voicebox_app.client._stream_post(
+            path=VOICEBOX_STREAM_ASK_PATH,
+            json={"query": question, "conversation_id": conversation_id},
+            headers=headers,
+            timeout=voicebox_app._resolve_stream_timeout(),
+        ) as response:
+            async for line in response.aiter_lines():
+                if line and not line.isspace():
+                    last_event = line
+
+        try:
+            final_event = json.loads(last_event) if last_event else None
+        except ValueError:
+            final_event = None
+        if (
+            not isinstance(final_event, dict)
+            or final_event.get("pending")
+            or not final_event.get("conversation_id")
+        ):
+            raise RuntimeError("Stream ended without a final answer")
+        return last_event.strip(), str(final_event["conversation_id"])
 
     async def handle_voicebox_generate_query(
         self,
@@ -122,9 +288,7 @@ class ToolHandler:
             if not question:
                 raise ValueError("A valid question is required to execute the tool")
 
-            voicebox_app = self.cloud_client.voicebox_app(
-                app_api_token=api_token, client_id=client_id
-            )
+            voicebox_app = self.app_bindings.get(api_token, client_id)
             response: VoiceboxAnswer = await voicebox_app.async_generate_query(
                 question=question,
                 conversation_id=conversation_id,
@@ -132,8 +296,127 @@ class ToolHandler:
                 stardog_auth_token_override=stardog_auth_token_override,
             )
         except Exception as e:
+            self.app_bindings.note_error(api_token, e, stardog_auth_token_override)
             logger.error(f"Error occurred while generating SPARQL query: {e}")
             raise StardogMCPToolException(
                 tool_name="voicebox_generate_query", message=str(e)
             ) from e
         return response.model_dump_json()
+
+    async def handle_sparql_execute(
+        self,
+        api_token: str,
+        client_id: Optional[str],
+        query: str,
+        cursor: Optional[str] = None,
+        page_size: Optional[int] = None,
+        stardog_auth_token_override: Optional[str] = None,
+    ) -> str:
+        """
+        Handle the sparql_execute tool.
+
+        Runs the query against the Voicebox app's Stardog database and returns
+        one bounded page of results with a continuation cursor.
+
+        Args:
+            api_token: The Voicebox app API token
+            client_id: The client ID (optional)
+            query: The SPARQL query to execute
+            cursor: Continuation cursor from a previous page (optional)
+            page_size: Number of rows to return (optional)
+            stardog_auth_token_override: Token override (optional)
+        Returns:
+            A JSON string with the columns, rows and next cursor
+        """
+        try:
+            if self.sparql_executor is None:
+                raise RuntimeError("SPARQL execution is not configured")
+            if not query:
+                raise ValueError("A valid query is required to execute the tool")
+
+            settings = await self._get_settings(api_token, client_id)
+            page = await self.sparql_executor.execute(
+                database=settings.database,
+                query=query,
+                cursor=cursor,
+                page_size=page_size,
+                auth_token=stardog_auth_token_override,
+                reasoning=settings.reasoning,
+                named_graphs=settings.named_graphs,
+            )
+        except Exception as e:
+            self.app_bindings.note_error(api_token, e, stardog_auth_token_override)
+            logger.error(f"Error occurred while executing SPARQL query: {e}")
+            raise StardogMCPToolException(
+                tool_name="sparql_execute", message=str(e)
+            ) from e
+        return json.dumps(page.to_dict())
+
+    async def handle_voicebox_generate_and_execute(
+        self,
+        api_token: str,
+        client_id: Optional[str],
+        question: str,
+        conversation_id: Optional[str] = None,
+        stardog_auth_token_override: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ) -> str:
+        """
+        Handle the voicebox_generate_and_execute tool.
+
+        Generates a SPARQL query with Voicebox and executes it server-side,
+        saving the agent a round trip between the two steps.
+
+        Args:
+            api_token: The Voicebox app API token
+            client_id: The client ID (optional)
+            question: The question to generate and run a query for
+            conversation_id: The conversation ID (optional)
+            stardog_auth_token_override: Token override (optional)
+            page_size: Number of result rows to return (optional)
+        Returns:
+            A JSON string with the generated query and the first page of results
+        """
+        try:
+            if self.sparql_executor is None:
+                raise RuntimeError("SPARQL execution is not configured")
+            if not question:
+                raise ValueError("A valid question is required to execute the tool")
+
+            voicebox_app = self.app_bindings.get(api_token, client_id)
+            # The settings lookup (usually cached) overlaps query generation.
+            response, settings = await asyncio.gather(
+                voicebox_app.async_generate_query(
+                    question=question,
+                    conversation_id=conversation_id,
+                    client_id=client_id,
+                    stardog_auth_token_override=stardog_auth_token_override,
+                ),
+                self._get_settings(api_token, client_id),
+            )
+            if not response.sparql_query:
+                raise RuntimeError("Voicebox did not generate a SPARQL query")
+
+            page = await self.sparql_executor.execute(
+                database=settings.database,
+                query=response.sparql_query,
+                page_size=page_size,
+                auth_token=stardog_auth_token_override,
+                reasoning=settings.reasoning,
+                named_graphs=settings.named_graphs,
+            )
+        except Exception as e:
+            self.app_bindings.note_error(api_token, e, stardog_auth_token_override)
+            logger.error(f"Error occurred while generating and executing query: {e}")
+            raise StardogMCPToolException(
+                tool_name="voicebox_generate_and_execute", message=str(e)
+            ) from e
+        return json.dumps(
+            {
+                "conversation_id": response.conversation_id,
+                "message_id": response.message_id,
+                "interpreted_question": response.interpreted_question,
+                "sparql_query": response.sparql_query,
+                "results": page.to_dict(),
+            }
+        )
@@ -1,7 +1,19 @@
-import pytest
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
 from unittest.mock import MagicMock, AsyncMock
 
+import httpx
+import pytest
+
 from stardog_cloud_mcp.tools import ToolHandler
 
 
@@ -52,3 +64,179 @@ def tool_handler():
     mock_client = MagicMock()
     mock_client.voicebox_app.return_value = mock_voicebox_app
     return ToolHandler(mock_client)
+
+
+# Settings served by StubUpstream for every Voicebox app.
+STUB_SETTINGS = {"name": "stub-app", "database": "stub-db", "model": "stub", "reasoning": False}
+STUB_CONVERSATION_ID = "5f0c8f1e-6d6a-4f43-9b59-0c6a3c1f6a10"
+SERVER_STARTUP_TIMEOUT = 30.0
+
+
+class StubUpstream:
+    """
+    Minimal HTTP/1.1 stand-in for the Stardog Cloud API with keep-alive and
+    chunked NDJSON streaming.
+
+    Answers stream ``stream_events - 1`` pending events, then ``final_answer``.
+    """
+
+    def __init__(self, stream_events: int = 200, final_answer: str = "Final answer"):
+        self.stream_events = stream_events
+        self.final_answer = final_answer
+        self.url = ""
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = request_line.split(" ", 2)
+                headers = dict(
+                    line.lower().split(": ", 1) for line in header_lines if line
+                )
+                await reader.readexactly(int(headers.get("content-length", "0")))
+
+                if method == "GET" and path == "/v1/app":
+                    body = json.dumps(STUB_SETTINGS).encode()
+                    writer.write(
+                        b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                        + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                        + body
+                    )
+                elif method == "POST" and path == "/v1/voicebox/stream/ask":
+                    await self._stream_answer(writer)
+                else:
+                    writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _stream_answer(self, writer):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        for index in range(self.stream_events):
+            final = index == self.stream_events - 1
+            event = {
+                "result": self.final_answer if final else f"token {index}",
+                "conversation_id": STUB_CONVERSATION_ID,
+                "message_id": "stub-message",
+                "pending": not final,
+            }
+            chunk = (json.dumps(event) + "\n").encode()
+            writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+
+
+async def _ignore_log(message):
+    # MCP client log handler for load and soak runs: the server logs every
+    # tool call to the client, and printing those would make the test
+    # driver the bottleneck and drown its report.
+    pass
+
+
+@dataclass
+class ServerProcess:
+    """
+    An HTTP mode server running in a subprocess.
+    """
+
+    process: subprocess.Popen
+    port: int
+    log_path: Path
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def mcp_url(self) -> str:
+        return f"{self.base_url}/mcp"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_until_ready(base_url: str) -> None:
+    deadline = time.monotonic() + SERVER_STARTUP_TIMEOUT
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while True:
+            try:
+                if (await client.get("/readyz")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"server at {base_url} did not become ready")
+            await asyncio.sleep(0.1)
+
+
+@pytest.fixture
+def spawn_http_server(tmp_path):
+    """
+    Start HTTP mode servers in subprocesses, stopped at the end of the test.
+
+    ``await spawn_http_server(endpoint, *options)`` returns once the server
+    is ready. The caller's event loop must keep running meanwhile, since
+    readiness probes reach ``endpoint`` (usually a StubUpstream on that loop).
+    """
+    servers = []
+
+    async def _spawn(endpoint: str, *options: str) -> ServerProcess:
+        port = _free_port()
+        log_path = tmp_path / f"server-{port}.log"
+        with open(log_path, "wb") as log:
+            process = subprocess.Popen(
+                [sys.executable, "-m", "stardog_cloud_mcp.server", "--mode", "http",
+                 "--port", str(port), "--endpoint", endpoint,
+                 "--token", "stub-token", "--client_id", "stub-client", *options],
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                env={**os.environ, "FASTMCP_CHECK_FOR_UPDATES": "off", "FASTMCP_LOG_LEVEL": "WARNING"},
+            )
+        server = ServerProcess(process, port, log_path)
+        servers.append(server)
+        await _wait_until_ready(server.base_url)
+        return server
+
+    yield _spawn
+    for server in servers:
+        server.process.terminate()
+        server.process.wait(timeout=10)
+
+
+@pytest.fixture
+def loop():
+    """
+    A fresh event loop for tests that drive async code from benchmarks.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def stub_upstream():
+    """
+    Factory for StubUpstream instances, used as async context managers.
+    """
+    return StubUpstream
@@ -0,0 +1,128 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastmcp import Client
+
+from stardog_cloud_mcp.answer_cache import AnswerCache
+from stardog_cloud_mcp.server import initialize_server
+
+QUESTION = "Which flights departed late in May?"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("stardog_cloud_mcp.answer_cache.time.monotonic", lambda: now[0])
+    return now
+
+
+def test_repeats_in_the_same_conversation_are_cached(clock):
+    cache = AnswerCache(ttl=30)
+    cache.put("token", "app", "conv-1", QUESTION, '{"content": "42"}')
+
+    assert cache.get("token", "app", "conv-1", f"  {QUESTION} ") == '{"content": "42"}'
+    assert cache.get("token", "app", "conv-2", QUESTION) is None
+    assert cache.get("token", "other-app", "conv-1", QUESTION) is None
+    assert cache.get("other-token", "app", "conv-1", QUESTION) is None
+    assert cache.get("token", "app", "conv-1", QUESTION, "sd-override") is None
+    assert cache.get("token", "app", "conv-1", "Which flights departed on time?") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 5
+
+
+def test_answers_expire(clock):
+    cache = AnswerCache(ttl=30)
+    cache.put("token", "app", "conv-1", QUESTION, "answer")
+    clock[0] += 29
+    assert cache.get("token", "app", "conv-1", QUESTION) == "answer"
+    clock[0] += 1
+    assert cache.get("token", "app", "conv-1", QUESTION) is None
+    assert cache.stats() == {"conversations": 0, "answers": 0, "bytes": 0, "hits": 1, "misses": 1}
+
+
+def test_expired_conversations_are_dropped_on_put(clock):
+    cache = AnswerCache(ttl=30)
+    cache.put("token", "app", "conv-1", QUESTION, "answer")
+    clock[0] += 60
+    cache.put("token", "app", "conv-2", QUESTION, "answer")
+    assert cache.stats()["conversations"] == 1
+
+
+def test_entry_and_conversation_bounds(clock):
+    cache = AnswerCache(ttl=30, max_conversations=2, max_entries=2)
+    for index in range(3):
+        cache.put("token", "app", "conv-1", f"question {index}", "answer")
+    assert cache.get("token", "app", "conv-1", "question 0") is None
+    assert cache.get("token", "app", "conv-1", "question 2") == "answer"
+
+    cache.put("token", "app", "conv-2", QUESTION, "answer")
+    # conv-1 was used last, so conv-2 is the least recently used.
+    cache.get("token", "app", "conv-1", "question 2")
+    cache.put("token", "app", "conv-3", QUESTION, "answer")
+    assert cache.get("token", "app", "conv-2", QUESTION) is None
+    assert cache.get("token", "app", "conv-1", "question 2") == "answer"
+    assert cache.stats()["conversations"] == 2
+
+
+def test_memory_bound(clock):
+    answer = "x" * 1000
+    cache = AnswerCache(ttl=30, max_bytes=20_000)
+    for index in range(50):
+        cache.put("token", "app", f"conv-{index}", QUESTION, answer)
+        assert cache.size <= cache.max_bytes
+    assert 10 <= cache.stats()["conversations"] < 20
+
+    # Answers too large for the cache are never stored.
+    cache.put("token", "app", "conv-big", QUESTION, "x" * 5000)
+    assert cache.get("token", "app", "conv-big", QUESTION) is None
+
+
+@pytest.mark.asyncio
+async def test_handler_answers_repeats_from_cache(tool_handler):
+    tool_handler.answer_cache = AnswerCache(ttl=30)
+    voicebox_app = tool_handler.cloud_client.voicebox_app.return_value
+    stream_ask = voicebox_app.async_stream_ask
+    calls = []
+
+    def counting_stream_ask(**kwargs):
+        calls.append(kwargs)
+        return stream_ask(**kwargs)
+
+    voicebox_app.async_stream_ask = counting_stream_ask
+
+    first = await tool_handler.handle_voicebox_ask("token", "app", QUESTION)
+    # The first answer started conversation conv-1; re-asking there is cached.
+    repeat = await tool_handler.handle_voicebox_ask("token", "app", QUESTION, "conv-1")
+    other = await tool_handler.handle_voicebox_ask("token", "app", "Another question", "conv-1")
+
+    assert repeat == first
+    assert other == first
+    assert len(calls) == 2
+    assert calls[1]["question"] == "Another question"
+
+
+@patch("fastmcp.FastMCP.run")
+@pytest.mark.asyncio
+async def test_initialize_server_answer_cache(mock_run):
+    with patch("stardog_cloud_mcp.server.StardogAsyncClient") as mock_stardog_client, \
+         patch("stardog_cloud_mcp.server.ToolHandler") as mock_tool_handler:
+        mock_stardog_client.return_value.aclose = AsyncMock()
+        server = initialize_server(
+            endpoint="http://test-endpoint",
+            api_token="test-token",
+            client_id="test-client",
+            auth_token_override=None,
+            mode="stdio",
+            port=7000,
+            answer_cache_ttl=45.0,
+        )
+        async with Client(server):
+            pass
+        async with Client(server):
+            pass
+
+    first, second = (call.args[2] for call in mock_tool_handler.call_args_list)
+    assert isinstance(first, AnswerCache)
+    assert first.ttl == 45.0
+    # One cache for all sessions.
+    assert second is first
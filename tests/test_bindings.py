@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock
+
+import pytest
+from stardog.cloud.exceptions import UnauthorizedException
+
+from stardog_cloud_mcp.bindings import AppBindingCache, token_fingerprint
+
+
+def test_token_fingerprint_hides_token():
+    fingerprint = token_fingerprint("secret-token")
+    assert "secret-token" not in fingerprint
+    assert fingerprint == token_fingerprint("secret-token")
+
+
+def test_bindings_are_bounded_lru():
+    cloud_client = MagicMock()
+    cloud_client.voicebox_app.side_effect = lambda app_api_token, client_id: (app_api_token, client_id)
+    cache = AppBindingCache(cloud_client, max_size=2)
+
+    assert cache.get("t1", "c") == ("t1", "c")
+    cache.get("t2", "c")
+    cache.get("t1", "c")  # refresh t1
+    cache.get("t3", "c")  # evicts t2
+
+    assert len(cache._bindings) == 2
+    cache.get("t1", "c")
+    assert cloud_client.voicebox_app.call_count == 3
+    cache.get("t2", "c")
+    assert cloud_client.voicebox_app.call_count == 4
+
+
+def test_rejected_token_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("stardog_cloud_mcp.bindings.time.monotonic", lambda: now[0])
+    cache = AppBindingCache(MagicMock(), rejected_ttl=10)
+    cache.get("t1", "c")
+
+    cache.note_error("t1", UnauthorizedException("nope", 401))
+    assert cache._bindings == {}
+    with pytest.raises(PermissionError):
+        cache.get("t1", "c")
+
+    now[0] += 11
+    assert cache.get("t1", "c") is not None
+
+
+def test_other_errors_are_not_negative_cached():
+    cache = AppBindingCache(MagicMock())
+    cache.note_error("t1", RuntimeError("Connection failed"))
+    assert cache.get("t1", "c") is not None
+
+
+def test_rejections_under_an_auth_token_override_are_not_negative_cached():
+    cache = AppBindingCache(MagicMock())
+    cache.note_error("t1", UnauthorizedException("Invalid SSO token", 401), "bad-override")
+    assert cache.get("t1", "c") is not None
+
+
+def test_settings_are_bounded_lru_and_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("stardog_cloud_mcp.bindings.time.monotonic", lambda: now[0])
+    cache = AppBindingCache(MagicMock(), max_size=2, settings_ttl=30)
+
+    for client_id in ("c1", "c2", "c3"):
+        cache.put_settings("t1", client_id, f"settings-{client_id}")
+    assert len(cache._settings) == 2
+    assert cache.get_settings("t1", "c1") is None
+    assert cache.get_settings("t1", "c3") == "settings-c3"
+
+    now[0] += 30
+    assert cache.get_settings("t1", "c3") is None
+
+
+def test_rejected_token_gets_no_cached_settings():
+    cache = AppBindingCache(MagicMock())
+    cache.put_settings("t1", "c", "settings")
+    cache.put_settings("t2", "c", "settings")
+
+    cache.note_error("t1", UnauthorizedException("nope", 401))
+    with pytest.raises(PermissionError):
+        cache.get_settings("t1", "c")
+    assert list(cache._settings) == [(token_fingerprint("t2"), "c")]
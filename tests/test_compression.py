@@ -0,0 +1,336 @@
+import asyncio
+import gzip
+import json
+import zlib
+from unittest.mock import patch
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from stardog_cloud_mcp.compression import (
+    CompressionMiddleware,
+    CompressionStats,
+    UpstreamCompressionTransport,
+    negotiate_encoding,
+)
+from stardog_cloud_mcp.constants import Headers
+from stardog_cloud_mcp.server import initialize_server
+
+ANSWER = {"answer": "The knowledge graph lists 42 products. " * 200, "provenance": ["p"] * 100}
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate, br, zstd", "zstd"),
+        ("gzip, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip;q=0.9", "gzip"),
+        ("zstd;q=0, gzip", "gzip"),
+        ("*", "zstd"),
+        ("*, zstd;q=0", "br"),
+        ("deflate", None),
+        ("", None),
+        ("gzip;q=0", None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding, ["zstd", "br", "gzip"]) == expected
+
+
+def _app(stats, minimum_size=1024):
+    async def answer(request):
+        return JSONResponse(ANSWER)
+
+    async def small(request):
+        return PlainTextResponse("ok")
+
+    async def events(request):
+        async def stream():
+            for index in range(3):
+                yield f"event: message\ndata: {json.dumps({'index': index, **ANSWER})}\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    async def tool_call(request):
+        async def stream():
+            # A short log notification precedes the result.
+            yield 'event: message\ndata: {"method": "notifications/message"}\n\n'
+            yield f"event: message\ndata: {json.dumps(ANSWER)}\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    app = Starlette(
+        routes=[
+            Route("/answer", answer),
+            Route("/small", small),
+            Route("/events", events),
+            Route("/tool-call", tool_call),
+        ]
+    )
+    return CompressionMiddleware(app, minimum_size=minimum_size, stats=stats)
+
+
+def _client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+async def test_large_responses_are_compressed(encoding):
+    if encoding == "br":
+        pytest.importorskip("brotli")
+    if encoding == "zstd":
+        pytest.importorskip("zstandard")
+    stats = CompressionStats()
+    async with _client(_app(stats)) as client:
+        response = await client.get("/answer", headers={"accept-encoding": encoding})
+
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "accept-encoding"
+    assert response.json() == ANSWER
+    report = stats.report()["encodings"][encoding]
+    assert report["responses"] == 1
+    assert report["compressed_bytes"] == int(response.headers["content-length"])
+    assert report["ratio"] > 10
+    assert report["cpu_seconds"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_small_responses_and_identity_clients_are_not_compressed():
+    stats = CompressionStats()
+    async with _client(_app(stats)) as client:
+        small = await client.get("/small", headers={"accept-encoding": "gzip"})
+        identity = await client.get("/answer", headers={"accept-encoding": "identity"})
+
+    assert "content-encoding" not in small.headers
+    assert small.text == "ok"
+    assert "content-encoding" not in identity.headers
+    assert identity.json() == ANSWER
+    assert stats.report() == {"encodings": {}, "uncompressed_responses": 1}
+
+
+@pytest.mark.asyncio
+async def test_streamed_events_are_flushed_one_by_one():
+    stats = CompressionStats()
+    app = _app(stats)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/events",
+        "raw_path": b"/events",
+        "query_string": b"",
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    messages = []
+    disconnected = asyncio.Event()
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+
+    start, *bodies = messages
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    # Every compressed chunk decodes to a whole event on its own.
+    decompressor = zlib.decompressobj(31)
+    events = [decompressor.decompress(body["body"]).decode() for body in bodies]
+    assert [json.loads(event.split("data: ")[1])["index"] for event in events if event] == [0, 1, 2]
+    assert stats.report()["encodings"]["gzip"]["responses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_event_streams_are_compressed_despite_a_small_first_event():
+    stats = CompressionStats()
+    async with _client(_app(stats)) as client:
+        response = await client.get("/tool-call", headers={"accept-encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text.startswith('event: message\ndata: {"method": "notifications/message"}')
+    assert stats.report()["encodings"]["gzip"]["responses"] == 1
+
+
+MCP_HEADERS = {"accept": "application/json, text/event-stream", "accept-encoding": "gzip"}
+
+
+def _sse_result(response):
+    for line in response.text.splitlines():
+        if line.startswith("data: "):
+            message = json.loads(line[len("data: "):])
+            if "result" in message:
+                return message["result"]
+    raise AssertionError(f"no result in {response.text!r}")
+
+
+@pytest.mark.asyncio
+async def test_tool_call_responses_are_compressed_end_to_end(stub_upstream, spawn_http_server):
+    answer = "The knowledge graph lists 42 products. " * 2000
+    async with stub_upstream(stream_events=5, final_answer=answer) as upstream:
+        server = await spawn_http_server(upstream.url, "--compression")
+        async with httpx.AsyncClient(base_url=server.base_url, headers=MCP_HEADERS) as client:
+            initialize = await client.post("/mcp", json={
+                "jsonrpc": "2.0", "id": 1, "method": "initialize",
+                "params": {
+                    "protocolVersion": "2025-06-18",
+                    "capabilities": {},
+                    "clientInfo": {"name": "compression-test", "version": "1.0"},
+                },
+            })
+            session = {"mcp-session-id": initialize.headers["mcp-session-id"]}
+            await client.post(
+                "/mcp", json={"jsonrpc": "2.0", "method": "notifications/initialized"}, headers=session
+            )
+            response = await client.post("/mcp", headers=session, json={
+                "jsonrpc": "2.0", "id": 2, "method": "tools/call",
+                "params": {"name": "voicebox_ask", "arguments": {"question": "How many products?"}},
+            })
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.num_bytes_downloaded < len(answer) / 10
+    result = _sse_result(response)
+    assert json.loads(result["content"][0]["text"])["content"] == answer
+
+
+@pytest.mark.asyncio
+async def test_upstream_compressed_responses_are_decoded_and_counted():
+    body = json.dumps(ANSWER).encode()
+
+    def upstream(request):
+        assert "gzip" in request.headers["accept-encoding"]
+        return httpx.Response(200, headers={"content-encoding": "gzip"}, content=gzip.compress(body))
+
+    stats = CompressionStats()
+    transport = UpstreamCompressionTransport(httpx.MockTransport(upstream), stats)
+    async with httpx.AsyncClient(transport=transport, base_url="http://upstream") as client:
+        response = await client.post("/v1/voicebox/stream/ask")
+
+    assert response.json() == ANSWER
+    assert "content-encoding" not in response.headers
+    report = stats.report()["encodings"]["gzip"]
+    assert report["responses"] == 1
+    assert report["original_bytes"] == len(body)
+    assert report["compressed_bytes"] == len(gzip.compress(body))
+
+
+def _raw_deflate(body):
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+def _zstd_frames(body):
+    zstandard = pytest.importorskip("zstandard")
+
+    # Two frames, as a server flushing a stream may send.
+    half = len(body) // 2
+    compressor = zstandard.ZstdCompressor()
+    return compressor.compress(body[:half]) + compressor.compress(body[half:])
+
+
+def _brotli(body):
+    brotli = pytest.importorskip("brotli")
+
+    return brotli.compress(body)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "encoding, compress",
+    [
+        ("gzip", gzip.compress),
+        ("deflate", zlib.compress),
+        ("deflate", _raw_deflate),
+        ("br", _brotli),
+        ("zstd", _zstd_frames),
+    ],
+    ids=["gzip", "deflate", "raw-deflate", "br", "zstd"],
+)
+async def test_upstream_encodings_are_decoded_in_chunks(encoding, compress):
+    body = json.dumps(ANSWER).encode()
+    compressed = compress(body)
+
+    def upstream(request):
+        chunks = [compressed[i:i + 97] for i in range(0, len(compressed), 97)]
+        return httpx.Response(200, headers={"content-encoding": encoding}, stream=_Chunks(chunks))
+
+    stats = CompressionStats()
+    transport = UpstreamCompressionTransport(httpx.MockTransport(upstream), stats)
+    async with httpx.AsyncClient(transport=transport, base_url="http://upstream") as client:
+        response = await client.post("/v1/voicebox/stream/ask")
+
+    assert response.content == body
+    assert stats.report()["encodings"][encoding]["original_bytes"] == len(body)
+
+
+@pytest.mark.asyncio
+async def test_corrupt_upstream_bodies_raise_a_decoding_error():
+    def upstream(request):
+        return httpx.Response(200, headers={"content-encoding": "gzip"}, content=b"not gzip")
+
+    transport = UpstreamCompressionTransport(httpx.MockTransport(upstream), CompressionStats())
+    async with httpx.AsyncClient(transport=transport, base_url="http://upstream") as client:
+        with pytest.raises(httpx.DecodingError):
+            await client.post("/v1/voicebox/stream/ask")
+
+
+class _Chunks(httpx.AsyncByteStream):
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+@patch("fastmcp.FastMCP.run")
+def test_initialize_server_compression(mock_run):
+    with patch("stardog_cloud_mcp.server.StardogAsyncClient"):
+        initialize_server(
+            endpoint="http://test-endpoint",
+            api_token="test-token",
+            client_id="test-client",
+            auth_token_override=None,
+            mode="http",
+            port=8080,
+            compression=True,
+            compression_min_size=256,
+        )
+
+    (middleware,) = mock_run.call_args.kwargs["middleware"]
+    assert middleware.cls is CompressionMiddleware
+    assert middleware.kwargs == {"minimum_size": 256}
+
+
+@pytest.mark.asyncio
+async def test_compressed_http_routes_and_report():
+    with patch("fastmcp.FastMCP.run") as mock_run:
+        server = initialize_server(
+            endpoint="http://test-endpoint",
+            api_token="test-token",
+            client_id="test-client",
+            auth_token_override=None,
+            mode="http",
+            port=8080,
+            admin_token="admin-secret",
+            compression=True,
+            compression_min_size=0,
+        )
+    app = server.http_app(middleware=mock_run.call_args.kwargs["middleware"])
+    admin = {Headers.STARDOG_MCP_ADMIN_TOKEN: "admin-secret", "accept-encoding": "gzip"}
+    async with _client(app) as client:
+        health = await client.get("/healthz", headers={"accept-encoding": "gzip"})
+        report = await client.get("/debug/compression", headers=admin)
+
+    assert health.headers["content-encoding"] == "gzip"
+    assert health.json()["status"] == "ok"
+    assert report.json()["responses"]["encodings"]["gzip"]["responses"] >= 1
+    assert "upstream" in report.json()
@@ -0,0 +1,215 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastmcp import Client
+
+from stardog_cloud_mcp.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    AdaptiveConcurrencyTransport,
+)
+from stardog_cloud_mcp.exceptions import StardogMCPOverloadException
+from stardog_cloud_mcp.health import HealthMonitor
+from stardog_cloud_mcp.server import initialize_server
+
+
+def _busy(limiter):
+    limiter.in_flight = limiter.current_limit
+
+
+def test_limit_grows_while_latency_is_stable():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=100, initial_limit=10)
+    for _ in range(50):
+        _busy(limiter)
+        limiter.on_sample(0.1)
+    assert limiter.current_limit > 40
+
+
+def test_limit_does_not_grow_while_idle():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=100, initial_limit=10)
+    for _ in range(20):
+        limiter.on_sample(0.1)
+    assert limiter.current_limit == 10
+
+
+def test_limit_shrinks_when_latency_rises():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=100, initial_limit=40)
+    _busy(limiter)
+    for _ in range(5):
+        limiter.on_sample(0.1)
+    grown = limiter.current_limit
+    for _ in range(10):
+        limiter.on_sample(1.0)
+    assert limiter.current_limit < grown * 0.6
+    assert limiter.stats()["last_rtt_ms"] == 1000.0
+
+
+def test_overload_backs_off_down_to_the_minimum():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=100, min_limit=2, initial_limit=10)
+    limiter.on_sample(5.0, overloaded=True)
+    assert limiter.current_limit == 9
+    for _ in range(50):
+        limiter.on_sample(5.0, overloaded=True)
+    assert limiter.current_limit == 2
+    # Overloaded samples do not skew the latency baseline.
+    assert limiter.baseline_rtts == {}
+
+
+@pytest.mark.asyncio
+async def test_requests_over_the_limit_wait_then_shed():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=1, initial_limit=1, max_wait=0.05)
+    await limiter.acquire()
+    with pytest.raises(StardogMCPOverloadException, match="1 calls are already in flight"):
+        await limiter.acquire()
+    assert limiter.stats()["shed"] == 1
+
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.stats()["waiting"] == 1
+    limiter.release()
+    await waiting
+    assert limiter.in_flight == 1
+    assert limiter.stats()["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_transport_holds_a_slot_until_the_response_is_closed():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=10)
+    transport = AdaptiveConcurrencyTransport(
+        httpx.MockTransport(lambda request: httpx.Response(200, content=b"answer")), limiter
+    )
+    async with httpx.AsyncClient(transport=transport, base_url="http://upstream") as client:
+        async with client.stream("POST", "/v1/voicebox/stream/ask") as response:
+            assert limiter.in_flight == 1
+            assert await response.aread() == b"answer"
+        assert limiter.in_flight == 0
+    assert "/v1/voicebox/stream/ask" in limiter.baseline_rtts
+
+
+def test_each_kind_of_request_has_its_own_baseline():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=100, initial_limit=40)
+    _busy(limiter)
+    for _ in range(5):
+        limiter.on_sample(0.05, kind="/v1/app")
+        limiter.on_sample(2.0, kind="/v1/voicebox/stream/ask")
+    # Slow answers next to fast settings lookups are no sign of overload.
+    assert limiter.current_limit >= 40
+    assert limiter.stats()["baseline_rtt_ms"] == {
+        "/v1/app": 50.0,
+        "/v1/voicebox/stream/ask": 2000.0,
+    }
+
+
+class _SlowBody(httpx.AsyncByteStream):
+    def __init__(self, delay, error=None):
+        self.delay = delay
+        self.error = error
+
+    async def __aiter__(self):
+        yield b"first event"
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        yield b"last event"
+
+
+def _streaming(body):
+    return AdaptiveConcurrencyLimiter(max_limit=10, initial_limit=10), httpx.MockTransport(
+        lambda request: httpx.Response(200, stream=body)
+    )
+
+
+@pytest.mark.asyncio
+async def test_transport_samples_latency_until_the_body_is_read():
+    limiter, upstream = _streaming(_SlowBody(0.05))
+    transport = AdaptiveConcurrencyTransport(upstream, limiter)
+    async with httpx.AsyncClient(transport=transport, base_url="http://upstream") as client:
+        async with client.stream("POST", "/v1/voicebox/stream/ask") as response:
+            assert limiter.last_rtt is None
+            await response.aread()
+    assert limiter.last_rtt >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_transport_backs_off_on_a_timeout_while_reading_the_body():
+    limiter, upstream = _streaming(_SlowBody(0, httpx.ReadTimeout("slow")))
+    transport = AdaptiveConcurrencyTransport(upstream, limiter)
+    async with httpx.AsyncClient(transport=transport, base_url="http://upstream") as client:
+        with pytest.raises(httpx.ReadTimeout):
+            async with client.stream("POST", "/v1/voicebox/stream/ask") as response:
+                await response.aread()
+    assert limiter.current_limit == 9
+    assert limiter.in_flight == 0
+    assert limiter.last_rtt is None
+
+
+@pytest.mark.asyncio
+async def test_transport_does_not_sample_error_responses():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=10, initial_limit=10)
+    transport = AdaptiveConcurrencyTransport(
+        httpx.MockTransport(lambda request: httpx.Response(401)), limiter
+    )
+    async with httpx.AsyncClient(transport=transport, base_url="http://upstream") as client:
+        # Readiness probes are rejected without credentials.
+        assert (await client.get("/v1/app")).status_code == 401
+    assert limiter.baseline_rtts == {}
+    assert limiter.current_limit == 10
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "outcome",
+    [httpx.Response(503), httpx.Response(429), httpx.ReadTimeout("slow")],
+)
+async def test_transport_backs_off_on_overload(outcome):
+    def upstream(request):
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    limiter = AdaptiveConcurrencyLimiter(max_limit=10, initial_limit=10)
+    transport = AdaptiveConcurrencyTransport(httpx.MockTransport(upstream), limiter)
+    async with httpx.AsyncClient(transport=transport, base_url="http://upstream") as client:
+        try:
+            await client.get("/v1/app")
+        except httpx.ReadTimeout:
+            pass
+    assert limiter.current_limit == 9
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_readiness_reports_the_limit():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=50, initial_limit=8)
+    client = MagicMock()
+    client.probe = AsyncMock(return_value=200)
+    client.pool_stats.return_value = None
+    monitor = HealthMonitor(concurrency_limiter=limiter)
+    async with monitor.running(client):
+        ready, details = await monitor.readiness()
+    assert ready
+    assert details["concurrency"]["limit"] == 8
+    assert details["concurrency"]["in_flight"] == 0
+
+
+@patch("fastmcp.FastMCP.run")
+@pytest.mark.asyncio
+async def test_initialize_server_adaptive_concurrency(mock_run):
+    with patch("stardog_cloud_mcp.server.StardogAsyncClient") as mock_stardog_client:
+        mock_stardog_client.return_value.aclose = AsyncMock()
+        server = initialize_server(
+            endpoint="http://test-endpoint",
+            api_token="test-token",
+            client_id="test-client",
+            auth_token_override=None,
+            mode="stdio",
+            port=7000,
+            adaptive_concurrency_limit=64,
+        )
+        async with Client(server):
+            pass
+    transport = mock_stardog_client.call_args.kwargs["transport"]
+    assert isinstance(transport, AdaptiveConcurrencyTransport)
+    assert transport.limiter.max_limit == 64
@@ -0,0 +1,162 @@
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+from stardog_cloud_mcp.failover import (
+    EndpointSelector,
+    FailoverTransport,
+    parse_endpoints,
+)
+from stardog_cloud_mcp.server import initialize_server
+
+US, EU = "https://us.cloud.test/api", "https://eu.cloud.test/api"
+CONVERSATIONS = {
+    "us": "5f0c8f1e-6d6a-4f43-9b59-0c6a3c1f6a10",
+    "eu": "0b7e3f2a-1c4d-4e5f-8a9b-2c3d4e5f6a7b",
+}
+
+
+def test_parse_endpoints():
+    assert parse_endpoints(f" {US}/ , {EU},") == [US, EU]
+    assert parse_endpoints(US) == [US]
+    with pytest.raises(ValueError, match="At least one"):
+        parse_endpoints(" , ")
+
+
+def test_selector_prefers_low_latency_and_few_errors():
+    selector = EndpointSelector([US, EU])
+    us, eu = selector.endpoints
+    # Untried endpoints come first, in the configured order.
+    assert selector.candidates() == [us, eu]
+
+    selector.record(us, 0.3, error=False)
+    selector.record(eu, 0.1, error=False)
+    assert selector.candidates() == [eu, us]
+
+    # A burst of server errors outweighs the latency advantage.
+    for _ in range(3):
+        selector.record(eu, 0.1, error=True)
+    assert selector.candidates() == [us, eu]
+
+
+def test_selector_cooldown_and_stale_probe():
+    selector = EndpointSelector([US, EU], cooldown=30, probe_interval=60)
+    us, eu = selector.endpoints
+    selector.record(us, 0.1, error=False)
+    selector.record(eu, 0.5, error=False)
+
+    # EU has not been used for a while, so the next request probes it.
+    eu.last_used -= 120
+    assert selector.candidates() == [eu, us]
+
+    selector.record(eu, 0.5, error=False)
+    selector.unreachable(us)
+    assert selector.candidates() == [eu, us]
+    assert selector.candidates(now=us.down_until) == [us, eu]
+
+
+def test_selector_bounds_pinned_conversations():
+    selector = EndpointSelector([US, EU], max_conversations=2)
+    us, eu = selector.endpoints
+    selector.pin("c1", us)
+    selector.pin("c2", eu)
+    assert selector.pinned("c1") is us
+    selector.pin("c3", eu)
+    assert selector.pinned("c2") is None
+    assert selector.pinned("c1") is us
+
+
+class _Upstream:
+    """
+    Two-region Stardog Cloud stub; regions listed in ``down`` refuse connections.
+    """
+
+    def __init__(self):
+        self.down = set()
+        self.requests = []
+
+    def __call__(self, request):
+        host = request.url.host.split(".")[0]
+        self.requests.append((host, request.url.path, request.headers["host"]))
+        if host in self.down:
+            raise httpx.ConnectError("connection refused", request=request)
+        if request.url.path.endswith("/v1/app"):
+            return httpx.Response(200, json={"name": host, "database": "flights"})
+        conversation_id = json.loads(request.content)["conversation_id"] or CONVERSATIONS[host]
+        event = {"result": host, "conversation_id": conversation_id, "message_id": "m", "pending": False}
+        return httpx.Response(200, content=json.dumps(event).encode() + b"\n")
+
+
+@pytest.mark.asyncio
+async def test_transport_fails_over_on_connection_errors():
+    upstream = _Upstream()
+    upstream.down.add("us")
+    selector = EndpointSelector([US, EU])
+    transport = FailoverTransport(httpx.MockTransport(upstream), selector)
+    async with httpx.AsyncClient(transport=transport, base_url=US) as client:
+        response = await client.get("/v1/app")
+
+    assert response.json()["name"] == "eu"
+    assert upstream.requests == [
+        ("us", "/api/v1/app", "us.cloud.test"),
+        ("eu", "/api/v1/app", "eu.cloud.test"),
+    ]
+    us, eu = selector.endpoints
+    assert us.down_until > 0 and us.error_rate > 0
+    assert eu.latency is not None and eu.error_rate == 0
+
+
+@pytest.mark.asyncio
+async def test_transport_raises_when_every_endpoint_is_down():
+    upstream = _Upstream()
+    upstream.down.update({"us", "eu"})
+    transport = FailoverTransport(httpx.MockTransport(upstream), EndpointSelector([US, EU]))
+    async with httpx.AsyncClient(transport=transport, base_url=US) as client:
+        with pytest.raises(httpx.ConnectError):
+            await client.get("/v1/app")
+    assert len(upstream.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_conversations_stay_on_their_endpoint():
+    upstream = _Upstream()
+
+    async def ask(client, conversation_id=""):
+        result = await client.call_tool("voicebox_ask", {"question": "q", "conversation_id": conversation_id})
+        return json.loads(result.content[0].text)
+
+    with patch("stardog_cloud_mcp.server.http_transport", return_value=httpx.MockTransport(upstream)), \
+         patch("fastmcp.FastMCP.run"):
+        server = initialize_server(
+            endpoint=f"{US},{EU}",
+            api_token="test-token",
+            client_id="test-client",
+            auth_token_override=None,
+            mode="stdio",
+            port=7000,
+        )
+        async with Client(server) as client:
+            first = await ask(client)
+            assert (first["content"], first["conversation_id"]) == ("us", CONVERSATIONS["us"])
+
+            # US goes down: calls outside a conversation fail over to EU.
+            upstream.down.add("us")
+            settings = await client.call_tool("voicebox_settings", {})
+            assert json.loads(settings.content[0].text)["name"] == "eu"
+            second = await ask(client)
+            assert (second["content"], second["conversation_id"]) == ("eu", CONVERSATIONS["eu"])
+
+            # The US conversation's history only exists in US: no failover.
+            with pytest.raises(ToolError, match="connection refused"):
+                await ask(client, CONVERSATIONS["us"])
+
+            # Once US is back, its conversation is served there again,
+            # although US is still in cooldown for new conversations.
+            upstream.down.clear()
+            assert (await ask(client, CONVERSATIONS["us"]))["content"] == "us"
+            assert (await ask(client, CONVERSATIONS["eu"]))["content"] == "eu"
+            assert (await ask(client))["content"] == "eu"
@@ -0,0 +1,201 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from stardog_cloud_mcp.client import AsyncClient
+from stardog_cloud_mcp.health import HealthMonitor
+from stardog_cloud_mcp.lanes import parse_lanes
+from stardog_cloud_mcp.ratelimit import RateLimiter, RateLimitTransport
+from stardog_cloud_mcp.replay import ReplayTransport
+from stardog_cloud_mcp.server import initialize_server
+
+IDLE_POOL = {"connections": 1, "active": 0, "max_connections": 100, "queued": 0}
+
+
+def _cloud_client(status=401, pool=IDLE_POOL):
+    client = MagicMock()
+    client.probe = AsyncMock(return_value=status)
+    client.pool_stats.return_value = pool
+    client.aclose = AsyncMock()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_readiness_reports_starting_before_lifespan():
+    ready, details = await HealthMonitor().readiness()
+    assert not ready
+    assert details == {"status": "starting"}
+
+
+@pytest.mark.asyncio
+async def test_readiness_with_reachable_upstream():
+    monitor = HealthMonitor()
+    async with monitor.running(_cloud_client()):
+        with monitor.track():
+            ready, details = await monitor.readiness()
+    assert ready
+    assert details["status"] == "ready"
+    assert details["upstream"]["reachable"] and details["upstream"]["status"] == 401
+    assert details["in_flight"] == 1
+    assert details["pool"] == IDLE_POOL
+    assert monitor.cloud_client is None
+
+
+@pytest.mark.asyncio
+async def test_upstream_probe_is_cached_for_its_ttl():
+    monitor = HealthMonitor(probe_ttl=60)
+    client = _cloud_client()
+    async with monitor.running(client):
+        await asyncio.gather(*[monitor.readiness() for _ in range(5)])
+        await monitor.readiness()
+        assert client.probe.await_count == 1
+
+        monitor._probe_at = time.monotonic() - 61
+        await monitor.readiness()
+        assert client.probe.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_readiness_degraded_when_upstream_unreachable():
+    monitor = HealthMonitor()
+    client = _cloud_client()
+    client.probe.side_effect = httpx.ConnectError("refused")
+    async with monitor.running(client):
+        ready, details = await monitor.readiness()
+    assert not ready
+    assert details["status"] == "degraded"
+    assert details["upstream"]["error"] == "ConnectError"
+
+
+@pytest.mark.asyncio
+async def test_readiness_degraded_on_gateway_error():
+    monitor = HealthMonitor()
+    async with monitor.running(_cloud_client(status=503)):
+        ready, _ = await monitor.readiness()
+    assert not ready
+
+
+@pytest.mark.asyncio
+async def test_readiness_degraded_when_pool_saturated():
+    monitor = HealthMonitor()
+    saturated = {"connections": 2, "active": 2, "max_connections": 2, "queued": 3}
+    async with monitor.running(_cloud_client(pool=saturated)):
+        ready, details = await monitor.readiness()
+    assert not ready
+    assert details["pool"]["queued"] == 3
+
+
+@pytest.mark.asyncio
+async def test_readiness_degraded_when_lane_pool_saturated():
+    monitor = HealthMonitor()
+    saturated = {"connections": 2, "active": 2, "max_connections": 2, "queued": 1}
+    lane_clients = {"slow": _cloud_client(pool=saturated), "fast": _cloud_client()}
+    async with monitor.running(_cloud_client(), lane_clients):
+        ready, details = await monitor.readiness()
+    assert not ready
+    assert details["pool"] == IDLE_POOL
+    assert details["lane_pools"] == {"slow": saturated, "fast": IDLE_POOL}
+    assert monitor.lane_clients == {}
+
+
+@pytest.mark.asyncio
+async def test_event_loop_lag_is_measured():
+    monitor = HealthMonitor(lag_interval=0.01, max_loop_lag=0.05)
+    async with monitor.running(_cloud_client()):
+        await asyncio.sleep(0.02)
+        time.sleep(0.15)  # stall the loop
+        await asyncio.sleep(0.02)
+        ready, details = await monitor.readiness()
+    assert details["event_loop_lag_ms"] >= 50
+    assert not ready
+
+
+@pytest.mark.asyncio
+async def test_client_pool_stats_unwraps_transports():
+    limited = AsyncClient(
+        base_url="http://upstream",
+        transport=RateLimitTransport(httpx.AsyncHTTPTransport(), RateLimiter(10)),
+    )
+    plain = AsyncClient(base_url="http://upstream")
+    try:
+        assert limited.pool_stats() == {
+            "connections": 0,
+            "active": 0,
+            "max_connections": 100,
+            "queued": 0,
+        }
+        assert plain.pool_stats()["max_connections"] == 100
+    finally:
+        await limited.aclose()
+        await plain.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_pool_stats_without_http_pool(tmp_path):
+    recording = tmp_path / "empty.jsonl"
+    recording.write_text("")
+    client = AsyncClient(base_url="http://upstream", transport=ReplayTransport(str(recording)))
+    try:
+        assert client.pool_stats() is None
+        assert await client.probe(1.0) == 501
+    finally:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_health_routes_in_http_mode():
+    with patch("fastmcp.FastMCP.run"), \
+         patch("stardog_cloud_mcp.server.StardogAsyncClient") as mock_stardog_client:
+        mock_stardog_client.return_value = _cloud_client()
+        server = initialize_server(
+            endpoint="http://test-endpoint",
+            api_token="test-token",
+            client_id="test-client",
+            auth_token_override=None,
+            mode="http",
+            port=8080,
+        )
+        app = server.http_app()
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            starting = await client.get("/readyz")
+            async with app.lifespan(app):
+                healthz = await client.get("/healthz")
+                readyz = await client.get("/readyz")
+
+    assert starting.status_code == 503
+    assert healthz.status_code == 200
+    assert healthz.json()["status"] == "ok"
+    assert readyz.status_code == 200
+    assert readyz.json()["status"] == "ready"
+
+
+@pytest.mark.asyncio
+async def test_readyz_reports_lane_pools_in_http_mode():
+    saturated = {"connections": 3, "active": 3, "max_connections": 3, "queued": 2}
+    with patch("fastmcp.FastMCP.run"), \
+         patch("stardog_cloud_mcp.server.StardogAsyncClient") as mock_stardog_client:
+        mock_stardog_client.side_effect = [_cloud_client(), _cloud_client(pool=saturated)]
+        server = initialize_server(
+            endpoint="http://test-endpoint",
+            api_token="test-token",
+            client_id="test-client",
+            auth_token_override=None,
+            mode="http",
+            port=8080,
+            lanes=parse_lanes("slow=voicebox_ask:4:3"),
+        )
+        app = server.http_app()
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            async with app.lifespan(app):
+                readyz = await client.get("/readyz")
+
+    assert readyz.status_code == 503
+    assert readyz.json()["pool"] == IDLE_POOL
+    assert readyz.json()["lane_pools"] == {"slow": saturated}
@@ -0,0 +1,180 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+from stardog_cloud_mcp.client import AsyncClient, shared_ssl_context
+from stardog_cloud_mcp.constants import DEFAULT_LANE_QUEUE_TIMEOUT_SECONDS
+from stardog_cloud_mcp.exceptions import StardogMCPQueueTimeoutException
+from stardog_cloud_mcp.lanes import ExecutionLane, LaneConfig, parse_lanes
+from stardog_cloud_mcp.server import initialize_server
+
+
+def test_parse_lanes():
+    lanes = parse_lanes(
+        "fast=voicebox_settings:16:8:1.5; slow=voicebox_ask, voicebox_generate_query:32"
+    )
+    assert lanes == [
+        LaneConfig("fast", ("voicebox_settings",), 16, 8, 1.5),
+        LaneConfig(
+            "slow",
+            ("voicebox_ask", "voicebox_generate_query"),
+            32,
+            None,
+            DEFAULT_LANE_QUEUE_TIMEOUT_SECONDS,
+        ),
+    ]
+
+
+def test_parse_lanes_zero_means_unlimited_and_shared():
+    assert parse_lanes("bulk=sparql_execute:0:0") == [
+        LaneConfig("bulk", ("sparql_execute",), None, None, DEFAULT_LANE_QUEUE_TIMEOUT_SECONDS)
+    ]
+
+
+def test_parse_lanes_empty():
+    assert parse_lanes("") == []
+    assert parse_lanes(None) == []
+
+
+@pytest.mark.parametrize(
+    "value, message",
+    [
+        ("voicebox_ask", "Invalid execution lane"),
+        ("slow=", "Invalid execution lane"),
+        ("slow=voicebox_ask:1:2:3:4", "Invalid execution lane"),
+        ("a=voicebox_ask;a=voicebox_settings", "Duplicate execution lane"),
+        ("a=voicebox_ask;b=voicebox_ask", "more than one lane"),
+        ("slow=voicebox_aks", "Unknown tools in execution lane slow"),
+    ],
+)
+def test_parse_lanes_invalid(value, message):
+    with pytest.raises(ValueError, match=message):
+        parse_lanes(value)
+
+
+@pytest.mark.asyncio
+async def test_lane_limits_concurrency():
+    lane = ExecutionLane(LaneConfig("slow", ("voicebox_ask",), max_concurrency=2))
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        async with lane.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*[call() for _ in range(6)])
+    assert peak == 2
+    assert lane.in_flight == 0 and lane.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_lane_queue_timeout():
+    lane = ExecutionLane(
+        LaneConfig("slow", ("voicebox_ask",), max_concurrency=1, queue_timeout=0.05)
+    )
+    async with lane.slot():
+        with pytest.raises(StardogMCPQueueTimeoutException, match="'slow' is busy") as exc_info:
+            async with lane.slot():
+                pass
+    assert exc_info.value.queue_timeout == 0.05
+    assert lane.waiting == 0
+    # The slot is free again once released.
+    async with lane.slot():
+        assert lane.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_unlimited_lane_only_counts():
+    lane = ExecutionLane(LaneConfig("free", ("voicebox_ask",)))
+    async with lane.slot(), lane.slot():
+        assert lane.in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_clients_share_one_ssl_context():
+    first = AsyncClient(base_url="http://upstream")
+    second = AsyncClient(base_url="http://upstream", limits=httpx.Limits(max_connections=2))
+    try:
+        assert (
+            first._client._transport._pool._ssl_context
+            is second._client._transport._pool._ssl_context
+            is shared_ssl_context()
+        )
+    finally:
+        await first.aclose()
+        await second.aclose()
+
+
+def _lane_server(lanes):
+    with patch("fastmcp.FastMCP.run"):
+        return initialize_server(
+            endpoint="http://test-endpoint",
+            api_token="test-token",
+            client_id="test-client",
+            auth_token_override=None,
+            mode="stdio",
+            port=7000,
+            lanes=lanes,
+        )
+
+
+@pytest.mark.asyncio
+async def test_lanes_get_their_own_client_and_handler():
+    default_handler, fast_handler = MagicMock(), MagicMock()
+    fast_handler.handle_voicebox_settings = AsyncMock(return_value="fast settings")
+    default_handler.handle_voicebox_ask = AsyncMock(return_value="default answer")
+
+    with patch("stardog_cloud_mcp.server.StardogAsyncClient") as mock_stardog_client, \
+         patch("stardog_cloud_mcp.server.ToolHandler", side_effect=[default_handler, fast_handler]):
+        mock_stardog_client.return_value.aclose = AsyncMock()
+        server = _lane_server(parse_lanes("fast=voicebox_settings:4:3:1"))
+        async with Client(server) as client:
+            settings = await client.call_tool("voicebox_settings", {})
+            answer = await client.call_tool("voicebox_ask", {"question": "q"})
+
+    assert settings.content[0].text == "fast settings"
+    assert answer.content[0].text == "default answer"
+    default_call, lane_call = mock_stardog_client.call_args_list
+    assert default_call.kwargs == {"base_url": "http://test-endpoint"}
+    transport = lane_call.kwargs["transport"]
+    assert isinstance(transport, httpx.AsyncHTTPTransport)
+    assert transport._pool._max_connections == 3
+    assert mock_stardog_client.return_value.aclose.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_busy_slow_lane_does_not_block_fast_tools():
+    release = asyncio.Event()
+
+    async def slow_ask(**kwargs):
+        await release.wait()
+        return "answer"
+
+    handler = MagicMock()
+    handler.handle_voicebox_ask = AsyncMock(side_effect=slow_ask)
+    handler.handle_voicebox_settings = AsyncMock(return_value="settings")
+
+    with patch("stardog_cloud_mcp.server.StardogAsyncClient") as mock_stardog_client, \
+         patch("stardog_cloud_mcp.server.ToolHandler", return_value=handler):
+        mock_stardog_client.return_value.aclose = AsyncMock()
+        server = _lane_server(parse_lanes("slow=voicebox_ask:1::0.05"))
+        async with Client(server) as client:
+            first_ask = asyncio.create_task(client.call_tool("voicebox_ask", {"question": "q1"}))
+            while handler.handle_voicebox_ask.await_count == 0:
+                await asyncio.sleep(0.01)
+
+            settings = await client.call_tool("voicebox_settings", {})
+            assert settings.content[0].text == "settings"
+            with pytest.raises(ToolError, match="'slow' is busy"):
+                await client.call_tool("voicebox_ask", {"question": "q2"})
+
+            release.set()
+            assert (await first_ask).content[0].text == "answer"
@@ -0,0 +1,89 @@
+"""
+HTTP mode under concurrent load.
+
+The server runs in a subprocess against a local Stardog Cloud stub, while
+many MCP sessions call ``voicebox_ask`` at once over streamable HTTP. The
+benchmark compares the default event loop and HTTP parser with
+``--http_speedups`` (uvloop and httptools) and runs with ``make bench``; the
+smoke test checks that a server started with speedups answers tool calls.
+"""
+
+import asyncio
+import importlib.util
+
+import pytest
+from fastmcp import Client
+
+from conftest import _ignore_log
+
+LOAD_SESSIONS = 50
+CALLS_PER_SESSION = 4
+STREAM_EVENTS = 20
+
+SPEEDUPS_INSTALLED = all(
+    importlib.util.find_spec(name) is not None for name in ("uvloop", "httptools")
+)
+
+
+@pytest.fixture
+def upstream(loop, stub_upstream):
+    stub = stub_upstream(stream_events=STREAM_EVENTS)
+    loop.run_until_complete(stub.__aenter__())
+    yield stub
+    loop.run_until_complete(stub.__aexit__(None, None, None))
+
+
+@pytest.fixture
+def http_server(loop, upstream, spawn_http_server):
+    """
+    Start an HTTP mode server against the stub; returns it.
+    """
+
+    def _start(*options):
+        # The stub only answers while its event loop runs.
+        return loop.run_until_complete(spawn_http_server(upstream.url, *options))
+
+    return _start
+
+
+async def _load(url, sessions=LOAD_SESSIONS, calls=CALLS_PER_SESSION):
+    """
+    Open ``sessions`` concurrent MCP sessions, each asking ``calls`` questions.
+    """
+
+    async def session(index):
+        async with Client(url, log_handler=_ignore_log) as client:
+            for call in range(calls):
+                result = await client.call_tool(
+                    "voicebox_ask", {"question": f"load question {index}.{call}"}
+                )
+                assert "Final answer" in result.content[0].text
+
+    await asyncio.gather(*(session(index) for index in range(sessions)))
+
+
+@pytest.mark.skipif(not SPEEDUPS_INSTALLED, reason="requires the speedups extra")
+def test_http_speedups_server_answers_tool_calls(loop, http_server):
+    server = http_server("--http_speedups", "--log_format", "json")
+    loop.run_until_complete(_load(server.mcp_url, sessions=2, calls=2))
+    log = server.log_path.read_text()
+    assert "Serving with the uvloop event loop and the httptools HTTP parser" in log
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("pytest_benchmark") is None,
+    reason="requires pytest-benchmark",
+)
+@pytest.mark.benchmark(group="http_load")
+@pytest.mark.parametrize("speedups", [False, True], ids=["default", "speedups"])
+def test_bench_http_concurrent_asks(benchmark, request, loop, http_server, speedups):
+    if not request.config.option.benchmark_only:
+        pytest.skip("drives a server subprocess under load; runs with make bench")
+    if speedups and not SPEEDUPS_INSTALLED:
+        pytest.skip("requires the speedups extra")
+
+    url = http_server(*(["--http_speedups"] if speedups else [])).mcp_url
+    benchmark.pedantic(
+        lambda: loop.run_until_complete(_load(url)), rounds=3, warmup_rounds=1
+    )
+    benchmark.extra_info["tool_calls_per_round"] = LOAD_SESSIONS * CALLS_PER_SESSION
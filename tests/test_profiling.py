@@ -0,0 +1,218 @@
+import asyncio
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from stardog_cloud_mcp.constants import Headers
+from stardog_cloud_mcp.profiling import (
+    Profiler,
+    asyncio_tasks_report,
+    profiler,
+    tracemalloc_report,
+)
+from stardog_cloud_mcp.server import initialize_server, tool_logging
+
+ADMIN = {Headers.STARDOG_MCP_ADMIN_TOKEN: "admin-secret"}
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_attribute_is_a_noop_when_inactive():
+    p = Profiler()
+    with p.attribute("voicebox_ask"):
+        assert p._task_tools == {}
+    assert p._tool_calls == {}
+
+
+@pytest.mark.asyncio
+async def test_cprofile_capture_reports_tool_timings():
+    p = Profiler()
+    p.start("cprofile", 10)
+    with p.attribute("voicebox_ask"):
+        _busy(0.01)
+    report = p.stop()
+
+    assert not p.active
+    assert report.startswith("# cprofile profile")
+    assert "# voicebox_ask 1 " in report
+    assert "_busy" in report
+    # Stopping again returns the last report.
+    assert p.stop() == report
+
+
+@pytest.mark.asyncio
+async def test_sampling_capture_attributes_stacks_to_tools():
+    p = Profiler()
+    p.start("sample", 10)
+    with p.attribute("sparql_execute"):
+        _busy(0.1)
+    report = p.stop()
+
+    stacks = [line for line in report.splitlines() if not line.startswith("#")]
+    assert any(line.startswith("sparql_execute;") and "_busy" in line for line in stacks)
+
+
+@pytest.mark.asyncio
+async def test_capture_stops_after_its_duration():
+    p = Profiler()
+    p.start("sample", 0.1)
+    await asyncio.sleep(0.3)
+    assert not p.active
+    assert p.last_report.startswith("# sample profile")
+
+
+@pytest.mark.asyncio
+async def test_start_rejects_unknown_mode_and_overlapping_captures():
+    p = Profiler()
+    with pytest.raises(ValueError, match="Unknown profile mode"):
+        p.start("perf", 1)
+    p.start("cprofile", 1)
+    try:
+        with pytest.raises(RuntimeError, match="already running"):
+            p.start("sample", 1)
+    finally:
+        p.stop()
+
+
+@pytest.mark.asyncio
+async def test_tool_logging_attributes_calls_to_the_global_profiler():
+    @tool_logging("voicebox_settings")
+    async def tool():
+        await asyncio.sleep(0)
+        return "ok"
+
+    with patch("stardog_cloud_mcp.server.get_context", return_value=None):
+        profiler.start("cprofile", 10)
+        try:
+            assert await tool() == "ok"
+        finally:
+            report = profiler.stop()
+    assert "# voicebox_settings 1 " in report
+
+
+def test_tracemalloc_report_starts_tracing_then_snapshots():
+    was_tracing = tracemalloc.is_tracing()
+    tracemalloc.stop()
+    try:
+        assert "started" in tracemalloc_report(5)
+        data = [bytearray(1024) for _ in range(10)]
+        report = tracemalloc_report(5)
+        assert report.startswith("# traced current=")
+        assert len(report.splitlines()) <= 6
+        del data
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+@pytest.mark.asyncio
+async def test_asyncio_tasks_report_lists_pending_tasks():
+    async def idle():
+        await asyncio.sleep(10)
+
+    task = asyncio.create_task(idle(), name="idle-task")
+    await asyncio.sleep(0)
+    try:
+        names = {entry["name"]: entry for entry in asyncio_tasks_report()}
+        assert names["idle-task"]["coroutine"].endswith("idle")
+        assert names["idle-task"]["frame"] is not None
+    finally:
+        task.cancel()
+
+
+def _http_app(**kwargs):
+    with patch("fastmcp.FastMCP.run"):
+        server = initialize_server(
+            endpoint="http://test-endpoint",
+            api_token="test-token",
+            client_id="test-client",
+            auth_token_override=None,
+            mode="http",
+            port=8080,
+            **kwargs,
+        )
+    return server.http_app()
+
+
+def _client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_profiling_routes_are_disabled_without_admin_token():
+    async with _client(_http_app()) as client:
+        response = await client.get("/debug/tasks", headers=ADMIN)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_profiling_routes_require_the_admin_token():
+    async with _client(_http_app(admin_token="admin-secret")) as client:
+        missing = await client.get("/debug/tasks")
+        wrong = await client.get("/debug/tasks", headers={Headers.STARDOG_MCP_ADMIN_TOKEN: "nope"})
+        ok = await client.get("/debug/tasks", headers=ADMIN)
+    assert missing.status_code == 403
+    assert wrong.status_code == 403
+    assert ok.status_code == 200
+    assert isinstance(ok.json(), list)
+
+
+@pytest.mark.asyncio
+async def test_tracemalloc_route_starts_and_stops_tracing():
+    was_tracing = tracemalloc.is_tracing()
+    tracemalloc.stop()
+    try:
+        async with _client(_http_app(admin_token="admin-secret")) as client:
+            assert "started" in (await client.get("/debug/tracemalloc", headers=ADMIN)).text
+            assert tracemalloc.is_tracing()
+            forbidden = await client.delete("/debug/tracemalloc")
+            assert forbidden.status_code == 403
+            assert tracemalloc.is_tracing()
+
+            stopped = await client.delete("/debug/tracemalloc", headers=ADMIN)
+            assert stopped.json() == {"stopped": True}
+            assert not tracemalloc.is_tracing()
+            again = await client.delete("/debug/tracemalloc", headers=ADMIN)
+            assert again.json() == {"stopped": False}
+    finally:
+        if was_tracing:
+            tracemalloc.start()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("top", ["abc", "-1", "2.5"])
+async def test_tracemalloc_route_rejects_an_invalid_top(top):
+    async with _client(_http_app(admin_token="admin-secret")) as client:
+        response = await client.get(f"/debug/tracemalloc?top={top}", headers=ADMIN)
+    assert response.status_code == 400
+    assert response.json() == {"error": "top must be a non-negative integer"}
+
+
+@pytest.mark.asyncio
+async def test_profile_routes_capture_to_response_and_file(tmp_path):
+    app = _http_app(admin_token="admin-secret", profile_dir=str(tmp_path))
+    async with _client(app) as client:
+        bad = await client.post("/debug/profile/start?mode=perf", headers=ADMIN)
+        assert bad.status_code == 400
+
+        started = await client.post("/debug/profile/start?mode=cprofile&seconds=5", headers=ADMIN)
+        assert started.json() == {"mode": "cprofile", "seconds": 5.0}
+        busy = await client.post("/debug/profile/start?mode=sample", headers=ADMIN)
+        assert busy.status_code == 409
+
+        stopped = await client.post("/debug/profile/stop", headers=ADMIN)
+        assert stopped.text.startswith("# cprofile profile")
+
+        saved = await client.post("/debug/profile/stop?output=file", headers=ADMIN)
+        path = saved.json()["path"]
+    assert path.startswith(str(tmp_path))
+    with open(path, encoding="utf-8") as report:
+        assert report.read() == stopped.text
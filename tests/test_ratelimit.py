@@ -0,0 +1,111 @@
+import email.utils
+
+import httpx
+import pytest
+
+from stardog_cloud_mcp.client import AsyncClient
+from stardog_cloud_mcp.exceptions import StardogMCPRateLimitException
+from stardog_cloud_mcp.ratelimit import (
+    RateLimiter,
+    RateLimitTransport,
+    TokenBucket,
+    parse_retry_after,
+)
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [("3", 3.0), (" 1.5 ", 1.5), ("-4", 0.0), (None, 1.0), ("", 1.0), ("soon", 1.0)],
+)
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    retry_at = email.utils.formatdate(1_000_030, usegmt=True)
+    assert parse_retry_after(retry_at, now=1_000_000) == pytest.approx(30.0)
+
+
+def test_token_bucket_paces_after_burst():
+    bucket = TokenBucket(rate=2.0, burst=2.0)
+    now = bucket.updated
+    assert bucket.reserve(max_wait=10, now=now) == 0
+    assert bucket.reserve(max_wait=10, now=now) == 0
+    # Reservations queue up behind each other at 1/rate intervals.
+    assert bucket.reserve(max_wait=10, now=now) == pytest.approx(0.5)
+    assert bucket.reserve(max_wait=10, now=now) == pytest.approx(1.0)
+
+
+def test_token_bucket_fails_fast_beyond_max_wait():
+    bucket = TokenBucket(rate=1.0, burst=1.0)
+    now = bucket.updated
+    bucket.reserve(max_wait=0, now=now)
+    with pytest.raises(StardogMCPRateLimitException) as exc_info:
+        bucket.reserve(max_wait=0.5, now=now)
+    assert exc_info.value.retry_after == pytest.approx(1.0)
+    # The refused call did not consume a token.
+    assert bucket.reserve(max_wait=0, now=now + 1) == 0
+
+
+def test_token_bucket_block_honours_retry_after():
+    bucket = TokenBucket(rate=10.0, burst=10.0)
+    now = bucket.updated
+    bucket.block(retry_after=5, now=now)
+    assert bucket.reserve(max_wait=10, now=now) == pytest.approx(5.1)
+    assert bucket.reserve(max_wait=10, now=now + 6) == pytest.approx(0.0, abs=0.1)
+
+
+def test_rate_limiter_bounds_tracked_keys():
+    limiter = RateLimiter(rate=1.0, max_keys=2)
+    for key in ("a", "b", "c"):
+        limiter._bucket(key)
+    assert list(limiter._buckets) == ["b", "c"]
+
+
+def _transport(handler, **limiter_options):
+    limiter = RateLimiter(**{"rate": 100.0, **limiter_options})
+    return RateLimitTransport(httpx.MockTransport(handler), limiter), limiter
+
+
+@pytest.mark.asyncio
+async def test_transport_raises_retryable_error_on_429():
+    transport, limiter = _transport(
+        lambda request: httpx.Response(429, headers={"Retry-After": "7"})
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(StardogMCPRateLimitException) as exc_info:
+            await client.get("https://cloud.test/v1/app", headers={"Authorization": "Bearer a"})
+        assert exc_info.value.retry_after == 7.0
+
+        # The throttled key now fails fast instead of hitting the upstream again.
+        with pytest.raises(StardogMCPRateLimitException):
+            await client.get("https://cloud.test/v1/app", headers={"Authorization": "Bearer a"})
+    assert len(limiter._buckets) == 1
+
+
+@pytest.mark.asyncio
+async def test_transport_throttling_is_per_api_key():
+    def handler(request):
+        if request.headers["Authorization"] == "Bearer a":
+            return httpx.Response(429, headers={"Retry-After": "60"})
+        return httpx.Response(200, json={"ok": True})
+
+    transport, _ = _transport(handler)
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(StardogMCPRateLimitException):
+            await client.get("https://cloud.test/v1/app", headers={"Authorization": "Bearer a"})
+        response = await client.get("https://cloud.test/v1/app", headers={"Authorization": "Bearer b"})
+    assert response.json() == {"ok": True}
+
+
+@pytest.mark.asyncio
+async def test_async_client_uses_custom_transport():
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"name": "app", "database": "db"})
+    )
+    client = AsyncClient(base_url="https://cloud.test/api", timeout=5.0, transport=transport)
+    try:
+        settings = await client.voicebox_app("token", "client").async_settings()
+    finally:
+        await client.aclose()
+    assert settings.database == "db"
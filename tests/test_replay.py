@@ -0,0 +1,97 @@
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from stardog_cloud_mcp.client import AsyncClient
+from stardog_cloud_mcp.replay import RecordingTransport, ReplayTransport
+
+CONVERSATION_ID = "5f0c8f1e-6d6a-4f43-9b59-0c6a3c1f6a10"
+
+NDJSON_EVENTS = [
+    {"result": "", "conversation_id": CONVERSATION_ID, "message_id": "m1", "pending": True},
+    {"result": "Final answer", "conversation_id": CONVERSATION_ID, "message_id": "m1", "pending": False},
+]
+
+
+class _ChunkedStream(httpx.AsyncByteStream):
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def _upstream(request):
+    if request.url.path.endswith("/v1/app"):
+        return httpx.Response(200, json={"name": "app", "database": "flights"})
+    chunks = [(json.dumps(event) + "\n").encode() for event in NDJSON_EVENTS]
+    return httpx.Response(
+        200,
+        headers={"content-type": "application/x-ndjson", "set-cookie": "session=1"},
+        stream=_ChunkedStream(chunks),
+    )
+
+
+async def _ask(transport):
+    client = AsyncClient(base_url="https://cloud.test/api", transport=transport)
+    try:
+        app = client.voicebox_app("secret-token", "client")
+        settings = await app.async_settings()
+        async with app.async_stream_ask(question="What flights?") as stream:
+            answers = [answer async for answer in stream]
+    finally:
+        await client.aclose()
+    return settings, answers
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay(tmp_path):
+    recording = tmp_path / "upstream.jsonl"
+
+    await _ask(RecordingTransport(httpx.MockTransport(_upstream), str(recording)))
+
+    lines = [json.loads(line) for line in recording.read_text().splitlines()]
+    assert [line["path"] for line in lines] == ["/api/v1/app", "/api/v1/voicebox/stream/ask"]
+    assert len(lines[1]["chunks"]) == 2
+    assert lines[1]["headers"] == {"content-type": "application/x-ndjson"}
+    assert "secret-token" not in recording.read_text()
+
+    settings, answers = await _ask(ReplayTransport(str(recording), timing_scale=0))
+    assert settings.database == "flights"
+    assert [answer.pending for answer in answers] == [True, False]
+    assert answers[-1].content == "Final answer"
+
+
+@pytest.mark.asyncio
+async def test_replay_scales_recorded_timing(tmp_path):
+    recording = tmp_path / "upstream.jsonl"
+    exchange = {
+        "method": "POST",
+        "path": "/api/v1/voicebox/stream/ask",
+        "body": "",
+        "status": 200,
+        "headers": {},
+        "latency": 0.5,
+        "chunks": [[0.0, "YQ=="], [2.0, "Yg=="]],
+    }
+    recording.write_text(json.dumps(exchange) + "\n")
+    transport = ReplayTransport(str(recording), timing_scale=0.5)
+
+    with patch("stardog_cloud_mcp.replay.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.post("https://cloud.test/api/v1/voicebox/stream/ask", content=b"{}")
+
+    assert response.content == b"ab"
+    assert [call.args[0] for call in mock_sleep.await_args_list] == [0.25, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_replay_unknown_request(tmp_path):
+    recording = tmp_path / "upstream.jsonl"
+    recording.write_text("")
+    async with httpx.AsyncClient(transport=ReplayTransport(str(recording))) as client:
+        response = await client.get("https://cloud.test/api/v1/app")
+    assert response.status_code == 501
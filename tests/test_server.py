@@ -6,8 +6,17 @@ from unittest.mock import patch, AsyncMock, MagicMock
 import pytest
 from fastmcp import Client
 
-from stardog_cloud_mcp.constants import Headers
-from stardog_cloud_mcp.server import initialize_server, resolve_params
+from stardog_cloud_mcp.constants import TOOL_NAMES, Headers
+from stardog_cloud_mcp.ratelimit import RateLimitTransport
+from stardog_cloud_mcp.replay import RecordingTransport, ReplayTransport
+from stardog_cloud_mcp.server import (
+    Credentials,
+    initialize_server,
+    main,
+    parse_warmup_apps,
+    resolve_credentials,
+    resolve_params,
+)
 
 
 @pytest.fixture
@@ -95,7 +104,7 @@ async def test_voicebox_settings_missing_token(mock_run, monkeypatch):
 @patch('stardog_cloud_mcp.server.ToolHandler')
 @pytest.mark.asyncio
 async def test_voicebox_settings_with_header(mock_tool_handler, mock_stardog_client, mock_run, monkeypatch):
-    monkeypatch.setattr("stardog_cloud_mcp.server.get_http_headers", lambda: {Headers.STARDOG_CLOUD_API_KEY: "header-token"})
+    monkeypatch.setattr("stardog_cloud_mcp.server.get_http_headers", lambda **kwargs: {Headers.STARDOG_CLOUD_API_KEY: "header-token"})
     mock_run.return_value = None
     mock_stardog_client.return_value.aclose = AsyncMock()
     mock_handler_instance = mock_tool_handler.return_value
@@ -111,6 +120,7 @@ async def test_voicebox_settings_with_header(mock_tool_handler, mock_stardog_cli
     async with Client(server_instance) as client:
         result = await client.call_tool("voicebox_settings", {})
         assert "Voicebox App Settings" in result.data
+    mock_handler_instance.handle_voicebox_settings.assert_awaited_once_with("header-token", "test-client")
 
 @pytest.mark.asyncio
 async def test_resolve_headers_header_only(monkeypatch):
@@ -187,6 +197,30 @@ def test_main_entrypoint(mock_init):
     assert result.returncode == 0
 
 
+@pytest.mark.parametrize(
+    "env, raw_answers, http_speedups",
+    [
+        ({}, False, False),
+        ({"SDC_RAW_ANSWERS": "1"}, True, False),
+        ({"SDC_HTTP_SPEEDUPS": "true"}, False, True),
+        ({"SDC_RAW_ANSWERS": "yes", "SDC_HTTP_SPEEDUPS": "1"}, True, True),
+    ],
+)
+@patch('stardog_cloud_mcp.server.initialize_server', return_value=None)
+def test_main_boolean_env_vars(mock_init, monkeypatch, env, raw_answers, http_speedups):
+    monkeypatch.delenv("SDC_RAW_ANSWERS", raising=False)
+    monkeypatch.delenv("SDC_HTTP_SPEEDUPS", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setattr(sys, "argv", ["stardog-cloud-mcp", "--token", "dummy-token"])
+
+    main()
+
+    *_, parsed_raw_answers, parsed_http_speedups = mock_init.call_args.args
+    assert parsed_raw_answers is raw_answers
+    assert parsed_http_speedups is http_speedups
+
+
 @pytest.mark.asyncio
 async def test_resolve_headers_required_missing():
     with pytest.raises(ValueError, match="API token is required"):
@@ -416,3 +450,282 @@ async def test_handler_requires_active_request_context(mcp_server, missing):
 
     assert "No FastMCP request context" in str(exc_info.value)
 
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (None, []),
+        ("", []),
+        ("tok-1", [("tok-1", None)]),
+        ("tok-1:client-1, tok-2", [("tok-1", "client-1"), ("tok-2", None)]),
+        (" , tok-3:", [("tok-3", None)]),
+    ],
+)
+def test_parse_warmup_apps(value, expected):
+    assert parse_warmup_apps(value) == expected
+
+
+@patch('fastmcp.FastMCP.run')
+@patch('stardog_cloud_mcp.server.StardogAsyncClient')
+@patch('stardog_cloud_mcp.server.ToolHandler')
+@pytest.mark.asyncio
+async def test_lifespan_warms_up_configured_apps(mock_tool_handler, mock_stardog_client, mock_run):
+    mock_run.return_value = None
+    mock_stardog_client.return_value.aclose = AsyncMock()
+    mock_tool_handler.return_value.warm_up = AsyncMock()
+
+    server = initialize_server(
+        endpoint="http://test-endpoint",
+        api_token="test-token",
+        client_id="test-client",
+        auth_token_override=None,
+        mode="stdio",
+        port=7000,
+        warmup_apps=[("tok-1", "client-1"), ("tok-2", None)],
+    )
+
+    async with Client(server):
+        pass
+
+    # Entries without a client_id fall back to the server-wide one.
+    mock_tool_handler.return_value.warm_up.assert_awaited_once_with(
+        [("tok-1", "client-1"), ("tok-2", "test-client")]
+    )
+
+
+@patch('fastmcp.FastMCP.run')
+@pytest.mark.asyncio
+async def test_sparql_execute_registered_only_with_stardog_endpoint(mock_run):
+    mock_run.return_value = None
+    kwargs = dict(
+        endpoint="http://test-endpoint",
+        api_token="test-token",
+        client_id="test-client",
+        auth_token_override=None,
+        mode="stdio",
+        port=7000,
+    )
+
+    server = initialize_server(**kwargs)
+    tool_names = {tool.name for tool in await server.list_tools()}
+    assert "sparql_execute" not in tool_names
+    assert "voicebox_generate_and_execute" not in tool_names
+
+    server = initialize_server(**kwargs, stardog_endpoint="http://stardog:5820")
+    tool_names = {tool.name for tool in await server.list_tools()}
+    assert "sparql_execute" in tool_names
+    assert "voicebox_generate_and_execute" in tool_names
+    # Execution lanes are validated against the full list.
+    assert tool_names == set(TOOL_NAMES)
+
+
+@patch('fastmcp.FastMCP.run')
+@patch('stardog_cloud_mcp.server.StardogAsyncClient')
+@patch('stardog_cloud_mcp.server.ToolHandler')
+@pytest.mark.asyncio
+async def test_sparql_execute_tool(mock_tool_handler, mock_stardog_client, mock_run):
+    mock_run.return_value = None
+    mock_stardog_client.return_value.aclose = AsyncMock()
+    mock_handler_instance = mock_tool_handler.return_value
+    mock_handler_instance.handle_sparql_execute = AsyncMock(return_value='{"rows": []}')
+
+    server = initialize_server(
+        endpoint="http://test-endpoint",
+        api_token="test-token",
+        client_id="test-client",
+        auth_token_override="sso-token",
+        mode="stdio",
+        port=7000,
+        stardog_endpoint="http://stardog:5820",
+    )
+
+    async with Client(server) as client:
+        result = await client.call_tool(
+            "sparql_execute", {"query": "SELECT * {}", "cursor": "  ", "page_size": 10}
+        )
+
+    assert result.data == '{"rows": []}'
+    mock_handler_instance.handle_sparql_execute.assert_awaited_once_with(
+        api_token="test-token",
+        client_id="test-client",
+        query="SELECT * {}",
+        cursor=None,
+        page_size=10,
+        stardog_auth_token_override="sso-token",
+    )
+
+
+@patch('fastmcp.FastMCP.run')
+@patch('stardog_cloud_mcp.server.StardogAsyncClient')
+@patch('stardog_cloud_mcp.server.ToolHandler')
+@pytest.mark.asyncio
+async def test_voicebox_generate_and_execute_tool(mock_tool_handler, mock_stardog_client, mock_run):
+    mock_run.return_value = None
+    mock_stardog_client.return_value.aclose = AsyncMock()
+    mock_handler_instance = mock_tool_handler.return_value
+    mock_handler_instance.handle_voicebox_generate_and_execute = AsyncMock(
+        return_value='{"sparql_query": "SELECT * {}", "results": {"rows": []}}'
+    )
+
+    server = initialize_server(
+        endpoint="http://test-endpoint",
+        api_token="test-token",
+        client_id="test-client",
+        auth_token_override=None,
+        mode="stdio",
+        port=7000,
+        stardog_endpoint="http://stardog:5820",
+    )
+
+    async with Client(server) as client:
+        result = await client.call_tool(
+            "voicebox_generate_and_execute", {"question": "Show me all flights"}
+        )
+
+    assert "SELECT" in result.data
+    mock_handler_instance.handle_voicebox_generate_and_execute.assert_awaited_once_with(
+        api_token="test-token",
+        client_id="test-client",
+        question="Show me all flights",
+        conversation_id=None,
+        stardog_auth_token_override=None,
+        page_size=None,
+    )
+
+
+@patch('fastmcp.FastMCP.run')
+@patch('stardog_cloud_mcp.server.StardogAsyncClient')
+@pytest.mark.asyncio
+async def test_initialize_server_rate_limit_installs_transport(mock_stardog_client, mock_run):
+    mock_run.return_value = None
+    mock_stardog_client.return_value.aclose = AsyncMock()
+
+    server = initialize_server(
+        endpoint="http://test-endpoint",
+        api_token="test-token",
+        client_id="test-client",
+        auth_token_override=None,
+        mode="stdio",
+        port=7000,
+        rate_limit=5.0,
+        rate_limit_max_wait=2.0,
+    )
+
+    async with Client(server):
+        pass
+
+    _, kwargs = mock_stardog_client.call_args
+    transport = kwargs["transport"]
+    assert isinstance(transport, RateLimitTransport)
+    assert transport.limiter.rate == 5.0
+    assert transport.limiter.burst == 5.0
+    assert transport.limiter.max_wait == 2.0
+
+
+def _stripping_headers(calls):
+    # Like fastmcp's get_http_headers: Authorization is only returned when
+    # asked for explicitly.
+    def fake_headers(include_all=False, include=None):
+        calls.append(include)
+        headers = {"X-SDC-Client-ID": "header-client"}
+        if include_all or (include and "authorization" in include):
+            headers["Authorization"] = "Bearer gateway-token"
+        return headers
+
+    return fake_headers
+
+
+def test_resolve_credentials_scans_headers_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr("stardog_cloud_mcp.server.get_http_headers", _stripping_headers(calls))
+    credentials = resolve_credentials("arg-token", "arg-client", "arg-auth")
+
+    # An Authorization header meant for a gateway or an MCP OAuth client
+    # never replaces the operator's token.
+    assert credentials == Credentials(
+        api_token="arg-token",
+        client_id="header-client",
+        auth_token_override="arg-auth",
+    )
+    assert calls == [None]
+
+
+@pytest.mark.asyncio
+async def test_resolve_credentials_agrees_with_resolve_params(monkeypatch):
+    monkeypatch.setattr("stardog_cloud_mcp.server.get_http_headers", _stripping_headers([]))
+    with pytest.raises(ValueError, match="API token is required"):
+        resolve_credentials(None, None, None)
+    with pytest.raises(ValueError, match="API token is required"):
+        await resolve_params(
+            Headers.STARDOG_CLOUD_API_KEY, None, required=True, error_message="API token is required"
+        )
+
+
+def test_resolve_credentials_requires_token(monkeypatch):
+    monkeypatch.setattr("stardog_cloud_mcp.server.get_http_headers", lambda **kwargs: {})
+    with pytest.raises(ValueError, match="API token is required"):
+        resolve_credentials(None, "arg-client", None)
+
+
+@patch('fastmcp.FastMCP.run')
+@patch('stardog_cloud_mcp.server.StardogAsyncClient')
+@patch('stardog_cloud_mcp.server.ToolHandler')
+@pytest.mark.asyncio
+async def test_credentials_resolved_once_per_tool_call(
+    mock_tool_handler, mock_stardog_client, mock_run, monkeypatch
+):
+    mock_run.return_value = None
+    mock_stardog_client.return_value.aclose = AsyncMock()
+    mock_tool_handler.return_value.handle_voicebox_ask = AsyncMock(return_value="Answer")
+    calls = []
+
+    def fake_headers(**kwargs):
+        calls.append(kwargs)
+        return {"x-sdc-api-key": "header-token"}
+
+    monkeypatch.setattr("stardog_cloud_mcp.server.get_http_headers", fake_headers)
+    server = initialize_server(
+        endpoint="http://test-endpoint",
+        api_token="arg-token",
+        client_id="test-client",
+        auth_token_override=None,
+        mode="stdio",
+        port=7000,
+    )
+
+    async with Client(server) as client:
+        await client.call_tool("voicebox_ask", {"question": "What is the flight plan?"})
+
+    assert len(calls) == 1
+    assert mock_tool_handler.return_value.handle_voicebox_ask.await_args.kwargs["api_token"] == "header-token"
+
+
+@patch('fastmcp.FastMCP.run')
+@patch('stardog_cloud_mcp.server.StardogAsyncClient')
+@pytest.mark.asyncio
+async def test_initialize_server_replay_and_record_transports(mock_stardog_client, mock_run, tmp_path):
+    mock_run.return_value = None
+    mock_stardog_client.return_value.aclose = AsyncMock()
+    replay_file = tmp_path / "in.jsonl"
+    replay_file.write_text("")
+
+    server = initialize_server(
+        endpoint="http://test-endpoint",
+        api_token="test-token",
+        client_id="test-client",
+        auth_token_override=None,
+        mode="stdio",
+        port=7000,
+        record_upstream=str(tmp_path / "out.jsonl"),
+        replay_upstream=str(replay_file),
+        replay_timing_scale=0.0,
+    )
+
+    async with Client(server):
+        pass
+
+    transport = mock_stardog_client.call_args.kwargs["transport"]
+    assert isinstance(transport, RecordingTransport)
+    assert isinstance(transport.transport, ReplayTransport)
+    assert transport.transport.timing_scale == 0.0
@@ -0,0 +1,183 @@
+"""
+Memory soak tests for long-lived servers.
+
+These run an HTTP mode server in a subprocess, as it is deployed, against a
+local HTTP stub of Stardog Cloud, drive thousands of MCP sessions and long
+streaming asks through it, and fail when the server's RSS, traced Python
+memory, open file descriptors or asyncio tasks keep growing. The server is
+measured through ``/proc`` and its admin-only ``/debug/`` routes.
+
+They are skipped unless SDC_SOAK_CYCLES is set (``make soak``). Thresholds can
+be tuned with SDC_SOAK_MAX_RSS_GROWTH_MB, SDC_SOAK_MAX_TRACED_GROWTH_MB,
+SDC_SOAK_MAX_FD_GROWTH and SDC_SOAK_MAX_TASK_GROWTH.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+import pytest
+from fastmcp import Client
+
+from stardog_cloud_mcp.constants import Headers
+
+from conftest import _ignore_log
+
+CYCLES = int(os.getenv("SDC_SOAK_CYCLES", "0"))
+MAX_RSS_GROWTH = float(os.getenv("SDC_SOAK_MAX_RSS_GROWTH_MB", "32")) * 2**20
+MAX_TRACED_GROWTH = float(os.getenv("SDC_SOAK_MAX_TRACED_GROWTH_MB", "8")) * 2**20
+MAX_FD_GROWTH = int(os.getenv("SDC_SOAK_MAX_FD_GROWTH", "8"))
+MAX_TASK_GROWTH = int(os.getenv("SDC_SOAK_MAX_TASK_GROWTH", "2"))
+# Growth is measured from the end of the warm-up, so one-off allocations
+# (imports, caches, pools) do not count as leaks.
+WARMUP_FRACTION = 0.1
+SAMPLES = 20
+STREAM_EVENTS = 200
+ADMIN_TOKEN = "soak-admin"
+TOP_ALLOCATORS = 10
+
+pytestmark = pytest.mark.skipif(
+    CYCLES <= 0, reason="soak tests only run when SDC_SOAK_CYCLES is set"
+)
+
+
+@dataclass
+class Sample:
+    cycle: int
+    rss: Optional[int]
+    traced: int
+    fds: Optional[int]
+    tasks: int
+
+    def __str__(self):
+        rss = f"{self.rss / 2**20:.1f}MB" if self.rss is not None else "n/a"
+        return (
+            f"cycle={self.cycle} rss={rss} traced={self.traced / 2**20:.2f}MB "
+            f"fds={self.fds} tasks={self.tasks}"
+        )
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _open_fds(pid: int) -> Optional[int]:
+    try:
+        return len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        return None
+
+
+class MemoryTracker:
+    """
+    Samples a server's resource usage over a soak run and checks growth
+    after warm-up.
+    """
+
+    def __init__(self, server, cycles: int):
+        self.server = server
+        self.cycles = cycles
+        self.warmup = max(1, int(cycles * WARMUP_FRACTION))
+        self.every = max(1, cycles // SAMPLES)
+        self.samples: list[Sample] = []
+        self._debug: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self):
+        self._debug = httpx.AsyncClient(
+            base_url=self.server.base_url,
+            headers={Headers.STARDOG_MCP_ADMIN_TOKEN: ADMIN_TOKEN},
+        )
+        # The first request starts tracemalloc in the server.
+        await self._tracemalloc_report()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._debug.aclose()
+
+    async def _tracemalloc_report(self, top: int = 0) -> str:
+        response = await self._debug.get("/debug/tracemalloc", params={"top": top})
+        response.raise_for_status()
+        return response.text
+
+    async def sample(self, cycle: int) -> None:
+        if cycle != self.warmup and cycle % self.every and cycle != self.cycles:
+            return
+        assert self.server.process.poll() is None, "server exited during the soak"
+        # "# traced current=<bytes> peak=<bytes> bytes"
+        header = (await self._tracemalloc_report()).splitlines()[0]
+        tasks = (await self._debug.get("/debug/tasks")).json()
+        pid = self.server.process.pid
+        self.samples.append(
+            Sample(
+                cycle=cycle,
+                rss=_rss_bytes(pid),
+                traced=int(header.split("current=")[1].split()[0]),
+                fds=_open_fds(pid),
+                tasks=len(tasks),
+            )
+        )
+
+    async def assert_no_growth(self) -> None:
+        start = next(s for s in self.samples if s.cycle == self.warmup)
+        end = self.samples[-1]
+        report = "\n".join(str(sample) for sample in self.samples)
+        print(f"\n{report}")
+
+        problems = []
+        if start.rss is not None and end.rss is not None and end.rss - start.rss > MAX_RSS_GROWTH:
+            problems.append(f"RSS grew {(end.rss - start.rss) / 2**20:.1f}MB")
+        if end.traced - start.traced > MAX_TRACED_GROWTH:
+            problems.append(f"traced memory grew {(end.traced - start.traced) / 2**20:.2f}MB")
+        if start.fds is not None and end.fds is not None and end.fds - start.fds > MAX_FD_GROWTH:
+            problems.append(f"open file descriptors grew by {end.fds - start.fds}")
+        if end.tasks - start.tasks > MAX_TASK_GROWTH:
+            problems.append(f"asyncio tasks grew by {end.tasks - start.tasks}")
+
+        if problems:
+            allocators = await self._tracemalloc_report(TOP_ALLOCATORS)
+            pytest.fail(
+                "; ".join(problems)
+                + f"\n\nSamples:\n{report}\n\nTop allocators in the server:\n{allocators}"
+            )
+
+
+@pytest.fixture
+def soak_server(spawn_http_server):
+    async def _start(endpoint):
+        return await spawn_http_server(endpoint, "--admin_token", ADMIN_TOKEN)
+
+    return _start
+
+
+@pytest.mark.asyncio
+async def test_soak_session_open_call_close(soak_server, stub_upstream):
+    async with stub_upstream(STREAM_EVENTS) as upstream:
+        server = await soak_server(upstream.url)
+        async with MemoryTracker(server, CYCLES) as tracker:
+            for cycle in range(1, CYCLES + 1):
+                async with Client(server.mcp_url, log_handler=_ignore_log) as client:
+                    result = await client.call_tool("voicebox_settings", {})
+                    assert "stub-db" in result.content[0].text
+                await tracker.sample(cycle)
+            await tracker.assert_no_growth()
+
+
+@pytest.mark.asyncio
+async def test_soak_long_streaming_asks(soak_server, stub_upstream):
+    asks = max(1, CYCLES // 10)
+    async with stub_upstream(STREAM_EVENTS) as upstream:
+        server = await soak_server(upstream.url)
+        async with Client(server.mcp_url, log_handler=_ignore_log) as client:
+            async with MemoryTracker(server, asks) as tracker:
+                for cycle in range(1, asks + 1):
+                    result = await client.call_tool(
+                        "voicebox_ask", {"question": f"soak question {cycle}"}
+                    )
+                    assert "Final answer" in result.content[0].text
+                    await tracker.sample(cycle)
+                await tracker.assert_no_growth()
@@ -0,0 +1,135 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from stardog_cloud_mcp.sparql import (
+    BearerAuth,
+    SparqlExecutor,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def _select_result(n_rows, offset=0):
+    return {
+        "head": {"vars": ["flight", "plan"]},
+        "results": {
+            "bindings": [
+                {
+                    "flight": {"type": "uri", "value": f"urn:flight:{offset + i}"},
+                    **({"plan": {"type": "literal", "value": "p"}} if i % 2 == 0 else {}),
+                }
+                for i in range(n_rows)
+            ]
+        },
+    }
+
+
+def test_cursor_round_trip():
+    query = "SELECT * WHERE { ?s ?p ?o }"
+    assert decode_cursor(query, encode_cursor(query, 200)) == 200
+    assert decode_cursor(query, None) == 0
+    assert decode_cursor(query, "") == 0
+
+
+def test_cursor_rejects_other_query():
+    cursor = encode_cursor("SELECT * WHERE { ?s ?p ?o }", 100)
+    with pytest.raises(ValueError, match="does not belong"):
+        decode_cursor("ASK { ?s ?p ?o }", cursor)
+
+
+def test_cursor_rejects_garbage():
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor("SELECT * WHERE { ?s ?p ?o }", "not-a-cursor")
+
+
+def test_bearer_auth_sets_header():
+    request = MagicMock(headers={})
+    BearerAuth("sso-token")(request)
+    assert request.headers["Authorization"] == "Bearer sso-token"
+
+
+@pytest.mark.asyncio
+async def test_execute_pages_with_cursor():
+    executor = SparqlExecutor(endpoint="http://stardog:5820")
+    query = "SELECT * WHERE { ?flight ?p ?plan }"
+    with patch.object(executor, "_select", return_value=_select_result(3)) as mock_select:
+        page = await executor.execute("flights", query, page_size=2)
+
+    # Fetches one row past the page to detect whether more rows exist.
+    mock_select.assert_called_once_with("flights", query, None, 3, 0, None, None)
+    assert page.columns == ["flight", "plan"]
+    assert page.rows == [["urn:flight:0", "p"], ["urn:flight:1", None]]
+    assert page.truncated is False
+    assert decode_cursor(query, page.next_cursor) == 2
+
+    with patch.object(executor, "_select", return_value=_select_result(1, offset=2)) as mock_select:
+        page = await executor.execute("flights", query, cursor=page.next_cursor, page_size=2)
+
+    mock_select.assert_called_once_with("flights", query, None, 3, 2, None, None)
+    assert page.rows == [["urn:flight:2", "p"]]
+    assert page.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_execute_enforces_max_rows():
+    executor = SparqlExecutor(endpoint="http://stardog:5820", max_rows=3)
+    query = "SELECT * WHERE { ?flight ?p ?plan }"
+    with patch.object(executor, "_select", return_value=_select_result(2, offset=2)) as mock_select:
+        page = await executor.execute("flights", query, cursor=encode_cursor(query, 2), page_size=10)
+
+    mock_select.assert_called_once_with("flights", query, None, 2, 2, None, None)
+    assert len(page.rows) == 1
+    assert page.truncated is True
+    assert page.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_execute_clamps_page_size(monkeypatch):
+    monkeypatch.setattr("stardog_cloud_mcp.sparql.MAX_SPARQL_PAGE_SIZE", 5)
+    executor = SparqlExecutor(endpoint="http://stardog:5820")
+    with patch.object(executor, "_select", return_value=_select_result(0)) as mock_select:
+        await executor.execute("flights", "SELECT * {}", page_size=1000)
+    assert mock_select.call_args.args[3] == 6
+
+
+@pytest.mark.asyncio
+async def test_execute_ask_query():
+    executor = SparqlExecutor(endpoint="http://stardog:5820")
+    with patch.object(executor, "_select", return_value={"head": {}, "boolean": True}):
+        page = await executor.execute("flights", "ASK { ?s ?p ?o }", auth_token="sso")
+    assert page.to_dict() == {"boolean": True}
+
+
+def test_select_uses_bearer_auth_for_token_override():
+    executor = SparqlExecutor(endpoint="http://stardog:5820", username="admin", password="admin")
+    with patch("stardog_cloud_mcp.sparql.stardog.Connection") as mock_connection:
+        conn = mock_connection.return_value
+        conn.select.return_value = {"boolean": False}
+        executor._select("flights", "ASK {}", "sso-token", 11, 0, True, ["urn:graph:flights"])
+
+    _, kwargs = mock_connection.call_args
+    assert isinstance(kwargs["auth"], BearerAuth)
+    assert conn.select.call_args.kwargs["timeout"] == 60000
+    assert conn.select.call_args.kwargs["reasoning"] is True
+    # Only the Voicebox app's graphs are queried.
+    assert conn.select.call_args.kwargs["default_graph_uri"] == ["urn:graph:flights"]
+
+
+def test_select_without_credentials_does_not_log_in_as_admin():
+    executor = SparqlExecutor(endpoint="http://stardog:5820")
+    with patch("stardog_cloud_mcp.sparql.stardog.Connection") as mock_connection:
+        with pytest.raises(PermissionError, match="No Stardog credentials"):
+            executor._select("flights", "ASK {}", None, 11, 0, None, None)
+    mock_connection.assert_not_called()
+
+
+def test_connections_share_one_pool_but_not_their_auth():
+    executor = SparqlExecutor(endpoint="http://stardog:5820", username="reader", password="secret")
+    basic = executor._connection("flights", None).client.session
+    bearer = executor._connection("flights", "sso-token").client.session
+
+    assert basic.get_adapter("http://stardog:5820") is executor._adapter
+    assert bearer.get_adapter("https://stardog:5820") is executor._adapter
+    assert basic.auth.username == "reader"
+    assert isinstance(bearer.auth, BearerAuth)
@@ -0,0 +1,73 @@
+import logging
+from unittest.mock import patch
+
+from stardog_cloud_mcp.server import initialize_server
+from stardog_cloud_mcp.speedups import http_speedup_options
+
+
+def _installed(installed):
+    def find_spec(name):
+        return object() if name in installed else None
+
+    return patch("stardog_cloud_mcp.speedups.importlib.util.find_spec", find_spec)
+
+
+def test_speedup_options_when_installed():
+    with _installed({"uvloop", "httptools"}):
+        assert http_speedup_options() == ({"http": "httptools"}, {"use_uvloop": True})
+
+
+def test_speedup_options_fall_back_to_defaults(caplog):
+    with _installed(set()), caplog.at_level(logging.WARNING, logger="stardog_cloud_mcp"):
+        assert http_speedup_options() == ({}, {})
+    assert "uvloop is not installed" in caplog.text
+    assert "httptools is not installed" in caplog.text
+
+
+@patch("stardog_cloud_mcp.server.anyio.run")
+@patch("fastmcp.FastMCP.run")
+def test_initialize_server_http_speedups(mock_run, mock_anyio_run):
+    with _installed({"uvloop", "httptools"}):
+        server = initialize_server(
+            endpoint="http://test-endpoint",
+            api_token="test-token",
+            client_id="test-client",
+            auth_token_override=None,
+            mode="http",
+            port=8080,
+            http_speedups=True,
+        )
+
+    mock_run.assert_not_called()
+    run_async, = mock_anyio_run.call_args.args
+    assert run_async.func == server.run_async
+    assert run_async.keywords == {
+        "transport": "streamable-http",
+        "host": "0.0.0.0",
+        "port": 8080,
+        "uvicorn_config": {"http": "httptools"},
+    }
+    assert mock_anyio_run.call_args.kwargs == {"backend_options": {"use_uvloop": True}}
+
+
+@patch("stardog_cloud_mcp.server.anyio.run")
+@patch("fastmcp.FastMCP.run")
+def test_initialize_server_http_speedups_without_uvloop(mock_run, mock_anyio_run):
+    with _installed({"httptools"}):
+        initialize_server(
+            endpoint="http://test-endpoint",
+            api_token="test-token",
+            client_id="test-client",
+            auth_token_override=None,
+            mode="http",
+            port=8080,
+            http_speedups=True,
+        )
+
+    mock_anyio_run.assert_not_called()
+    mock_run.assert_called_once_with(
+        transport="streamable-http",
+        host="0.0.0.0",
+        port=8080,
+        uvicorn_config={"http": "httptools"},
+    )
@@ -0,0 +1,97 @@
+"""
+Cold start of the stdio server, as spawned by desktop MCP clients.
+
+The guard test checks, with ``python -X importtime``, that HTTP-only modules
+and the upstream HTTP stack are not imported before the server answers
+``initialize``. The benchmark measures time to that first response and runs
+with ``make bench``, next to the microbenchmarks.
+"""
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-test", "version": "1.0"},
+    },
+}
+
+# Modules that are only needed in HTTP mode, or once a tool calls Stardog
+# Cloud (httpcore backs the upstream connection pool).
+DEFERRED_MODULES = {
+    "stardog_cloud_mcp.compression",
+    "stardog_cloud_mcp.health",
+    "httpcore",
+}
+
+
+def _first_response(stderr_path, *python_options):
+    """
+    Start the stdio server, send ``initialize`` and wait for the reply.
+
+    Returns:
+        (seconds until the reply, the reply)
+    """
+    env = {**os.environ, "FASTMCP_CHECK_FOR_UPDATES": "off"}
+    started = time.perf_counter()
+    with open(stderr_path, "wb") as stderr:
+        process = subprocess.Popen(
+            [sys.executable, *python_options, "-m", "stardog_cloud_mcp.server",
+             "--mode", "stdio", "--token", "startup-token"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            env=env,
+        )
+        try:
+            process.stdin.write(json.dumps(INITIALIZE).encode() + b"\n")
+            process.stdin.flush()
+            line = process.stdout.readline()
+            elapsed = time.perf_counter() - started
+        finally:
+            process.kill()
+            process.communicate()
+    return elapsed, json.loads(line)
+
+
+def test_stdio_server_defers_http_and_upstream_modules(tmp_path):
+    stderr_path = tmp_path / "importtime.txt"
+    _, response = _first_response(stderr_path, "-X", "importtime")
+
+    assert response["id"] == 1
+    assert response["result"]["serverInfo"]["name"] == "stardog-cloud-mcp"
+    imported = {
+        line.split("|")[-1].strip()
+        for line in stderr_path.read_text(errors="replace").splitlines()
+        if line.startswith("import time:")
+    }
+    assert "stardog_cloud_mcp.tools" in imported
+    assert imported & DEFERRED_MODULES == set()
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("pytest_benchmark") is None,
+    reason="requires pytest-benchmark",
+)
+@pytest.mark.benchmark(group="startup")
+def test_bench_stdio_time_to_first_response(benchmark, request, tmp_path):
+    if not request.config.option.benchmark_only:
+        pytest.skip("starts the server several times; runs with make bench")
+
+    def start():
+        elapsed, response = _first_response(tmp_path / "stderr.txt")
+        assert response["id"] == 1
+        return elapsed
+
+    benchmark.pedantic(start, rounds=5, iterations=1, warmup_rounds=1)
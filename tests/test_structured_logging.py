@@ -0,0 +1,197 @@
+import io
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+from stardog_cloud_mcp.bindings import token_fingerprint
+from stardog_cloud_mcp.server import initialize_server
+from stardog_cloud_mcp.structured_logging import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    SuccessSamplingFilter,
+    configure_structured_logging,
+    log_tool_call,
+    shutdown_structured_logging,
+)
+
+logger = logging.getLogger("stardog_cloud_mcp")
+
+
+def _record(level=logging.INFO, msg="message", **extra):
+    record = logger.makeRecord(logger.name, level, __file__, 1, msg, (), None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def _lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+@pytest.fixture
+def json_logs():
+    stream = io.StringIO()
+    configure_structured_logging(stream=stream)
+    try:
+        yield stream
+    finally:
+        shutdown_structured_logging()
+
+
+def test_json_formatter_includes_structured_fields():
+    record = _record(msg="Tool voicebox_ask succeeded", tool="voicebox_ask", latency_ms=12.5, tenant="abc", outcome="success")
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "stardog_cloud_mcp"
+    assert entry["message"] == "Tool voicebox_ask succeeded"
+    assert entry["tool"] == "voicebox_ask"
+    assert entry["latency_ms"] == 12.5
+    assert entry["tenant"] == "abc"
+    assert entry["outcome"] == "success"
+    assert "exception" not in entry
+
+
+def test_success_sampling_never_drops_errors_or_other_records():
+    never = SuccessSamplingFilter(0.0)
+    assert not never.filter(_record(outcome="success"))
+    assert never.filter(_record(logging.ERROR, outcome="error"))
+    assert never.filter(_record(logging.WARNING))
+    assert never.filter(_record())
+    assert SuccessSamplingFilter(1.0).filter(_record(outcome="success"))
+
+
+def test_queue_handler_drops_only_below_error_when_backlogged():
+    log_queue = queue.Queue()
+    handler = NonBlockingQueueHandler(log_queue, max_pending=2)
+    for _ in range(4):
+        handler.handle(_record())
+    handler.handle(_record(logging.ERROR, msg="boom"))
+    assert handler.dropped == 2
+    assert log_queue.qsize() == 3
+
+    # Once the backlog clears, the drop count is reported first.
+    while not log_queue.empty():
+        log_queue.get_nowait()
+    handler.handle(_record(msg="after"))
+    dropped, after = log_queue.get_nowait(), log_queue.get_nowait()
+    assert dropped.levelno == logging.WARNING
+    assert dropped.getMessage() == "Dropped 2 log record(s) under back-pressure"
+    assert after.getMessage() == "after"
+    assert handler.dropped == 0
+
+
+def test_queue_handler_keeps_tracebacks_separate():
+    log_queue = queue.Queue()
+    handler = NonBlockingQueueHandler(log_queue)
+    try:
+        raise RuntimeError("upstream failed")
+    except RuntimeError:
+        record = logger.makeRecord(logger.name, logging.ERROR, __file__, 1, "failed %s", ("x",), sys.exc_info())
+    handler.handle(record)
+    entry = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+    assert entry["message"] == "failed x"
+    assert "RuntimeError: upstream failed" in entry["exception"]
+
+
+def test_log_tool_call_is_a_noop_without_pipeline():
+    with patch.object(logger, "info") as info:
+        log_tool_call("voicebox_ask", 0.1, "token")
+    info.assert_not_called()
+
+
+def test_log_tool_call_hashes_tenant(json_logs):
+    log_tool_call("voicebox_ask", 0.25, "secret-token")
+    log_tool_call("voicebox_settings", 0.01, "secret-token", RuntimeError("nope"))
+    shutdown_structured_logging()
+
+    success, failure = _lines(json_logs)
+    assert success["tool"] == "voicebox_ask"
+    assert success["latency_ms"] == 250.0
+    assert success["outcome"] == "success"
+    assert success["tenant"] == token_fingerprint("secret-token")[:16]
+    assert "secret-token" not in json_logs.getvalue()
+    assert failure["level"] == "ERROR"
+    assert failure["outcome"] == "error"
+    assert failure["message"] == "Tool voicebox_settings failed: nope"
+
+
+def test_shutdown_restores_logger(json_logs):
+    assert not logger.propagate
+    shutdown_structured_logging()
+    assert logger.propagate
+    assert not any(isinstance(h, NonBlockingQueueHandler) for h in logger.handlers)
+
+
+def test_slow_output_does_not_block_logging():
+    release = threading.Event()
+
+    class BlockingStream(io.StringIO):
+        def write(self, text):
+            release.wait(5)
+            return super().write(text)
+
+    configure_structured_logging(stream=BlockingStream())
+    try:
+        started = time.perf_counter()
+        for _ in range(100):
+            logger.info("queued while the collector is stalled")
+        assert time.perf_counter() - started < 0.5
+    finally:
+        release.set()
+        shutdown_structured_logging()
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_are_logged_with_tool_and_tenant(json_logs):
+    with patch("stardog_cloud_mcp.server.StardogAsyncClient") as mock_stardog_client, \
+         patch("stardog_cloud_mcp.server.ToolHandler") as mock_tool_handler, \
+         patch("fastmcp.FastMCP.run"):
+        mock_stardog_client.return_value.aclose = AsyncMock()
+        handler = mock_tool_handler.return_value
+        handler.handle_voicebox_settings = AsyncMock(return_value="settings")
+        handler.handle_voicebox_ask = AsyncMock(side_effect=RuntimeError("stream failed"))
+        server = initialize_server(
+            endpoint="http://test-endpoint",
+            api_token="tenant-token",
+            client_id="test-client",
+            auth_token_override=None,
+            mode="stdio",
+            port=7000,
+        )
+        async with Client(server) as client:
+            await client.call_tool("voicebox_settings", {})
+            with pytest.raises(ToolError):
+                await client.call_tool("voicebox_ask", {"question": "q"})
+    shutdown_structured_logging()
+
+    calls = [entry for entry in _lines(json_logs) if "tool" in entry]
+    assert [(entry["tool"], entry["outcome"]) for entry in calls] == [
+        ("voicebox_settings", "success"),
+        ("voicebox_ask", "error"),
+    ]
+    assert {entry["tenant"] for entry in calls} == {token_fingerprint("tenant-token")[:16]}
+
+
+def test_initialize_server_json_log_format(capsys):
+    with patch("fastmcp.FastMCP.run"):
+        initialize_server(
+            endpoint="http://test-endpoint",
+            api_token="test-token",
+            client_id="test-client",
+            auth_token_override=None,
+            mode="stdio",
+            port=7000,
+            log_format="json",
+        )
+    # The pipeline is flushed and removed when the server stops.
+    assert logger.propagate
+    messages = [json.loads(line)["message"] for line in capsys.readouterr().err.splitlines()]
+    assert "Starting Stardog Cloud MCP server ⭐🐕☁️" in messages
@@ -1,8 +1,15 @@
+import json
+
+import httpx
 import pytest
 from contextlib import asynccontextmanager
-from unittest.mock import MagicMock, AsyncMock
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from stardog.cloud.exceptions import UnauthorizedException
 
+from stardog_cloud_mcp.client import AsyncClient
 from stardog_cloud_mcp.exceptions import StardogMCPToolException
+from stardog_cloud_mcp.sparql import SparqlExecutor, SparqlPage
 from stardog_cloud_mcp.tools import ToolHandler
 
 from conftest import _async_iter
@@ -144,3 +151,301 @@ async def test_handle_voicebox_ask_no_final_answer():
 
     assert exc_info.value.name == "voicebox_ask"
     assert "Stream ended without a final answer" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_warm_up_prefetches_settings(tool_handler):
+    await tool_handler.warm_up([("dummy-token", "test-client")])
+    mock_voicebox_app = tool_handler.cloud_client.voicebox_app("dummy-token", "test-client")
+    assert mock_voicebox_app.async_settings.await_count == 1
+
+    result = await tool_handler.handle_voicebox_settings("dummy-token", "test-client")
+    assert "test-vbx-app-1" in result
+    # Served from the prefetched copy, no second upstream round trip.
+    assert mock_voicebox_app.async_settings.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_up_expired_prefetch_is_refetched(tool_handler, monkeypatch):
+    await tool_handler.warm_up([("dummy-token", "test-client")])
+    tool_handler.app_bindings.settings_ttl = 0
+    await tool_handler.handle_voicebox_settings("dummy-token", "test-client")
+    mock_voicebox_app = tool_handler.cloud_client.voicebox_app("dummy-token", "test-client")
+    assert mock_voicebox_app.async_settings.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_warm_up_failures_do_not_raise():
+    mock_client = MagicMock()
+    mock_voicebox_app = MagicMock()
+    mock_voicebox_app.async_settings = AsyncMock(side_effect=Exception("Connection failed"))
+    mock_client.voicebox_app.return_value = mock_voicebox_app
+
+    handler = ToolHandler(mock_client)
+    await handler.warm_up([("dummy-token", "test-client")])
+
+    assert handler.app_bindings.get_settings("dummy-token", "test-client") is None
+
+
+@pytest.mark.asyncio
+async def test_handle_sparql_execute(tool_handler):
+    executor = MagicMock()
+    executor.execute = AsyncMock(
+        return_value=SparqlPage(columns=["s"], rows=[["urn:a"]], offset=0)
+    )
+    tool_handler.sparql_executor = executor
+
+    result = await tool_handler.handle_sparql_execute(
+        "dummy-token", "test-client", "SELECT ?s WHERE { ?s ?p ?o }", page_size=5,
+        stardog_auth_token_override="sso-token",
+    )
+
+    assert json.loads(result)["rows"] == [["urn:a"]]
+    # Database, reasoning and graphs come from the Voicebox app settings.
+    executor.execute.assert_awaited_once_with(
+        database="flight-db-2",
+        query="SELECT ?s WHERE { ?s ?p ?o }",
+        cursor=None,
+        page_size=5,
+        auth_token="sso-token",
+        reasoning=True,
+        named_graphs=["tag:stardog:api:context:local"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_rejected_token_does_not_execute_sparql_from_cached_settings(tool_handler):
+    executor = MagicMock()
+    executor.execute = AsyncMock(return_value=SparqlPage(columns=[], rows=[], offset=0))
+    tool_handler.sparql_executor = executor
+    await tool_handler.handle_sparql_execute("dummy-token", "test-client", "SELECT * {}")
+
+    # Stardog Cloud revokes the token while its settings are cached.
+    voicebox_app = tool_handler.cloud_client.voicebox_app.return_value
+    voicebox_app.async_generate_query.side_effect = UnauthorizedException("Invalid API token", 401)
+    with pytest.raises(StardogMCPToolException):
+        await tool_handler.handle_voicebox_generate_query("dummy-token", "test-client", "q")
+    with pytest.raises(StardogMCPToolException, match="recently rejected"):
+        await tool_handler.handle_sparql_execute("dummy-token", "test-client", "SELECT * {}")
+    assert executor.execute.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_handle_sparql_execute_not_configured(tool_handler):
+    with pytest.raises(StardogMCPToolException, match="SPARQL execution is not configured") as exc_info:
+        await tool_handler.handle_sparql_execute("dummy-token", "test-client", "SELECT * {}")
+    assert exc_info.value.name == "sparql_execute"
+
+
+@pytest.mark.asyncio
+async def test_handle_voicebox_generate_and_execute(tool_handler):
+    executor = MagicMock()
+    executor.execute = AsyncMock(
+        return_value=SparqlPage(columns=["flight"], rows=[["urn:f1"]], offset=0)
+    )
+    tool_handler.sparql_executor = executor
+
+    result = json.loads(
+        await tool_handler.handle_voicebox_generate_and_execute(
+            "dummy-token", "test-client", "Show me all flights", page_size=20
+        )
+    )
+
+    assert result["sparql_query"] == "SELECT * WHERE { ?flight ?hasPlan ?plan }"
+    assert result["interpreted_question"] == "Show me all flights"
+    assert result["conversation_id"] == "conv-2"
+    assert result["results"]["rows"] == [["urn:f1"]]
+    executor.execute.assert_awaited_once_with(
+        database="flight-db-2",
+        query="SELECT * WHERE { ?flight ?hasPlan ?plan }",
+        page_size=20,
+        auth_token=None,
+        reasoning=True,
+        named_graphs=["tag:stardog:api:context:local"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_handle_voicebox_generate_and_execute_queries_the_app_graphs(tool_handler):
+    # Voicebox generates the query for the app's named graphs, so it runs
+    # against those graphs rather than the whole database.
+    tool_handler.sparql_executor = SparqlExecutor(
+        endpoint="http://stardog:5820", username="reader", password="secret"
+    )
+    with patch("stardog_cloud_mcp.sparql.stardog.Connection") as mock_connection:
+        select = mock_connection.return_value.select
+        select.return_value = {"head": {"vars": []}, "results": {"bindings": []}}
+        await tool_handler.handle_voicebox_generate_and_execute(
+            "dummy-token", "test-client", "Show me all flights"
+        )
+
+    assert mock_connection.call_args.args == ("flight-db-2",)
+    assert select.call_args.args == ("SELECT * WHERE { ?flight ?hasPlan ?plan }",)
+    assert select.call_args.kwargs["default_graph_uri"] == ["tag:stardog:api:context:local"]
+    assert select.call_args.kwargs["reasoning"] is True
+
+
+@pytest.mark.asyncio
+async def test_handle_voicebox_generate_and_execute_requires_stardog_credentials(tool_handler):
+    tool_handler.sparql_executor = SparqlExecutor(endpoint="http://stardog:5820")
+    with patch("stardog_cloud_mcp.sparql.stardog.Connection") as mock_connection:
+        with pytest.raises(StardogMCPToolException, match="No Stardog credentials"):
+            await tool_handler.handle_voicebox_generate_and_execute(
+                "dummy-token", "test-client", "Show me all flights"
+            )
+    mock_connection.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_handle_voicebox_generate_and_execute_without_query(tool_handler):
+    tool_handler.sparql_executor = MagicMock()
+    mock_voicebox_app = tool_handler.cloud_client.voicebox_app("dummy-token", "test-client")
+    mock_voicebox_app.async_generate_query.return_value.sparql_query = None
+
+    with pytest.raises(StardogMCPToolException, match="did not generate a SPARQL query") as exc_info:
+        await tool_handler.handle_voicebox_generate_and_execute(
+            "dummy-token", "test-client", "Hello?"
+        )
+    assert exc_info.value.name == "voicebox_generate_and_execute"
+    tool_handler.sparql_executor.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_app_bindings_are_reused(tool_handler):
+    await tool_handler.handle_voicebox_generate_query("dummy-token", "test-client", "q1")
+    await tool_handler.handle_voicebox_generate_query("dummy-token", "test-client", "q2")
+    assert tool_handler.cloud_client.voicebox_app.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_token_fails_fast():
+    mock_client = MagicMock()
+    mock_voicebox_app = MagicMock()
+    mock_voicebox_app.async_settings = AsyncMock(
+        side_effect=UnauthorizedException("Invalid API token", 401)
+    )
+    mock_client.voicebox_app.return_value = mock_voicebox_app
+    handler = ToolHandler(mock_client)
+
+    with pytest.raises(StardogMCPToolException, match="Invalid API token"):
+        await handler.handle_voicebox_settings("bad-token", "test-client")
+    with pytest.raises(StardogMCPToolException, match="recently rejected"):
+        await handler.handle_voicebox_ask("bad-token", "test-client", "What is the flight plan?")
+
+    # The second call never reached Stardog Cloud.
+    assert mock_voicebox_app.async_settings.await_count == 1
+    assert mock_client.voicebox_app.call_count == 1
+
+
+RAW_CONVERSATION_ID = "5f0c8f1e-6d6a-4f43-9b59-0c6a3c1f6a10"
+RAW_FINAL_EVENT = (
+    '{"result": "Final answer", "conversation_id": "%s", "message_id": "msg-final", '
+    '"actions": [{"type": "sparql", "value": "SELECT * WHERE { ?s ?p ?o }"}], "pending": false}'
+    % RAW_CONVERSATION_ID
+)
+
+
+def _raw_handler(stream_body, requests=None):
+    def upstream(request):
+        if requests is not None:
+            requests.append(request)
+        return httpx.Response(200, content=stream_body)
+
+    client = AsyncClient(base_url="http://cloud.test/api", transport=httpx.MockTransport(upstream))
+    return ToolHandler(client, raw_answers=True)
+
+
+@pytest.mark.asyncio
+async def test_handle_voicebox_ask_raw_returns_final_event_as_sent():
+    requests = []
+    pending = '{"result": "Thinking", "conversation_id": "%s", "pending": true}' % RAW_CONVERSATION_ID
+    handler = _raw_handler(f"{pending}\n\n{pending}\n{RAW_FINAL_EVENT}\n".encode(), requests)
+
+    result = await handler.handle_voicebox_ask(
+        api_token="dummy-token",
+        client_id="test-client",
+        question="What is the flight plan?",
+        conversation_id=RAW_CONVERSATION_ID,
+        stardog_auth_token_override="sso-token",
+    )
+
+    assert result == RAW_FINAL_EVENT
+    request = requests[0]
+    assert request.url.path == "/api/v1/voicebox/stream/ask"
+    assert json.loads(request.content) == {
+        "query": "What is the flight plan?",
+        "conversation_id": RAW_CONVERSATION_ID,
+    }
+    assert request.headers["authorization"] == "Bearer dummy-token"
+    assert request.headers["x-client-id"] == "test-client"
+    assert request.headers["x-sd-auth-token"] == "sso-token"
+    await handler.cloud_client.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "stream_body",
+    [
+        b"",
+        b'{"result": "Thinking", "conversation_id": "conv-1", "pending": true}\n',
+        b'{"result": "Final answer", "conversation_id": "conv-1", "pen',
+    ],
+)
+async def test_handle_voicebox_ask_raw_without_final_answer(stream_body):
+    handler = _raw_handler(stream_body)
+    with pytest.raises(StardogMCPToolException, match="Stream ended without a final answer"):
+        await handler.handle_voicebox_ask("dummy-token", "test-client", "What is the flight plan?")
+    await handler.cloud_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_handle_voicebox_ask_raw_validates_conversation_id():
+    handler = _raw_handler(RAW_FINAL_EVENT.encode())
+    with pytest.raises(StardogMCPToolException, match="valid UUID"):
+        await handler.handle_voicebox_ask("dummy-token", "test-client", "What is the flight plan?", "conv-1")
+    await handler.cloud_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_handle_voicebox_ask_raw_sends_the_same_request_as_pystardog():
+    # _stream_ask_raw rebuilds VoiceboxApp.async_stream_ask's request from
+    # pystardog private methods, which is why pystardog is pinned exactly.
+    # This fails when an upgrade renames them or changes the request.
+    requests = []
+    handler = _raw_handler(RAW_FINAL_EVENT.encode(), requests)
+    voicebox_app = handler.app_bindings.get("dummy-token", None)
+    ask = dict(
+        question="What is the flight plan?",
+        conversation_id=RAW_CONVERSATION_ID,
+        client_id="test-client",
+        stardog_auth_token_override="sso-token",
+    )
+
+    await handler._stream_ask_raw(voicebox_app, **ask)
+    async with voicebox_app.async_stream_ask(**ask) as answers:
+        assert [answer.pending async for answer in answers] == [False]
+
+    raw, public = requests
+    assert (raw.method, raw.url, raw.content) == (public.method, public.url, public.content)
+    assert raw.headers.multi_items() == public.headers.multi_items()
+    assert raw.extensions["timeout"] == public.extensions["timeout"]
+    await handler.cloud_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_rejected_auth_token_override_does_not_lock_out_the_api_token():
+    mock_client = MagicMock()
+    mock_voicebox_app = MagicMock()
+    mock_voicebox_app.async_generate_query = AsyncMock(
+        side_effect=[UnauthorizedException("Invalid Stardog token", 401), MagicMock(model_dump_json=lambda: "{}")]
+    )
+    mock_client.voicebox_app.return_value = mock_voicebox_app
+    handler = ToolHandler(mock_client)
+
+    with pytest.raises(StardogMCPToolException, match="Invalid Stardog token"):
+        await handler.handle_voicebox_generate_query(
+            "shared-token", "test-client", "q1", stardog_auth_token_override="bad-override"
+        )
+    # Another caller without the bad override still reaches Stardog Cloud.
+    assert await handler.handle_voicebox_generate_query("shared-token", "test-client", "q2") == "{}"
+    assert mock_voicebox_app.async_generate_query.await_count == 2